@@ -1,12 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session, noload, selectinload
+from typing import List, Optional, Tuple
+import io
+import numpy as np
 from ....database import get_db
 from ....models import aeropuerto as models
 from ....schemas import aeropuerto as schemas
+from ....pagination import decode_cursor, paginar_por_id, set_next_cursor
+from ....catalogo import catalogo
+from ....geo import indice_geografico
 
 router = APIRouter()
 
+def _respuesta_catalogo(request: Request, entrada: Tuple[dict, str]) -> Response:
+    """Responde desde el catálogo en memoria, con 304 si el cliente ya tiene la versión actual."""
+    datos, etag = entrada
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return JSONResponse(content=datos, headers={"ETag": etag})
+
+# Relaciones que se pueden pedir con ?include= en el listado
+RELACIONES_AEROPUERTO = {
+    "terminales": models.Aeropuerto.terminales,
+    "pistas": models.Aeropuerto.pistas,
+}
+
+def _opciones_include(include: Optional[str]) -> list:
+    """
+    Carga las relaciones pedidas con selectinload (una consulta por relación para toda la página)
+    y deshabilita el resto, de modo que el listado nunca dispara consultas por aeropuerto.
+    """
+    pedidas = {nombre.strip() for nombre in (include or "").split(",") if nombre.strip()}
+    desconocidas = pedidas - RELACIONES_AEROPUERTO.keys()
+    if desconocidas:
+        raise HTTPException(
+            status_code=400,
+            detail=f"include inválido: {', '.join(sorted(desconocidas))}. Opciones: terminales, pistas"
+        )
+    return [
+        selectinload(relacion) if nombre in pedidas else noload(relacion)
+        for nombre, relacion in RELACIONES_AEROPUERTO.items()
+    ]
+
+def _requiere_catalogo() -> None:
+    """Las consultas geográficas solo usan el catálogo: antes de la primera carga se responde 503."""
+    if not catalogo.cargado:
+        raise HTTPException(status_code=503, detail="El catálogo de aeropuertos aún no está disponible")
+
+def _hijos_catalogo(db: Session, aeropuerto_id: int, relacion: str, skip: int, limit: int) -> list:
+    """Terminales o pistas de un aeropuerto, tomadas del catálogo en memoria."""
+    entrada = catalogo.obtener(aeropuerto_id) or catalogo.refrescar(db, aeropuerto_id)
+    if entrada is None:
+        raise HTTPException(status_code=404, detail="Aeropuerto no encontrado")
+    return entrada[0][relacion][skip:skip + limit]
+
 # Endpoints para Aeropuertos
 @router.post("/aeropuertos", response_model=schemas.Aeropuerto)
 def create_aeropuerto(aeropuerto: schemas.AeropuertoCreate, db: Session = Depends(get_db)):
@@ -22,33 +70,92 @@ def create_aeropuerto(aeropuerto: schemas.AeropuertoCreate, db: Session = Depend
     db.add(db_aeropuerto)
     db.commit()
     db.refresh(db_aeropuerto)
+    catalogo.refrescar(db, db_aeropuerto.id)
     return db_aeropuerto
 
 @router.get("/aeropuertos", response_model=List[schemas.Aeropuerto])
 def read_aeropuertos(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     estado: Optional[str] = None,
+    include: Optional[str] = "terminales,pistas",
     db: Session = Depends(get_db)
 ):
-    query = db.query(models.Aeropuerto)
+    query = db.query(models.Aeropuerto).options(*_opciones_include(include))
     if estado:
         query = query.filter(models.Aeropuerto.estado == estado)
-    return query.offset(skip).limit(limit).all()
+    aeropuertos = paginar_por_id(query, models.Aeropuerto.id, decode_cursor(cursor), skip, limit)
+    set_next_cursor(response, aeropuertos, limit)
+    return aeropuertos
+
+@router.get("/aeropuertos/near", response_model=List[schemas.AeropuertoCercano])
+def read_aeropuertos_cercanos(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: Optional[float] = Query(None, gt=0),
+    k: Optional[int] = Query(None, ge=1, le=1000)
+):
+    """
+    Aeropuertos dentro de `radius_km` y/o los `k` más cercanos al punto, ordenados por distancia.
+    Se resuelve sobre el índice espacial en memoria, sin consultar la base de datos.
+    """
+    if radius_km is None and k is None:
+        raise HTTPException(status_code=400, detail="Debe indicar radius_km, k o ambos")
+    _requiere_catalogo()
+    return [
+        {**datos, "distancia_km": round(distancia, 3)}
+        for datos, distancia in indice_geografico.cercanos(lat, lon, radius_km, k)
+    ]
+
+@router.post("/aeropuertos/distancias", response_model=schemas.MatrizDistancias)
+def calcular_matriz_distancias(
+    solicitud: schemas.MatrizDistanciasRequest,
+    formato: str = Query("json", pattern="^(json|npy)$")
+):
+    """
+    Matriz de distancias de círculo máximo (km) entre orígenes y destinos, por id o código IATA.
+    Con `formato=npy` se responde el arreglo float32 de NumPy en binario (filas = orígenes,
+    columnas = destinos, en el orden de la solicitud), sin el costo de serializar a JSON.
+    """
+    # Antes de la primera carga un id existente no estaría en el índice: 503, no un falso 404
+    _requiere_catalogo()
+    destinos = solicitud.destinos or solicitud.origenes
+    matriz, faltantes = indice_geografico.matriz_distancias(solicitud.origenes, destinos)
+    if faltantes:
+        raise HTTPException(status_code=404, detail=f"Aeropuertos no encontrados: {faltantes}")
+
+    if formato == "npy":
+        buffer = io.BytesIO()
+        np.save(buffer, matriz, allow_pickle=False)
+        return Response(content=buffer.getvalue(), media_type="application/x-npy")
+
+    # JSONResponse directo: validar un millón de floats contra el response_model no aporta nada
+    return JSONResponse(content={
+        "origenes": solicitud.origenes,
+        "destinos": destinos,
+        "distancias_km": matriz.astype(np.float64).round(3).tolist()
+    })
 
 @router.get("/aeropuertos/{aeropuerto_id}", response_model=schemas.Aeropuerto)
-def read_aeropuerto(aeropuerto_id: int, db: Session = Depends(get_db)):
-    db_aeropuerto = db.query(models.Aeropuerto).filter(models.Aeropuerto.id == aeropuerto_id).first()
-    if db_aeropuerto is None:
+def read_aeropuerto(aeropuerto_id: int, request: Request, db: Session = Depends(get_db)):
+    # Si no está en el catálogo (p. ej. creado por otra réplica) se busca en la base de datos
+    entrada = catalogo.obtener(aeropuerto_id) or catalogo.refrescar(db, aeropuerto_id)
+    if entrada is None:
         raise HTTPException(status_code=404, detail="Aeropuerto no encontrado")
-    return db_aeropuerto
+    return _respuesta_catalogo(request, entrada)
 
 @router.get("/aeropuertos/codigo/{codigo_iata}", response_model=schemas.Aeropuerto)
-def read_aeropuerto_by_iata(codigo_iata: str, db: Session = Depends(get_db)):
-    db_aeropuerto = db.query(models.Aeropuerto).filter(models.Aeropuerto.codigo_iata == codigo_iata).first()
-    if db_aeropuerto is None:
+def read_aeropuerto_by_iata(codigo_iata: str, request: Request, db: Session = Depends(get_db)):
+    entrada = catalogo.obtener_por_iata(codigo_iata)
+    if entrada is None:
+        db_aeropuerto = db.query(models.Aeropuerto).filter(models.Aeropuerto.codigo_iata == codigo_iata).first()
+        if db_aeropuerto is not None:
+            entrada = catalogo.refrescar(db, db_aeropuerto.id)
+    if entrada is None:
         raise HTTPException(status_code=404, detail="Aeropuerto no encontrado")
-    return db_aeropuerto
+    return _respuesta_catalogo(request, entrada)
 
 @router.put("/aeropuertos/{aeropuerto_id}", response_model=schemas.Aeropuerto)
 def update_aeropuerto(
@@ -65,6 +172,7 @@ def update_aeropuerto(
     
     db.commit()
     db.refresh(db_aeropuerto)
+    catalogo.refrescar(db, aeropuerto_id)
     return db_aeropuerto
 
 @router.delete("/aeropuertos/{aeropuerto_id}")
@@ -75,6 +183,7 @@ def delete_aeropuerto(aeropuerto_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_aeropuerto)
     db.commit()
+    catalogo.eliminar(aeropuerto_id)
     return {"message": "Aeropuerto eliminado"}
 
 # Endpoints para Terminales
@@ -92,6 +201,7 @@ def create_terminal(
     db.add(db_terminal)
     db.commit()
     db.refresh(db_terminal)
+    catalogo.refrescar(db, aeropuerto_id)
     return db_terminal
 
 @router.get("/aeropuertos/{aeropuerto_id}/terminales", response_model=List[schemas.Terminal])
@@ -101,13 +211,7 @@ def read_terminales(
     limit: int = 100,
     db: Session = Depends(get_db)
 ):
-    db_aeropuerto = db.query(models.Aeropuerto).filter(models.Aeropuerto.id == aeropuerto_id).first()
-    if db_aeropuerto is None:
-        raise HTTPException(status_code=404, detail="Aeropuerto no encontrado")
-    
-    return db.query(models.Terminal).filter(
-        models.Terminal.aeropuerto_id == aeropuerto_id
-    ).offset(skip).limit(limit).all()
+    return _hijos_catalogo(db, aeropuerto_id, "terminales", skip, limit)
 
 # Endpoints para Pistas
 @router.post("/aeropuertos/{aeropuerto_id}/pistas", response_model=schemas.Pista)
@@ -124,6 +228,7 @@ def create_pista(
     db.add(db_pista)
     db.commit()
     db.refresh(db_pista)
+    catalogo.refrescar(db, aeropuerto_id)
     return db_pista
 
 @router.get("/aeropuertos/{aeropuerto_id}/pistas", response_model=List[schemas.Pista])
@@ -133,10 +238,4 @@ def read_pistas(
     limit: int = 100,
     db: Session = Depends(get_db)
 ):
-    db_aeropuerto = db.query(models.Aeropuerto).filter(models.Aeropuerto.id == aeropuerto_id).first()
-    if db_aeropuerto is None:
-        raise HTTPException(status_code=404, detail="Aeropuerto no encontrado")
-    
-    return db.query(models.Pista).filter(
-        models.Pista.aeropuerto_id == aeropuerto_id
-    ).offset(skip).limit(limit).all() 
\ No newline at end of file
+    return _hijos_catalogo(db, aeropuerto_id, "pistas", skip, limit) 
\ No newline at end of file
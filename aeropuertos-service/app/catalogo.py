@@ -0,0 +1,99 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, selectinload
+
+from .models import aeropuerto as models
+from .schemas import aeropuerto as schemas
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogoAeropuertos:
+    """
+    Catálogo completo de aeropuertos en memoria, indexado por id y por código IATA.
+
+    Cada entrada guarda el aeropuerto ya serializado (con terminales y pistas) y su ETag,
+    de modo que una consulta servida desde memoria no toca la base de datos.
+    Se carga al iniciar y se refresca en cada escritura; `version` cambia con cada
+    modificación para que los índices derivados sepan cuándo reconstruirse.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._por_id: Dict[int, Tuple[dict, str]] = {}
+        self._por_iata: Dict[str, int] = {}
+        self.version = 0
+        # False hasta la primera carga completa: un catálogo vacío no significa "sin aeropuertos"
+        self.cargado = False
+
+    @staticmethod
+    def _serializar(db_aeropuerto: models.Aeropuerto) -> Tuple[dict, str]:
+        datos = schemas.Aeropuerto.model_validate(db_aeropuerto).model_dump(mode="json")
+        cuerpo = json.dumps(datos, sort_keys=True, separators=(",", ":")).encode()
+        return datos, f'"{hashlib.sha1(cuerpo).hexdigest()}"'
+
+    @staticmethod
+    def _consulta(db: Session):
+        return db.query(models.Aeropuerto).options(
+            selectinload(models.Aeropuerto.terminales),
+            selectinload(models.Aeropuerto.pistas)
+        )
+
+    def cargar(self, db: Session) -> int:
+        """Carga el catálogo completo reemplazando el contenido actual."""
+        por_id = {}
+        por_iata = {}
+        for db_aeropuerto in self._consulta(db).all():
+            por_id[db_aeropuerto.id] = self._serializar(db_aeropuerto)
+            por_iata[db_aeropuerto.codigo_iata.upper()] = db_aeropuerto.id
+        with self._lock:
+            self._por_id = por_id
+            self._por_iata = por_iata
+            self.version += 1
+            self.cargado = True
+        logger.info(f"Catálogo de aeropuertos cargado: {len(por_id)} aeropuertos")
+        return len(por_id)
+
+    def refrescar(self, db: Session, aeropuerto_id: int) -> Optional[Tuple[dict, str]]:
+        """Vuelve a leer un aeropuerto de la base de datos; si ya no existe lo elimina del catálogo."""
+        db_aeropuerto = self._consulta(db).filter(models.Aeropuerto.id == aeropuerto_id).first()
+        if db_aeropuerto is None:
+            self.eliminar(aeropuerto_id)
+            return None
+        entrada = self._serializar(db_aeropuerto)
+        with self._lock:
+            anterior = self._por_id.get(aeropuerto_id)
+            if anterior is not None:
+                self._por_iata.pop(anterior[0]["codigo_iata"].upper(), None)
+            self._por_id[aeropuerto_id] = entrada
+            self._por_iata[db_aeropuerto.codigo_iata.upper()] = aeropuerto_id
+            self.version += 1
+        return entrada
+
+    def eliminar(self, aeropuerto_id: int) -> None:
+        with self._lock:
+            anterior = self._por_id.pop(aeropuerto_id, None)
+            if anterior is not None:
+                self._por_iata.pop(anterior[0]["codigo_iata"].upper(), None)
+                self.version += 1
+
+    def obtener(self, aeropuerto_id: int) -> Optional[Tuple[dict, str]]:
+        return self._por_id.get(aeropuerto_id)
+
+    def obtener_por_iata(self, codigo_iata: str) -> Optional[Tuple[dict, str]]:
+        aeropuerto_id = self._por_iata.get(codigo_iata.upper())
+        if aeropuerto_id is None:
+            return None
+        return self._por_id.get(aeropuerto_id)
+
+    def aeropuertos(self) -> List[dict]:
+        """Retorna una instantánea de todos los aeropuertos del catálogo."""
+        with self._lock:
+            return [datos for datos, _ in self._por_id.values()]
+
+
+catalogo = CatalogoAeropuertos()
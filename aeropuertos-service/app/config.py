@@ -8,6 +8,11 @@ class Settings(BaseSettings):
     MYSQL_USER: str = "root"
     MYSQL_PASSWORD: str = "1092"
     MYSQL_DATABASE: str = "airline_aeropuertos"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Backoff al esperar la base de datos en el arranque (segundos)
+    DB_INIT_ESPERA_INICIAL_SEGUNDOS: float = 1.0
+    DB_INIT_ESPERA_MAXIMA_SEGUNDOS: float = 30.0
     
     # Configuración de la API
     API_V1_STR: str = "/api/v1"
@@ -20,7 +25,19 @@ class Settings(BaseSettings):
     
     # Configuración de otros servicios
     VUELOS_SERVICE_URL: str = "http://localhost:8003/api/v1"
+
+    # Recarga completa del catálogo en memoria (cubre escrituras hechas por otras réplicas)
+    CATALOGO_RECARGA_SEGUNDOS: int = 300
+    # Reintento de la primera carga (hasta entonces el servicio no está listo)
+    CATALOGO_REINTENTO_SEGUNDOS: float = 2.0
+
+    # Máximo de aeropuertos por eje en la matriz de distancias
+    DISTANCIAS_MAX_AEROPUERTOS: int = 2000
     
+    # Muestreo de salud de dependencias en segundo plano (segundos)
+    HEALTH_INTERVALO_SEGUNDOS: float = 5.0
+    HEALTH_TIMEOUT_SEGUNDOS: float = 2.0
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,152 @@
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .catalogo import catalogo
+
+RADIO_TIERRA_KM = 6371.0088
+
+
+def vectores_unitarios(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Convierte coordenadas en grados a vectores unitarios (x, y, z) sobre la esfera."""
+    lat = np.radians(latitudes)
+    lon = np.radians(longitudes)
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def distancias_km(vectores: np.ndarray, punto: np.ndarray) -> np.ndarray:
+    """Distancia de círculo máximo desde `punto` a cada vector (todos unitarios)."""
+    cosenos = np.clip(vectores @ punto, -1.0, 1.0)
+    return np.arccos(cosenos) * RADIO_TIERRA_KM
+
+
+def matriz_distancias_km(
+    lat_origen: np.ndarray,
+    lon_origen: np.ndarray,
+    lat_destino: np.ndarray,
+    lon_destino: np.ndarray
+) -> np.ndarray:
+    """
+    Matriz de distancias de círculo máximo (haversine) entre todos los orígenes y destinos,
+    calculada por broadcasting. Las coordenadas vienen en radianes.
+    """
+    dlat = lat_destino[np.newaxis, :] - lat_origen[:, np.newaxis]
+    dlon = lon_destino[np.newaxis, :] - lon_origen[:, np.newaxis]
+    a = (
+        np.sin(dlat / 2) ** 2
+        + np.cos(lat_origen)[:, np.newaxis] * np.cos(lat_destino)[np.newaxis, :] * np.sin(dlon / 2) ** 2
+    )
+    return 2 * RADIO_TIERRA_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class IndiceGeografico:
+    """
+    Índice espacial de los aeropuertos del catálogo.
+
+    Guarda las coordenadas como vectores unitarios en un arreglo contiguo, de modo que
+    una búsqueda por radio o por k vecinos es un único producto matriz-vector sobre
+    unos pocos miles de filas, sin consultar la base de datos ni recorrer filas en Python.
+    Se reconstruye solo cuando cambia la versión del catálogo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = -1
+        self._aeropuertos: List[dict] = []
+        self._vectores = np.empty((0, 3))
+        self._latitudes = np.empty(0)
+        self._longitudes = np.empty(0)
+        self._fila_por_id: Dict[int, int] = {}
+        self._fila_por_iata: Dict[str, int] = {}
+
+    def _actualizar(self) -> Tuple[List[dict], np.ndarray]:
+        with self._lock:
+            if self._version != catalogo.version:
+                version = catalogo.version
+                aeropuertos = catalogo.aeropuertos()
+                latitudes = np.array([a["latitud"] for a in aeropuertos], dtype=np.float64)
+                longitudes = np.array([a["longitud"] for a in aeropuertos], dtype=np.float64)
+                self._vectores = vectores_unitarios(latitudes, longitudes)
+                self._latitudes = np.radians(latitudes)
+                self._longitudes = np.radians(longitudes)
+                self._fila_por_id = {a["id"]: i for i, a in enumerate(aeropuertos)}
+                self._fila_por_iata = {a["codigo_iata"].upper(): i for i, a in enumerate(aeropuertos)}
+                self._aeropuertos = aeropuertos
+                self._version = version
+            return self._aeropuertos, self._vectores
+
+    def cercanos(
+        self,
+        latitud: float,
+        longitud: float,
+        radio_km: Optional[float] = None,
+        k: Optional[int] = None
+    ) -> List[Tuple[dict, float]]:
+        """
+        Aeropuertos a menos de `radio_km` y/o los `k` más cercanos al punto,
+        ordenados por distancia.
+        """
+        aeropuertos, vectores = self._actualizar()
+        if not aeropuertos:
+            return []
+
+        punto = vectores_unitarios(np.array([latitud]), np.array([longitud]))[0]
+        distancias = distancias_km(vectores, punto)
+
+        candidatos = np.arange(len(aeropuertos))
+        if radio_km is not None:
+            candidatos = candidatos[distancias <= radio_km]
+        if k is not None and k < len(candidatos):
+            # argpartition evita ordenar todos los candidatos cuando solo interesan k
+            candidatos = candidatos[np.argpartition(distancias[candidatos], k - 1)[:k]]
+        candidatos = candidatos[np.argsort(distancias[candidatos], kind="stable")]
+
+        return [(aeropuertos[i], float(distancias[i])) for i in candidatos]
+
+    def matriz_distancias(
+        self,
+        origenes: List[Union[int, str]],
+        destinos: List[Union[int, str]]
+    ) -> Tuple[np.ndarray, List[Union[int, str]]]:
+        """
+        Matriz de distancias en km entre aeropuertos identificados por id o código IATA.
+        Retorna la matriz (float32) y la lista de referencias que no existen en el catálogo.
+        """
+        self._actualizar()
+        with self._lock:
+            fila_por_id, fila_por_iata = self._fila_por_id, self._fila_por_iata
+            latitudes, longitudes = self._latitudes, self._longitudes
+
+        faltantes: List[Union[int, str]] = []
+
+        def resolver(referencias: List[Union[int, str]]) -> np.ndarray:
+            filas = []
+            for referencia in referencias:
+                if isinstance(referencia, int):
+                    fila = fila_por_id.get(referencia)
+                else:
+                    fila = fila_por_iata.get(referencia.upper())
+                if fila is None:
+                    if referencia not in faltantes:
+                        faltantes.append(referencia)
+                    fila = 0
+                filas.append(fila)
+            return np.array(filas, dtype=np.intp)
+
+        filas_origen = resolver(origenes)
+        filas_destino = resolver(destinos)
+        if faltantes:
+            return np.empty((0, 0), dtype=np.float32), faltantes
+
+        matriz = matriz_distancias_km(
+            latitudes[filas_origen],
+            longitudes[filas_origen],
+            latitudes[filas_destino],
+            longitudes[filas_destino]
+        )
+        return matriz.astype(np.float32), []
+
+
+indice_geografico = IndiceGeografico()
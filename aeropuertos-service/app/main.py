@@ -1,10 +1,15 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import make_asgi_app
 from .config import settings
-from .database import engine, Base
+from . import database
+from .catalogo import catalogo
+from .health_sampler import HealthSampler
+from .metrics import MetricsMiddleware, registrar_pool
+import asyncio
 import logging
 import sys
-import time
 
 # Configurar logging
 logging.basicConfig(
@@ -14,6 +19,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def _sonda_catalogo():
+    # /near y /distancias se resuelven solo en memoria: sin catálogo el servicio no está listo
+    if not catalogo.cargado:
+        raise RuntimeError("Catálogo de aeropuertos aún no cargado")
+
+# Estado de las dependencias, muestreado en segundo plano para los endpoints de salud
+health_sampler = HealthSampler(settings.HEALTH_INTERVALO_SEGUNDOS, settings.HEALTH_TIMEOUT_SEGUNDOS)
+health_sampler.registrar("database", database.arranque_db.sonda)
+health_sampler.registrar("catalogo", _sonda_catalogo)
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
@@ -26,8 +41,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Configurar métricas de Prometheus: RED por plantilla de ruta y estado del pool
+app.add_middleware(MetricsMiddleware)
+registrar_pool("sync", database.engine)
+metrics_app = make_asgi_app()
+app.mount("/metrics", metrics_app)
+
 # Importar y registrar los routers
 from .api.v1.endpoints import aeropuertos
 app.include_router(aeropuertos.router, prefix=settings.API_V1_STR)
@@ -35,23 +57,55 @@ app.include_router(aeropuertos.router, prefix=settings.API_V1_STR)
 @app.on_event("startup")
 async def startup_event():
     logger.info("Iniciando aplicación...")
-    max_retries = 5
-    retry_delay = 5
-    
-    for attempt in range(max_retries):
+    # La base de datos se espera en segundo plano: el proceso acepta conexiones
+    # (liveness) de inmediato y /health/ready se activa cuando el pool está listo
+    app.state.inicializacion = asyncio.create_task(_iniciar())
+    health_sampler.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.inicializacion.cancel()
+    await health_sampler.stop()
+
+async def _iniciar():
+    await database.arranque_db.iniciar()
+    # La primera carga se reintenta a intervalos cortos, no al ritmo de la recarga periódica
+    while not catalogo.cargado:
         try:
-            logger.info(f"Intento {attempt + 1} de {max_retries} para crear tablas")
-            Base.metadata.create_all(bind=engine)
-            logger.info("Tablas creadas correctamente")
-            break
+            await asyncio.to_thread(_cargar_catalogo)
         except Exception as e:
-            if attempt < max_retries - 1:
-                logger.warning(f"Error al crear tablas (intento {attempt + 1}): {str(e)}")
-                time.sleep(retry_delay)
-            else:
-                logger.error(f"No se pudieron crear las tablas después de {max_retries} intentos: {str(e)}")
-                raise
+            logger.warning(
+                f"Error al cargar el catálogo de aeropuertos, reintento en "
+                f"{settings.CATALOGO_REINTENTO_SEGUNDOS}s: {str(e)}"
+            )
+            await asyncio.sleep(settings.CATALOGO_REINTENTO_SEGUNDOS)
+    await _recargar_catalogo_periodicamente()
+
+def _cargar_catalogo():
+    db = database.SessionLocal()
+    try:
+        catalogo.cargar(db)
+    finally:
+        db.close()
+
+async def _recargar_catalogo_periodicamente():
+    while True:
+        await asyncio.sleep(settings.CATALOGO_RECARGA_SEGUNDOS)
+        try:
+            await asyncio.to_thread(_cargar_catalogo)
+        except Exception as e:
+            logger.warning(f"Error al recargar el catálogo de aeropuertos: {str(e)}")
 
 @app.get("/health")
-def health_check():
-    return {"status": "ok"} 
\ No newline at end of file
+async def health_check():
+    return health_sampler.resumen()
+
+@app.get("/health/ready")
+async def readiness_check():
+    if not health_sampler.listo():
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=health_sampler.resumen())
+    return health_sampler.resumen()
+
+@app.get("/health/detailed")
+async def detailed_health_check():
+    return health_sampler.detalle() 
\ No newline at end of file
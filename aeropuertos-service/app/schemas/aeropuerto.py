@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Union
 from datetime import datetime
+from ..config import settings
 
 # Esquemas base
 class TerminalBase(BaseModel):
@@ -85,4 +86,17 @@ class Aeropuerto(AeropuertoBase):
     pistas: List[Pista] = []
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class AeropuertoCercano(Aeropuerto):
+    distancia_km: float 
+
+class MatrizDistanciasRequest(BaseModel):
+    # Aeropuertos por id o por código IATA; si no se indican destinos se usan los orígenes
+    origenes: List[Union[int, str]] = Field(..., min_length=1, max_length=settings.DISTANCIAS_MAX_AEROPUERTOS)
+    destinos: Optional[List[Union[int, str]]] = Field(None, min_length=1, max_length=settings.DISTANCIAS_MAX_AEROPUERTOS)
+
+class MatrizDistancias(BaseModel):
+    origenes: List[Union[int, str]]
+    destinos: List[Union[int, str]]
+    distancias_km: List[List[float]]
@@ -0,0 +1,48 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.database import Base, SQLALCHEMY_DATABASE_URL
+from app.models import aeropuerto  # noqa: F401  (registra los modelos en Base.metadata)
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=SQLALCHEMY_DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _ejecutar(conexion) -> None:
+    context.configure(connection=conexion, target_metadata=target_metadata, compare_type=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    # Al arrancar el servicio la conexión llega desde app.migraciones (con el lock tomado)
+    conexion = config.attributes.get("connection")
+    if conexion is not None:
+        _ejecutar(conexion)
+        return
+
+    # Desde la línea de comandos (`alembic upgrade head`)
+    if config.config_file_name is not None:
+        fileConfig(config.config_file_name, disable_existing_loggers=False)
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, poolclass=pool.NullPool)
+    with engine.connect() as conexion:
+        _ejecutar(conexion)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,70 @@
+"""Esquema inicial: aeropuertos, terminales y pistas
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "aeropuertos",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("codigo_iata", sa.String(length=3), nullable=False),
+        sa.Column("nombre", sa.String(length=100), nullable=False),
+        sa.Column("ciudad", sa.String(length=100), nullable=False),
+        sa.Column("pais", sa.String(length=100), nullable=False),
+        sa.Column("latitud", sa.Float(), nullable=False),
+        sa.Column("longitud", sa.Float(), nullable=False),
+        sa.Column("zona_horaria", sa.String(length=50), nullable=False),
+        sa.Column("estado", sa.String(length=20), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("codigo_iata"),
+    )
+    op.create_index("ix_aeropuertos_id", "aeropuertos", ["id"])
+
+    op.create_table(
+        "terminales",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("aeropuerto_id", sa.Integer(), nullable=True),
+        sa.Column("nombre", sa.String(length=50), nullable=False),
+        sa.Column("capacidad_pasajeros", sa.Integer(), nullable=False),
+        sa.Column("estado", sa.String(length=20), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["aeropuerto_id"], ["aeropuertos.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_terminales_id", "terminales", ["id"])
+
+    op.create_table(
+        "pistas",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("aeropuerto_id", sa.Integer(), nullable=True),
+        sa.Column("numero", sa.String(length=10), nullable=False),
+        sa.Column("longitud_metros", sa.Integer(), nullable=False),
+        sa.Column("ancho_metros", sa.Integer(), nullable=False),
+        sa.Column("superficie", sa.String(length=50), nullable=False),
+        sa.Column("estado", sa.String(length=20), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["aeropuerto_id"], ["aeropuertos.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_pistas_id", "pistas", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("pistas")
+    op.drop_table("terminales")
+    op.drop_table("aeropuertos")
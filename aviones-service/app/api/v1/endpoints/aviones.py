@@ -1,21 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional
+from app.database import get_db, get_async_db
 from app.schemas.avion import AvionCreate, AvionUpdate, Avion as AvionSchema
 from app.services.avion_service import AvionService
+from app.core.pagination import decode_cursor, set_next_cursor
 
 router = APIRouter()
 
 @router.post("/", response_model=AvionSchema, status_code=status.HTTP_201_CREATED)
-async def create_avion(avion: AvionCreate, db: Session = Depends(get_db)):
+async def create_avion(avion: AvionCreate, db: AsyncSession = Depends(get_async_db)):
     avion_service = AvionService(db)
     return await avion_service.create_avion(avion)
 
 @router.get("/", response_model=List[AvionSchema])
-def read_aviones(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    avion_service = AvionService(db)
-    return avion_service.get_aviones(skip, limit)
+def read_aviones(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    avion_service = AvionService(db)
+    aviones = avion_service.get_aviones(skip, limit, decode_cursor(cursor))
+    set_next_cursor(response, aviones, limit)
+    return aviones
 
 @router.get("/{avion_id}", response_model=AvionSchema)
 def read_avion(avion_id: int, db: Session = Depends(get_db)):
@@ -33,17 +43,17 @@ def read_aviones_by_estado(estado: str, db: Session = Depends(get_db)):
     return avion_service.get_aviones_by_estado(estado)
 
 @router.put("/{avion_id}", response_model=AvionSchema)
-async def update_avion(avion_id: int, avion: AvionUpdate, db: Session = Depends(get_db)):
+async def update_avion(avion_id: int, avion: AvionUpdate, db: AsyncSession = Depends(get_async_db)):
     avion_service = AvionService(db)
     return await avion_service.update_avion(avion_id, avion)
 
 @router.delete("/{avion_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_avion(avion_id: int, db: Session = Depends(get_db)):
+async def delete_avion(avion_id: int, db: AsyncSession = Depends(get_async_db)):
     avion_service = AvionService(db)
     await avion_service.delete_avion(avion_id)
     return None
 
 @router.put("/{avion_id}/mantenimiento", response_model=AvionSchema)
-async def update_mantenimiento(avion_id: int, estado: str, db: Session = Depends(get_db)):
+async def update_mantenimiento(avion_id: int, estado: str, db: AsyncSession = Depends(get_async_db)):
     avion_service = AvionService(db)
     return await avion_service.actualizar_estado_mantenimiento(avion_id, estado) 
\ No newline at end of file
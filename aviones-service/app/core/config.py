@@ -44,6 +44,10 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Muestreo de salud de dependencias en segundo plano (segundos)
+    HEALTH_INTERVALO_SEGUNDOS: float = 5.0
+    HEALTH_TIMEOUT_SEGUNDOS: float = 2.0
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -37,6 +39,21 @@ for attempt in range(max_retries):
             logger.error(f"Error al conectar con la base de datos después de {max_retries} intentos: {str(e)}")
             raise
 
+# Motor asíncrono (aiomysql) para los endpoints `async def`: las consultas no bloquean
+# el event loop mientras se publica en RabbitMQ o se atienden otras peticiones
+ASYNC_DATABASE_URL = make_url(SQLALCHEMY_DATABASE_URL).set(drivername="mysql+aiomysql")
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    pool_size=5,
+    max_overflow=10,
+    pool_timeout=30
+)
+# expire_on_commit=False: tras el commit los atributos siguen cargados y no hace falta
+# una carga perezosa (que en modo asíncrono no está permitida) al serializar la respuesta
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -48,3 +65,6 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
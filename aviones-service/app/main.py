@@ -1,8 +1,13 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import make_asgi_app
 from app.api.v1.endpoints import aviones
 from app.core.config import settings
-from app.database import Base, engine
+from app.database import engine, async_engine
+from app.core.migraciones import ejecutar_migraciones
+from app.core.health_sampler import HealthSampler, sonda_sql, sonda_tcp
+from app.core.metrics import MetricsMiddleware, registrar_pool
 import logging
 from contextlib import asynccontextmanager
 import time
@@ -16,35 +21,43 @@ logging.basicConfig(
 )
 logger = logging.getLogger("aviones_service")
 
+# Estado de las dependencias, muestreado en segundo plano para los endpoints de salud
+health_sampler = HealthSampler(settings.HEALTH_INTERVALO_SEGUNDOS, settings.HEALTH_TIMEOUT_SEGUNDOS)
+health_sampler.registrar("database", sonda_sql(async_engine))
+health_sampler.registrar("rabbitmq", sonda_tcp(settings.RABBITMQ_HOST, settings.RABBITMQ_PORT), critica=False)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info(f"Iniciando {settings.PROJECT_NAME} v{settings.VERSION}")
     logger.info(f"Base de datos: mysql://{settings.MYSQL_USER}:{settings.MYSQL_PASSWORD}@{settings.MYSQL_HOST}:{settings.MYSQL_PORT}/{settings.MYSQL_DATABASE}")
     
+    health_sampler.start()
+
     # Esperar a que la base de datos esté lista
     max_retries = 5
     retry_count = 0
     while retry_count < max_retries:
         try:
-            logger.info("Intentando crear tablas en la base de datos...")
-            Base.metadata.create_all(bind=engine)
-            logger.info("Tablas creadas correctamente en la base de datos")
+            logger.info("Aplicando migraciones de la base de datos...")
+            ejecutar_migraciones(engine)
             break
         except Exception as e:
             retry_count += 1
-            logger.error(f"Error al crear tablas (intento {retry_count}/{max_retries}): {str(e)}")
+            logger.error(f"Error al aplicar migraciones (intento {retry_count}/{max_retries}): {str(e)}")
             if retry_count < max_retries:
                 logger.info(f"Esperando 5 segundos antes de reintentar...")
                 time.sleep(5)
             else:
-                logger.error("No se pudieron crear las tablas después de varios intentos")
+                logger.error("No se pudieron aplicar las migraciones después de varios intentos")
                 raise
     
     logger.info(f"Servicio {settings.PROJECT_NAME} iniciado correctamente")
     yield
     # Shutdown
     logger.info(f"Deteniendo {settings.PROJECT_NAME}")
+    await health_sampler.stop()
+    await async_engine.dispose()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -60,8 +73,16 @@ app.add_middleware(
     allow_credentials=settings.CORS_CREDENTIALS,
     allow_methods=settings.CORS_METHODS,
     allow_headers=settings.CORS_HEADERS,
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Configurar métricas de Prometheus: RED por plantilla de ruta y estado de los pools
+app.add_middleware(MetricsMiddleware)
+registrar_pool("sync", engine)
+registrar_pool("async", async_engine)
+metrics_app = make_asgi_app()
+app.mount("/metrics", metrics_app)
+
 # Incluir routers
 app.include_router(aviones.router, prefix=f"{settings.API_V1_STR}/aviones", tags=["aviones"])
 
@@ -70,9 +91,23 @@ async def root():
     return {"message": "Bienvenido al Servicio de Aviones"}
 
 @app.get("/health/live")
-async def health_check():
+async def liveness_check():
     return {"status": "healthy"}
 
+@app.get("/health")
+async def health_check():
+    return health_sampler.resumen()
+
+@app.get("/health/ready")
+async def readiness_check():
+    if not health_sampler.listo():
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=health_sampler.resumen())
+    return health_sampler.resumen()
+
+@app.get("/health/detailed")
+async def detailed_health_check():
+    return health_sampler.detalle()
+
 if __name__ == "__main__":
     import uvicorn
     logger.info("Iniciando aplicación con uvicorn...")
@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.avion import Avion
 from app.schemas.avion import AvionCreate, AvionUpdate
@@ -5,18 +7,37 @@ from app.services.rabbitmq_service import rabbitmq_service
 import logging
 from fastapi import HTTPException, status
 from datetime import datetime
+from typing import Optional
+from app.core.pagination import paginar_por_id
 
 logger = logging.getLogger(__name__)
 
 class AvionService:
-    def __init__(self, db: Session):
+    """
+    Los métodos síncronos (lecturas) reciben una Session y los usan los endpoints `def`;
+    los asíncronos (escrituras que publican eventos) reciben una AsyncSession.
+    """
+
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
 
+    async def _matricula_existe(self, matricula: str) -> bool:
+        return await self.db.scalar(select(Avion.id).where(Avion.matricula == matricula).limit(1)) is not None
+
+    async def _obtener_avion(self, avion_id: int) -> Avion:
+        avion = await self.db.get(Avion, avion_id)
+        if not avion:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Avión no encontrado"
+            )
+        return avion
+
     async def create_avion(self, avion: AvionCreate) -> Avion:
         """Crea un nuevo avión."""
         try:
             # Verificar si ya existe un avión con la misma matrícula
-            if self.db.query(Avion).filter(Avion.matricula == avion.matricula).first():
+            if await self._matricula_existe(avion.matricula):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Ya existe un avión con esta matrícula"
@@ -25,8 +46,8 @@ class AvionService:
             # Crear el avión
             db_avion = Avion(**avion.dict())
             self.db.add(db_avion)
-            self.db.commit()
-            self.db.refresh(db_avion)
+            await self.db.commit()
+            await self.db.refresh(db_avion)
 
             # Publicar evento
             await rabbitmq_service.publish_event(
@@ -41,7 +62,7 @@ class AvionService:
             return db_avion
 
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Error creando avión: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -68,9 +89,9 @@ class AvionService:
             )
         return avion
 
-    def get_aviones(self, skip: int = 0, limit: int = 100) -> list[Avion]:
-        """Obtiene una lista de aviones."""
-        return self.db.query(Avion).offset(skip).limit(limit).all()
+    def get_aviones(self, skip: int = 0, limit: int = 100, ultimo_id: Optional[int] = None) -> list[Avion]:
+        """Obtiene una lista de aviones ordenada por id, a partir de `ultimo_id` si se indica."""
+        return paginar_por_id(self.db.query(Avion), Avion.id, ultimo_id, skip, limit)
 
     def get_aviones_by_estado(self, estado: str) -> list[Avion]:
         """Obtiene una lista de aviones por estado."""
@@ -78,11 +99,11 @@ class AvionService:
 
     async def update_avion(self, avion_id: int, avion: AvionUpdate) -> Avion:
         """Actualiza un avión existente."""
-        db_avion = self.get_avion(avion_id)
+        db_avion = await self._obtener_avion(avion_id)
 
         # Verificar matrícula única si se está actualizando
         if avion.matricula and avion.matricula != db_avion.matricula:
-            if self.db.query(Avion).filter(Avion.matricula == avion.matricula).first():
+            if await self._matricula_existe(avion.matricula):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Ya existe un avión con esta matrícula"
@@ -93,8 +114,8 @@ class AvionService:
         for field, value in update_data.items():
             setattr(db_avion, field, value)
 
-        self.db.commit()
-        self.db.refresh(db_avion)
+        await self.db.commit()
+        await self.db.refresh(db_avion)
 
         # Publicar evento
         await rabbitmq_service.publish_event(
@@ -110,9 +131,9 @@ class AvionService:
 
     async def delete_avion(self, avion_id: int) -> None:
         """Elimina un avión."""
-        db_avion = self.get_avion(avion_id)
-        self.db.delete(db_avion)
-        self.db.commit()
+        db_avion = await self._obtener_avion(avion_id)
+        await self.db.delete(db_avion)
+        await self.db.commit()
 
         # Publicar evento
         await rabbitmq_service.publish_event(
@@ -131,7 +152,7 @@ class AvionService:
                 detail="Estado no válido"
             )
 
-        db_avion = self.get_avion(avion_id)
+        db_avion = await self._obtener_avion(avion_id)
         db_avion.estado = estado
         
         if estado == "MANTENIMIENTO":
@@ -139,8 +160,8 @@ class AvionService:
             # Establecer próxima revisión en 6 meses
             db_avion.proxima_revision = datetime.utcnow().replace(month=datetime.utcnow().month + 6)
 
-        self.db.commit()
-        self.db.refresh(db_avion)
+        await self.db.commit()
+        await self.db.refresh(db_avion)
 
         # Publicar evento
         await rabbitmq_service.publish_event(
@@ -1,8 +1,10 @@
 import aio_pika
 import json
 import logging
+import time
 from typing import Dict, Any
 from app.core.config import settings
+from app.core.metrics import RABBITMQ_PUBLISH_DURATION, RABBITMQ_PUBLISH_FAILURES
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,8 @@ class RabbitMQService:
 
     async def publish_event(self, event_type: str, data: Dict[str, Any]):
         """Publica un evento en RabbitMQ."""
+        routing_key = f"aviones.{event_type}"
+        inicio = time.perf_counter()
         try:
             if not self.connection:
                 await self.connect()
@@ -37,12 +41,15 @@ class RabbitMQService:
 
             await self.exchange.publish(
                 message,
-                routing_key=f"aviones.{event_type}"
+                routing_key=routing_key
             )
-            logger.info(f"Evento publicado: aviones.{event_type}")
+            logger.info(f"Evento publicado: {routing_key}")
         except Exception as e:
+            RABBITMQ_PUBLISH_FAILURES.labels(routing_key=routing_key).inc()
             logger.error(f"Error publicando evento: {str(e)}")
             raise
+        finally:
+            RABBITMQ_PUBLISH_DURATION.labels(routing_key=routing_key).observe(time.perf_counter() - inicio)
 
     async def close(self):
         """Cierra la conexión con RabbitMQ."""
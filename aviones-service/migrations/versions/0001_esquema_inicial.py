@@ -0,0 +1,37 @@
+"""Esquema inicial: aviones
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "aviones",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("matricula", sa.String(length=10), nullable=False),
+        sa.Column("modelo", sa.String(length=50), nullable=False),
+        sa.Column("capacidad_pasajeros", sa.Integer(), nullable=False),
+        sa.Column("capacidad_carga", sa.Integer(), nullable=False),
+        sa.Column("estado", sa.Enum("ACTIVO", "MANTENIMIENTO", "INACTIVO"), nullable=False),
+        sa.Column("ultima_revision", sa.DateTime(), nullable=True),
+        sa.Column("proxima_revision", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("matricula"),
+    )
+    op.create_index("ix_aviones_id", "aviones", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("aviones")
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+Sonda = Callable[[], Awaitable[Any]]
+
+
+class HealthSampler:
+    """
+    Muestrea en segundo plano el estado de las dependencias (base de datos, RabbitMQ, Redis...).
+
+    Todas las sondas se ejecutan en paralelo cada `intervalo` segundos, cada una con su
+    `timeout`, y el resultado queda en memoria: los endpoints de salud responden desde esa
+    foto sin hacer I/O, así que una dependencia lenta no bloquea ni encola las sondas de
+    Kubernetes. Una sonda es una corrutina que termina sin error si la dependencia responde;
+    si devuelve un valor distinto de None se publica como detalle del componente.
+    """
+
+    def __init__(self, intervalo: float, timeout: float):
+        self.intervalo = intervalo
+        self.timeout = timeout
+        self._sondas: Dict[str, Sonda] = {}
+        self._criticas: Dict[str, bool] = {}
+        self._componentes: Dict[str, Dict[str, Any]] = {}
+        self._tarea: Optional[asyncio.Task] = None
+        self._en_curso: Dict[str, asyncio.Task] = {}
+        self._resumen: Dict[str, Any] = {"status": "unknown", "components": {}, "checked_at": None}
+        self._detalle: Dict[str, Any] = dict(self._resumen)
+        self._listo = False
+
+    def registrar(self, nombre: str, sonda: Sonda, critica: bool = True) -> None:
+        """Agrega una dependencia. Solo las críticas cuentan para readiness."""
+        self._sondas[nombre] = sonda
+        self._criticas[nombre] = critica
+        self._componentes[nombre] = {"status": "unknown", "critical": critica}
+
+    def _lanzar(self, nombre: str, sonda: Sonda) -> asyncio.Task:
+        # El timeout deja de esperar la sonda pero no detiene un hilo bloqueado (to_thread):
+        # mientras la anterior siga en curso se vuelve a esperar esa misma, sin lanzar otra
+        # que ocuparía otro hilo y otra conexión del pool
+        tarea = self._en_curso.get(nombre)
+        if tarea is None or tarea.done():
+            tarea = asyncio.ensure_future(sonda())
+            # Recupera la excepción aunque nadie la espere ya (evita el aviso del event loop)
+            tarea.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._en_curso[nombre] = tarea
+        return tarea
+
+    async def _ejecutar(self, nombre: str, sonda: Sonda) -> Dict[str, Any]:
+        inicio = time.perf_counter()
+        resultado: Dict[str, Any] = {"critical": self._criticas[nombre]}
+        try:
+            detalle = await asyncio.wait_for(asyncio.shield(self._lanzar(nombre, sonda)), timeout=self.timeout)
+            resultado["status"] = "healthy"
+            if detalle is not None:
+                resultado["details"] = detalle
+        except asyncio.TimeoutError:
+            resultado["status"] = "unhealthy"
+            resultado["error"] = f"Sin respuesta en {self.timeout}s"
+        except Exception as e:
+            resultado["status"] = "unhealthy"
+            resultado["error"] = str(e)
+        resultado["latency_ms"] = round((time.perf_counter() - inicio) * 1000, 2)
+        anterior = self._componentes.get(nombre, {}).get("status")
+        if anterior != resultado["status"] and anterior != "unknown":
+            logger.warning(f"Dependencia {nombre}: {anterior} -> {resultado['status']} {resultado.get('error', '')}")
+        return resultado
+
+    async def muestrear(self) -> None:
+        """Ejecuta todas las sondas una vez y actualiza la foto."""
+        nombres = list(self._sondas)
+        resultados = await asyncio.gather(*(self._ejecutar(n, self._sondas[n]) for n in nombres))
+        ahora = time.time()
+        self._componentes = dict(zip(nombres, resultados))
+        self._listo = all(
+            r["status"] == "healthy" for n, r in self._componentes.items() if self._criticas[n]
+        )
+        todas_sanas = all(r["status"] == "healthy" for r in self._componentes.values())
+        estado = "healthy" if todas_sanas else ("degraded" if self._listo else "unhealthy")
+        # Las respuestas se arman aquí, una vez por muestreo, y no en cada petición
+        self._resumen = {
+            "status": estado,
+            "components": {n: r["status"] for n, r in self._componentes.items()},
+            "checked_at": ahora,
+        }
+        self._detalle = {
+            "status": estado,
+            "components": self._componentes,
+            "checked_at": ahora,
+            "interval_seconds": self.intervalo,
+        }
+
+    async def _bucle(self) -> None:
+        while True:
+            try:
+                await self.muestrear()
+            except Exception as e:
+                logger.error(f"Error muestreando dependencias: {str(e)}")
+            await asyncio.sleep(self.intervalo)
+
+    def start(self) -> None:
+        if self._tarea is None:
+            self._tarea = asyncio.create_task(self._bucle())
+
+    async def stop(self) -> None:
+        if self._tarea is not None:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+            self._tarea = None
+        for tarea in self._en_curso.values():
+            tarea.cancel()
+        self._en_curso.clear()
+
+    def listo(self) -> bool:
+        """True si todas las dependencias críticas respondieron en el último muestreo."""
+        return self._listo
+
+    def estado(self, nombre: str) -> str:
+        return self._componentes.get(nombre, {}).get("status", "unknown")
+
+    def resumen(self) -> Dict[str, Any]:
+        return self._resumen
+
+    def detalle(self) -> Dict[str, Any]:
+        return self._detalle
+
+
+def sonda_sql(engine) -> Sonda:
+    """SELECT 1 contra el motor: asíncrono si es un AsyncEngine, en un hilo si es síncrono."""
+    if hasattr(engine, "sync_engine"):
+        async def sonda():
+            async with engine.connect() as conexion:
+                await conexion.execute(text("SELECT 1"))
+    else:
+        def _consultar():
+            with engine.connect() as conexion:
+                conexion.execute(text("SELECT 1"))
+
+        async def sonda():
+            await asyncio.to_thread(_consultar)
+    return sonda
+
+
+def sonda_tcp(host: str, port: int) -> Sonda:
+    """Verifica que el puerto acepte conexiones (RabbitMQ, u otros sin cliente propio en el servicio)."""
+    async def sonda():
+        _, writer = await asyncio.open_connection(host, int(port))
+        writer.close()
+        await writer.wait_closed()
+    return sonda
@@ -0,0 +1,93 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError, jwt
+from prometheus_client import Counter, Gauge
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+TOKEN_CACHE_REQUESTS = Counter(
+    "token_cache_requests_total",
+    "Validaciones de JWT por resultado (hit: token ya verificado, miss: decodificado y verificado)",
+    ["resultado"]
+)
+TOKEN_CACHE_ENTRIES = Gauge(
+    "token_cache_entries",
+    "Tokens verificados guardados en la caché local"
+)
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl=settings.AUTH_TOKEN_URL)
+
+
+class TokenCache:
+    """
+    LRU acotado de tokens ya verificados: digest SHA-256 del token -> claims.
+
+    Un mismo token se presenta en cada petición de la sesión; tras la primera
+    verificación HMAC las siguientes son una búsqueda en memoria. Cada entrada vence
+    con el `exp` del propio token y solo se guarda después de verificar la firma, así
+    que un token alterado (otro digest) nunca encuentra una entrada.
+    """
+
+    def __init__(self, max_entradas: int):
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
+    def verificar(self, token: str) -> Dict[str, Any]:
+        """Devuelve los claims del token; lanza JWTError si no es válido o ya venció."""
+        clave = hashlib.sha256(token.encode()).digest()
+        entrada = self._entradas.get(clave)
+        if entrada is not None:
+            claims, vence = entrada
+            if vence > time.time():
+                self._entradas.move_to_end(clave)
+                TOKEN_CACHE_REQUESTS.labels(resultado="hit").inc()
+                return claims
+            del self._entradas[clave]
+
+        TOKEN_CACHE_REQUESTS.labels(resultado="miss").inc()
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        vence = claims.get("exp")
+        # Los tokens sin vencimiento no se cachean: no habría cuándo descartarlos
+        if isinstance(vence, (int, float)) and self.max_entradas > 0:
+            self._entradas[clave] = (claims, float(vence))
+            if len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+        TOKEN_CACHE_ENTRIES.set(len(self._entradas))
+        return claims
+
+    def limpiar(self) -> None:
+        self._entradas.clear()
+        TOKEN_CACHE_ENTRIES.set(0)
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_MAX_ENTRADAS)
+
+
+async def get_current_claims(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
+    """Dependencia que valida el bearer token (con caché) y devuelve sus claims."""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Credenciales inválidas",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        claims = token_cache.verificar(token)
+    except JWTError as e:
+        logger.warning(f"Token JWT inválido: {str(e)}")
+        raise credentials_exception
+    if claims.get("sub") is None:
+        raise credentials_exception
+    return claims
+
+
+async def get_current_user(claims: Dict[str, Any] = Depends(get_current_claims)) -> str:
+    """Dependencia que devuelve el usuario (`sub`) del bearer token."""
+    return claims["sub"]
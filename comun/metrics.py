@@ -0,0 +1,127 @@
+import time
+from typing import Dict
+
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Peticiones HTTP atendidas por método, plantilla de ruta y clase de estado",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Duración de las peticiones HTTP atendidas por método y plantilla de ruta",
+    ["method", "route"]
+)
+RABBITMQ_PUBLISH_DURATION = Histogram(
+    "rabbitmq_publish_duration_seconds",
+    "Duración de la publicación de eventos en RabbitMQ por routing key",
+    ["routing_key"]
+)
+RABBITMQ_PUBLISH_FAILURES = Counter(
+    "rabbitmq_publish_failures_total",
+    "Publicaciones fallidas en RabbitMQ por routing key",
+    ["routing_key"]
+)
+
+METODOS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+
+def _clase_estado(status: int) -> str:
+    return f"{status // 100}xx"
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que registra tasa, errores y duración (RED) de cada petición.
+
+    La ruta se etiqueta con la plantilla (`/api/v1/vuelos/{vuelo_id}`) que FastAPI deja en
+    el scope al resolver la petición, nunca con la ruta cruda, y el estado por clase (2xx,
+    4xx, 5xx), para que el número de series no crezca con los ids. Lo que no resuelve a una
+    ruta de la API (404, docs) se agrupa en `route="unmatched"`.
+    """
+
+    # El scraping no se mide a sí mismo
+    RUTAS_EXCLUIDAS = ("/metrics",)
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.RUTAS_EXCLUIDAS):
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        status = 500
+
+        async def send_registrando(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_registrando)
+        finally:
+            ruta = scope.get("route")
+            plantilla = getattr(ruta, "path", None) or "unmatched"
+            metodo = scope["method"] if scope["method"] in METODOS else "OTHER"
+            HTTP_REQUEST_DURATION.labels(method=metodo, route=plantilla).observe(time.perf_counter() - inicio)
+            HTTP_REQUESTS.labels(method=metodo, route=plantilla, status=_clase_estado(status)).inc()
+
+
+class PoolCollector:
+    """
+    Publica el estado del pool de cada motor SQLAlchemy registrado.
+
+    Los valores se leen del pool en el momento del scraping, así que no hay que
+    actualizar nada por petición.
+    """
+
+    def __init__(self):
+        self._engines: Dict[str, object] = {}
+
+    def registrar(self, nombre: str, engine) -> None:
+        # Un AsyncEngine expone el pool a través de su motor síncrono
+        self._engines[nombre] = getattr(engine, "sync_engine", engine)
+
+    def collect(self):
+        checked_out = GaugeMetricFamily(
+            "db_pool_checked_out_connections",
+            "Conexiones del pool prestadas en este momento",
+            labels=["engine"]
+        )
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow_connections",
+            "Conexiones abiertas por encima de pool_size (max_overflow en uso)",
+            labels=["engine"]
+        )
+        size = GaugeMetricFamily(
+            "db_pool_size",
+            "Tamaño configurado del pool (pool_size)",
+            labels=["engine"]
+        )
+        for nombre, engine in self._engines.items():
+            pool = engine.pool
+            # Solo QueuePool (y su variante asíncrona) lleva estas cuentas
+            if not hasattr(pool, "checkedout"):
+                continue
+            checked_out.add_metric([nombre], pool.checkedout())
+            # overflow() es negativo mientras quedan conexiones del pool base sin abrir
+            overflow.add_metric([nombre], max(pool.overflow(), 0))
+            size.add_metric([nombre], pool.size())
+        yield checked_out
+        yield overflow
+        yield size
+
+
+db_pool_collector = PoolCollector()
+REGISTRY.register(db_pool_collector)
+
+
+def registrar_pool(nombre: str, engine) -> None:
+    """Agrega un motor a las métricas de pool (`engine` es el label)."""
+    db_pool_collector.registrar(nombre, engine)
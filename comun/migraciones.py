@@ -0,0 +1,83 @@
+import logging
+from pathlib import Path
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+# Raíz del servicio: el directorio con alembic.ini (app/core/ o app/ según el servicio)
+RAIZ_SERVICIO = next(p for p in Path(__file__).resolve().parents if (p / "alembic.ini").exists())
+# Revisión que describe el esquema creado antes de las migraciones (create_all / mysql-init)
+REVISION_BASE = "0001"
+ESPERA_LOCK_SEGUNDOS = 60
+
+
+def _config(conexion: Optional[Connection] = None) -> Config:
+    config = Config(str(RAIZ_SERVICIO / "alembic.ini"))
+    config.set_main_option("script_location", str(RAIZ_SERVICIO / "migrations"))
+    if conexion is not None:
+        config.attributes["connection"] = conexion
+    return config
+
+
+def revision_head() -> str:
+    """Última revisión disponible en el código (se lee de los scripts, sin tocar la base de datos)."""
+    return ScriptDirectory.from_config(_config()).get_current_head()
+
+
+def _revision_actual(conexion: Connection) -> Optional[str]:
+    try:
+        return conexion.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except DBAPIError:
+        # La tabla aún no existe: base de datos nueva o creada antes de las migraciones
+        conexion.rollback()
+        return None
+
+
+def ejecutar_migraciones(engine: Engine) -> None:
+    """
+    Lleva el esquema a la última revisión.
+
+    Si la base ya está al día el costo es una sola consulta a alembic_version; solo cuando
+    hay revisiones pendientes se toma un lock de MySQL (para que varias réplicas arrancando
+    a la vez no migren en paralelo) y se ejecuta el DDL.
+    """
+    head = revision_head()
+    # Un lock por base de datos (airline_vuelos_migraciones, ...): cada servicio tiene la suya
+    lock = f"{engine.url.database}_migraciones"
+    with engine.connect() as conexion:
+        actual = _revision_actual(conexion)
+    if actual == head:
+        logger.info(f"Esquema al día (revisión {head})")
+        return
+
+    with engine.connect() as conexion:
+        obtenido = conexion.execute(
+            text("SELECT GET_LOCK(:nombre, :espera)"),
+            {"nombre": lock, "espera": ESPERA_LOCK_SEGUNDOS}
+        ).scalar()
+        if obtenido != 1:
+            raise RuntimeError(f"No se pudo obtener el lock de migraciones en {ESPERA_LOCK_SEGUNDOS} segundos")
+        try:
+            # Otra réplica pudo haber migrado mientras se esperaba el lock
+            actual = _revision_actual(conexion)
+            if actual == head:
+                logger.info(f"Esquema migrado por otra instancia (revisión {head})")
+                return
+            config = _config(conexion)
+            # Sin alembic_version pero con tablas: esquema creado antes de las migraciones
+            if actual is None and set(inspect(conexion).get_table_names()) - {"alembic_version"}:
+                logger.info(f"Esquema existente sin versionar, marcándolo como revisión {REVISION_BASE}")
+                command.stamp(config, REVISION_BASE)
+            logger.info(f"Migrando esquema de {actual or 'vacío'} a {head}")
+            command.upgrade(config, "head")
+            conexion.commit()
+            logger.info(f"Esquema migrado a la revisión {head}")
+        finally:
+            conexion.execute(text("SELECT RELEASE_LOCK(:nombre)"), {"nombre": lock})
@@ -0,0 +1,55 @@
+import base64
+import binascii
+from typing import List, Optional
+
+from fastapi import HTTPException, Response, status
+
+# Header con el cursor de la siguiente página; el cuerpo sigue siendo una lista
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(ultimo_id: int) -> str:
+    """Codifica el último id de una página como un cursor opaco."""
+    return base64.urlsafe_b64encode(f"id:{ultimo_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Decodifica un cursor generado por encode_cursor y retorna el último id visto."""
+    if not cursor:
+        return None
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        prefijo, valor = base64.urlsafe_b64decode(cursor + relleno).decode().split(":", 1)
+        if prefijo != "id":
+            raise ValueError(prefijo)
+        return int(valor)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido"
+        )
+
+
+def consulta_por_id(query, columna_id, ultimo_id: Optional[int], skip: int, limit: int):
+    """
+    Restringe una consulta (Query o select()) a una página por id ascendente.
+    Con cursor usa `id > ultimo_id`, cuyo costo no depende de la profundidad de la página;
+    sin cursor mantiene el comportamiento de `skip` por compatibilidad.
+    """
+    query = query.order_by(columna_id)
+    if ultimo_id is not None:
+        query = query.filter(columna_id > ultimo_id)
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def paginar_por_id(query, columna_id, ultimo_id: Optional[int], skip: int, limit: int) -> List:
+    """Ejecuta una Query síncrona paginada por id (ver consulta_por_id)."""
+    return consulta_por_id(query, columna_id, ultimo_id, skip, limit).all()
+
+
+def set_next_cursor(response: Response, items: List, limit: int) -> None:
+    """Agrega el cursor de la siguiente página si la página actual vino completa."""
+    if items and len(items) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1].id)
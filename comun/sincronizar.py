@@ -0,0 +1,82 @@
+"""
+Sincroniza los módulos compartidos entre servicios.
+
+Cada servicio se construye con su propio directorio como contexto de Docker
+(`build: ./<servicio>` en el docker-compose raíz y `build: .` en el de cada servicio),
+así que no puede instalar un paquete que viva fuera de él. La fuente única de estos
+módulos es comun/, y cada servicio lleva una copia idéntica con un encabezado que
+remite aquí: los cambios se hacen en comun/ y se propagan con este script.
+
+Uso, desde la raíz del repositorio:
+
+    python comun/sincronizar.py              # reescribe las copias que difieran
+    python comun/sincronizar.py --verificar  # termina con error si alguna copia difiere
+"""
+import argparse
+import sys
+from pathlib import Path
+
+COMUN = Path(__file__).resolve().parent
+RAIZ = COMUN.parent
+
+TODOS = [
+    "aeropuertos-service",
+    "aviones-service",
+    "escalas-service",
+    "pasajeros-service",
+    "reservas-service",
+    "vuelos-service",
+]
+# Servicios que consultan a otros por HTTP y cachean sus referencias
+CON_REFERENCIAS = ["escalas-service", "reservas-service", "vuelos-service"]
+# Servicios que validan el bearer token
+CON_AUTH = ["pasajeros-service", "reservas-service", "vuelos-service"]
+# Servicios que esperan a la base de datos y migran en segundo plano durante el arranque
+CON_ARRANQUE_DB = ["aeropuertos-service", "pasajeros-service", "reservas-service"]
+
+MODULOS = {
+    "health_sampler.py": TODOS,
+    "metrics.py": TODOS,
+    "migraciones.py": TODOS,
+    "pagination.py": TODOS,
+    "http_client.py": CON_REFERENCIAS,
+    "reference_cache.py": CON_REFERENCIAS,
+    "reference_events.py": CON_REFERENCIAS,
+    "jwt_auth.py": CON_AUTH,
+    "arranque_db.py": CON_ARRANQUE_DB,
+}
+
+
+def destino(servicio: str, modulo: str) -> Path:
+    app = RAIZ / servicio / "app"
+    # aeropuertos-service no tiene paquete core/: sus módulos viven directamente en app/
+    return (app / "core" if (app / "core").is_dir() else app) / modulo
+
+
+def contenido(modulo: str) -> str:
+    encabezado = f"# Copia de comun/{modulo}: editar allí y ejecutar `python comun/sincronizar.py`\n"
+    return encabezado + (COMUN / modulo).read_text(encoding="utf-8")
+
+
+def main(verificar: bool) -> int:
+    distintos = []
+    for modulo, servicios in MODULOS.items():
+        esperado = contenido(modulo)
+        for servicio in servicios:
+            ruta = destino(servicio, modulo)
+            if ruta.exists() and ruta.read_text(encoding="utf-8") == esperado:
+                continue
+            distintos.append(ruta.relative_to(RAIZ))
+            if not verificar:
+                ruta.write_text(esperado, encoding="utf-8")
+
+    for ruta in distintos:
+        print(f"{'Difiere de comun/' if verificar else 'Actualizado'}: {ruta}")
+    return 1 if verificar and distintos else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Copia los módulos de comun/ a cada servicio")
+    parser.add_argument("--verificar", action="store_true", help="Solo comparar, sin escribir")
+    args = parser.parse_args()
+    sys.exit(main(args.verificar))
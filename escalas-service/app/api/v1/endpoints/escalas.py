@@ -1,38 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 import logging
 
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.models.escala import Escala
 from app.schemas.escala import EscalaCreate, EscalaUpdate, Escala as EscalaSchema
-from app.services.escala_service import EscalaService
+from app.services.escala_service import EscalaService, ServicioNoDisponibleError
+from app.core.pagination import decode_cursor, paginar_por_id, set_next_cursor
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/", response_model=List[EscalaSchema])
 def get_escalas(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Obtener todas las escalas con paginación
+    Obtener todas las escalas con paginación por cursor (header X-Next-Cursor)
     """
-    return db.query(Escala).offset(skip).limit(limit).all()
+    escalas = paginar_por_id(db.query(Escala), Escala.id, decode_cursor(cursor), skip, limit)
+    set_next_cursor(response, escalas, limit)
+    return escalas
 
 @router.post("/", response_model=EscalaSchema, status_code=status.HTTP_201_CREATED)
-def create_escala(escala: EscalaCreate, db: Session = Depends(get_db)):
+async def create_escala(escala: EscalaCreate, db: AsyncSession = Depends(get_async_db)):
     """
-    Crear una nueva escala
+    Crear una nueva escala, verificando que existan el vuelo y el aeropuerto
     """
-    db_escala = Escala(**escala.model_dump())
-    db.add(db_escala)
-    db.commit()
-    db.refresh(db_escala)
-    return db_escala
+    try:
+        return await EscalaService(db).create_escala(escala)
+    except ServicioNoDisponibleError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.get("/{escala_id}", response_model=EscalaSchema)
 def get_escala(escala_id: int, db: Session = Depends(get_db)):
@@ -91,9 +98,9 @@ def delete_escala(escala_id: int, db: Session = Depends(get_db)):
     return None
 
 @router.patch("/{escala_id}/estado", response_model=EscalaSchema)
-def update_estado_escala(escala_id: int, estado: str, db: Session = Depends(get_db)):
+async def update_estado_escala(escala_id: int, estado: str, db: AsyncSession = Depends(get_async_db)):
     escala_service = EscalaService(db)
-    updated_escala = escala_service.update_estado_escala(escala_id, estado)
+    updated_escala = await escala_service.update_estado_escala(escala_id, estado)
     if not updated_escala:
         raise HTTPException(status_code=404, detail="Escala no encontrada")
     return updated_escala 
\ No newline at end of file
@@ -31,15 +31,38 @@ class Settings(BaseSettings):
     RABBITMQ_USER: str = "guest"
     RABBITMQ_PASSWORD: str = "guest"
 
+    @property
+    def RABBITMQ_URL(self) -> str:
+        return f"amqp://{self.RABBITMQ_USER}:{self.RABBITMQ_PASSWORD}@{self.RABBITMQ_HOST}:{self.RABBITMQ_PORT}/"
+
     # URLs de otros servicios
     VUELOS_SERVICE_URL: str = "http://vuelos-service:8003/api/v1"
     AEROPUERTOS_SERVICE_URL: str = "http://aeropuertos-service:8005/api/v1"
 
+    # Cliente HTTP compartido
+    HTTP_CONNECT_TIMEOUT: float = 2.0
+    HTTP_READ_TIMEOUT: float = 5.0
+    HTTP_POOL_TIMEOUT: float = 5.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 20
+
+    # Caché de existencia de referencias externas (TTL en segundos)
+    REFERENCE_CACHE_TTL_POSITIVO: int = 300
+    REFERENCE_CACHE_TTL_NEGATIVO: int = 30
+    REFERENCE_CACHE_MAX_ENTRADAS: int = 10000
+    REFERENCE_CACHE_REDIS_URL: Optional[str] = None
+
     # Configuración de seguridad
     SECRET_KEY: str = "tu_clave_secreta_aqui"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Muestreo de salud de dependencias en segundo plano (segundos)
+    HEALTH_INTERVALO_SEGUNDOS: float = 5.0
+    HEALTH_TIMEOUT_SEGUNDOS: float = 2.0
+
     class Config:
         env_file = ".env"
 
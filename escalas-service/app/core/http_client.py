@@ -0,0 +1,114 @@
+# Copia de comun/http_client.py: editar allí y ejecutar `python comun/sincronizar.py`
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+import httpx
+from prometheus_client import Gauge, Histogram
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HTTP_CLIENT_IN_FLIGHT = Gauge(
+    "http_client_requests_in_flight",
+    "Peticiones salientes en curso por host destino",
+    ["host"]
+)
+HTTP_CLIENT_WAITING = Gauge(
+    "http_client_requests_waiting",
+    "Peticiones salientes esperando un cupo del límite por host",
+    ["host"]
+)
+HTTP_CLIENT_HOST_LIMIT = Gauge(
+    "http_client_host_connection_limit",
+    "Máximo de conexiones concurrentes permitidas por host destino",
+    ["host"]
+)
+HTTP_CLIENT_DURATION = Histogram(
+    "http_client_request_duration_seconds",
+    "Duración de las peticiones salientes por host destino, método y clase de estado (o error)",
+    ["host", "method", "status"]
+)
+
+
+class HTTPClient:
+    """
+    Cliente HTTP asíncrono compartido por todo el servicio.
+
+    Mantiene un único httpx.AsyncClient con pool de conexiones y keep-alive,
+    creado y cerrado en el lifespan de la aplicación, y limita las peticiones
+    concurrentes hacia cada host para que un servicio lento no acapare el pool.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaforos: Dict[str, asyncio.Semaphore] = {}
+
+    async def start(self) -> None:
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(
+                connect=settings.HTTP_CONNECT_TIMEOUT,
+                read=settings.HTTP_READ_TIMEOUT,
+                write=settings.HTTP_READ_TIMEOUT,
+                pool=settings.HTTP_POOL_TIMEOUT
+            )
+        )
+        logger.info("Cliente HTTP compartido iniciado")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("Cliente HTTP compartido cerrado")
+
+    def _semaforo(self, host: str) -> asyncio.Semaphore:
+        semaforo = self._semaforos.get(host)
+        if semaforo is None:
+            semaforo = asyncio.Semaphore(settings.HTTP_MAX_CONNECTIONS_PER_HOST)
+            self._semaforos[host] = semaforo
+            HTTP_CLIENT_HOST_LIMIT.labels(host=host).set(settings.HTTP_MAX_CONNECTIONS_PER_HOST)
+        return semaforo
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        if self._client is None:
+            # Uso fuera del lifespan (scripts, pruebas): se crea el cliente bajo demanda
+            await self.start()
+        host = httpx.URL(url).host
+        semaforo = self._semaforo(host)
+
+        HTTP_CLIENT_WAITING.labels(host=host).inc()
+        try:
+            await semaforo.acquire()
+        finally:
+            HTTP_CLIENT_WAITING.labels(host=host).dec()
+
+        HTTP_CLIENT_IN_FLIGHT.labels(host=host).inc()
+        # La espera por el cupo ya se ve en HTTP_CLIENT_WAITING: aquí solo la petición
+        inicio = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._client.request(method, url, **kwargs)
+            status = f"{response.status_code // 100}xx"
+            return response
+        finally:
+            HTTP_CLIENT_DURATION.labels(host=host, method=method, status=status).observe(time.perf_counter() - inicio)
+            HTTP_CLIENT_IN_FLIGHT.labels(host=host).dec()
+            semaforo.release()
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+
+http_client = HTTPClient()
@@ -1,12 +1,19 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import make_asgi_app
 import logging
 from sqlalchemy.exc import SQLAlchemyError
 from app.core.config import settings
+from app.core.health_sampler import HealthSampler, sonda_sql, sonda_tcp
+from app.core.http_client import http_client
+from app.core.metrics import MetricsMiddleware, registrar_pool
+from app.core.reference_cache import reference_cache
+from app.core.reference_events import reference_event_listener
 from app.api.v1.endpoints import escalas
-from app.db.session import engine
+from app.db.session import engine, async_engine
 from app.models import escala
+from app.core.migraciones import ejecutar_migraciones
 import sys
 import time
 
@@ -18,6 +25,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Estado de las dependencias, muestreado en segundo plano para los endpoints de salud
+health_sampler = HealthSampler(settings.HEALTH_INTERVALO_SEGUNDOS, settings.HEALTH_TIMEOUT_SEGUNDOS)
+health_sampler.registrar("database", sonda_sql(async_engine))
+health_sampler.registrar("rabbitmq", sonda_tcp(settings.RABBITMQ_HOST, settings.RABBITMQ_PORT), critica=False)
+if settings.REFERENCE_CACHE_REDIS_URL:
+    health_sampler.registrar("redis", reference_cache.ping, critica=False)
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
@@ -31,9 +45,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# Configurar métricas de Prometheus
+# Configurar métricas de Prometheus: RED por plantilla de ruta y estado de los pools
+app.add_middleware(MetricsMiddleware)
+registrar_pool("sync", engine)
+registrar_pool("async", async_engine)
 metrics_app = make_asgi_app()
 app.mount("/metrics", metrics_app)
 
@@ -43,26 +61,48 @@ app.include_router(escalas.router, prefix=f"{settings.API_V1_STR}/escalas", tags
 @app.on_event("startup")
 async def startup_event():
     logger.info(f"Iniciando {settings.PROJECT_NAME}")
+    health_sampler.start()
     max_retries = 5
     retry_delay = 5
     
     for attempt in range(max_retries):
         try:
-            logger.info(f"Intento {attempt + 1} de {max_retries} para crear tablas")
-            escala.Base.metadata.create_all(bind=engine)
-            logger.info("Tablas creadas correctamente")
+            logger.info(f"Intento {attempt + 1} de {max_retries} para aplicar migraciones")
+            ejecutar_migraciones(engine)
             break
         except Exception as e:
             if attempt < max_retries - 1:
-                logger.warning(f"Error al crear tablas (intento {attempt + 1}): {str(e)}")
+                logger.warning(f"Error al aplicar migraciones (intento {attempt + 1}): {str(e)}")
                 time.sleep(retry_delay)
             else:
-                logger.error(f"No se pudieron crear las tablas después de {max_retries} intentos: {str(e)}")
+                logger.error(f"No se pudieron aplicar las migraciones después de {max_retries} intentos: {str(e)}")
                 raise
 
+    await http_client.start()
+    reference_event_listener.suscribir("airline_events", "vuelos.deleted", "vuelo")
+    await reference_event_listener.start(settings.RABBITMQ_URL)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await health_sampler.stop()
+    await reference_event_listener.close()
+    await reference_cache.close()
+    await http_client.close()
+    await async_engine.dispose()
+
 @app.get("/health")
-def health_check():
-    return {"status": "ok"}
+async def health_check():
+    return health_sampler.resumen()
+
+@app.get("/health/ready")
+async def readiness_check():
+    if not health_sampler.listo():
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=health_sampler.resumen())
+    return health_sampler.resumen()
+
+@app.get("/health/detailed")
+async def detailed_health_check():
+    return health_sampler.detalle()
 
 if __name__ == "__main__":
     import uvicorn
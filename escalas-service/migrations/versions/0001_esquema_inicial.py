@@ -0,0 +1,44 @@
+"""Esquema inicial: escalas
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "escalas",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("vuelo_id", sa.Integer(), nullable=False),
+        sa.Column("aeropuerto_id", sa.Integer(), nullable=False),
+        sa.Column("numero_escala", sa.Integer(), nullable=False),
+        sa.Column("orden", sa.Integer(), nullable=False),
+        sa.Column("fecha_hora_llegada", sa.DateTime(), nullable=False),
+        sa.Column("fecha_hora_salida", sa.DateTime(), nullable=False),
+        sa.Column(
+            "estado",
+            sa.Enum("PROGRAMADA", "EN_PROGRESO", "COMPLETADA", "CANCELADA"),
+            nullable=False,
+        ),
+        sa.Column("tipo_escala", sa.Enum("TECNICA", "COMERCIAL"), nullable=False),
+        sa.Column("duracion_minutos", sa.Integer(), nullable=False),
+        sa.Column("terminal", sa.String(length=50), nullable=True),
+        sa.Column("puerta", sa.String(length=10), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_escalas_id", "escalas", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("escalas")
@@ -1,18 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ...core.security import (
     verify_password,
     create_access_token,
     get_current_user,
     Role,
     check_permissions,
-    generate_test_hash
+    generate_test_hash,
+    ejecutor_bcrypt
 )
 from ...core.config import settings
 from ...core.logger import logger
-from ...core.database import get_db
+from ...core.database import get_async_db
+from ...models.usuario import Usuario
 from ...services.auth_service import AuthService
 from pydantic import BaseModel
 
@@ -38,18 +41,18 @@ async def generate_hash(request: PasswordRequest):
     """
     Genera un hash para la contraseña proporcionada.
     """
-    hash = generate_test_hash(request.password)
+    hash = await ejecutor_bcrypt.ejecutar(generate_test_hash, request.password)
     return {"password": request.password, "hash": hash}
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Obtiene un token de acceso usando las credenciales del usuario.
     """
-    user = AuthService.authenticate_user(db, form_data.username, form_data.password)
+    user = await AuthService.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -68,12 +71,12 @@ async def login_for_access_token(
 @router.get("/me", response_model=TokenData)
 async def read_users_me(
     current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Obtiene la información del usuario actual.
     """
-    user = db.query(Usuario).filter(Usuario.email == current_user).first()
+    user = await db.scalar(select(Usuario).where(Usuario.email == current_user).limit(1))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
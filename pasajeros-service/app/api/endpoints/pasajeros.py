@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from ...core.database import get_db
+from typing import List, Optional
+from ...core.database import get_db, get_async_db
 from ...schemas.pasajero import PasajeroCreate, PasajeroUpdate, PasajeroResponse
 from ...services.pasajero_service import PasajeroService
 from ...core.exceptions import (
@@ -12,11 +13,12 @@ from ...core.exceptions import (
     UsuarioNotFoundException
 )
 from ...core.logger import logger
+from ...core.pagination import decode_cursor, set_next_cursor
 
 router = APIRouter()
 
 @router.post("/", response_model=PasajeroResponse, status_code=status.HTTP_201_CREATED)
-async def create_pasajero(pasajero: PasajeroCreate, db: Session = Depends(get_db)):
+async def create_pasajero(pasajero: PasajeroCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Crear un nuevo pasajero.
     """
@@ -72,15 +74,21 @@ def read_pasajero(pasajero_id: int, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=List[PasajeroResponse])
 def read_pasajeros(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Obtener lista de pasajeros.
+    Obtener lista de pasajeros con paginación por cursor (header X-Next-Cursor).
     """
     try:
-        return PasajeroService.get_pasajeros(db=db, skip=skip, limit=limit)
+        pasajeros = PasajeroService.get_pasajeros(
+            db=db, skip=skip, limit=limit, ultimo_id=decode_cursor(cursor)
+        )
+        set_next_cursor(response, pasajeros, limit)
+        return pasajeros
     except DatabaseException as e:
         logger.error(f"Error de base de datos al obtener pasajeros: {str(e)}")
         raise HTTPException(
@@ -92,7 +100,7 @@ def read_pasajeros(
 async def update_pasajero(
     pasajero_id: int,
     pasajero: PasajeroUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Actualizar un pasajero existente.
@@ -129,7 +137,7 @@ async def update_pasajero(
         )
 
 @router.delete("/{pasajero_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_pasajero(pasajero_id: int, db: Session = Depends(get_db)):
+async def delete_pasajero(pasajero_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Eliminar un pasajero.
     """
@@ -1,66 +1,58 @@
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from .arranque_db import ArranqueDB
 from .config import settings
 from .logger import logger
-import time
 
 # Usar la URL de la base de datos directamente desde la configuración
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 logger.info(f"Conectando a la base de datos: {SQLALCHEMY_DATABASE_URL}")
 
-# Crear el motor de SQLAlchemy
+# Crear el motor de SQLAlchemy (no abre conexiones: la primera se abre en arranque_db.iniciar(), desde el startup)
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     pool_pre_ping=True,
     pool_recycle=3600,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
     echo=True
 )
 
-# Verificar la conexión y el esquema
-max_retries = 3
-retry_delay = 2
-
-for attempt in range(max_retries):
-    try:
-        with engine.connect() as conn:
-            # Verificar la base de datos actual
-            result = conn.execute(text("SELECT DATABASE()"))
-            current_db = result.scalar()
-            logger.info(f"Base de datos actual: {current_db}")
-            
-            # Verificar las tablas existentes
-            result = conn.execute(text("SHOW TABLES"))
-            tables = result.fetchall()
-            logger.info(f"Tablas en la base de datos: {[table[0] for table in tables]}")
-            
-            # Verificar la estructura de la tabla usuarios
-            result = conn.execute(text("DESCRIBE usuarios"))
-            columns = result.fetchall()
-            logger.info(f"Estructura de la tabla usuarios: {[col[0] for col in columns]}")
-            
-            # Verificar si el usuario admin existe
-            result = conn.execute(text("SELECT * FROM usuarios WHERE email = 'admin@airline.com'"))
-            admin = result.fetchone()
-            if admin:
-                logger.info(f"Usuario admin encontrado: {admin}")
-            else:
-                logger.warning("Usuario admin no encontrado en la base de datos")
-            
-            break
-    except Exception as e:
-        logger.error(f"Error al verificar la base de datos (intento {attempt + 1}/{max_retries}): {str(e)}")
-        if attempt < max_retries - 1:
-            time.sleep(retry_delay)
-        else:
-            raise
-
 # Crear la sesión de SQLAlchemy
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Motor asíncrono (aiomysql) para los endpoints `async def`: las consultas no bloquean
+# el event loop y se solapan con la publicación de eventos y el resto de peticiones
+ASYNC_DATABASE_URL = make_url(SQLALCHEMY_DATABASE_URL).set(drivername="mysql+aiomysql")
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW
+)
+# expire_on_commit=False: tras el commit los atributos siguen cargados y no hace falta
+# una carga perezosa (que en modo asíncrono no está permitida) al serializar la respuesta
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 # Crear la base para los modelos
 Base = declarative_base()
 
+def _verificar_admin(engine):
+    with engine.connect() as conn:
+        result = conn.execute(text("SELECT DATABASE()"))
+        logger.info(f"Base de datos actual: {result.scalar()}")
+        # Verificar si el usuario admin existe
+        result = conn.execute(text("SELECT id FROM usuarios WHERE email = 'admin@airline.com'"))
+        if result.fetchone() is None:
+            logger.warning("Usuario admin no encontrado en la base de datos")
+
+# Espera, migraciones y calentamiento del pool en el arranque (ver comun/arranque_db.py)
+arranque_db = ArranqueDB(engine, async_engine, despues_de_migrar=_verificar_admin)
+
 # Función para obtener la sesión de la base de datos
 def get_db():
     db = SessionLocal()
@@ -72,4 +64,8 @@ def get_db():
         raise
     finally:
         logger.info("Cerrando sesión de base de datos")
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
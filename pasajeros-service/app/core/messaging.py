@@ -1,8 +1,10 @@
 import aio_pika
 import json
+import time
 from typing import Any, Callable, Dict, Optional
 from .config import settings
 from .logger import logger
+from .metrics import RABBITMQ_PUBLISH_DURATION, RABBITMQ_PUBLISH_FAILURES
 from functools import wraps
 import asyncio
 from datetime import datetime
@@ -56,6 +58,8 @@ class MessageBroker:
             "data": message
         }
 
+        # Cada intento (incluidos los reintentos) se mide por separado
+        inicio = time.perf_counter()
         try:
             await self.exchange.publish(
                 aio_pika.Message(
@@ -65,8 +69,11 @@ class MessageBroker:
                 ),
                 routing_key=routing_key
             )
+            RABBITMQ_PUBLISH_DURATION.labels(routing_key=routing_key).observe(time.perf_counter() - inicio)
             logger.info(f"Mensaje publicado en {routing_key}: {message}")
         except Exception as e:
+            RABBITMQ_PUBLISH_DURATION.labels(routing_key=routing_key).observe(time.perf_counter() - inicio)
+            RABBITMQ_PUBLISH_FAILURES.labels(routing_key=routing_key).inc()
             logger.error(f"Error al publicar mensaje en {routing_key}: {str(e)}")
             if retry:
                 await self._retry_publish(routing_key, message)
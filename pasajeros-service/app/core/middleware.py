@@ -1,93 +1,154 @@
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi.responses import JSONResponse
+"""
+Middlewares ASGI puros del servicio.
+
+A diferencia de BaseHTTPMiddleware, no crean una tarea ni un stream intermedio por
+petición y no leen el cuerpo de la respuesta: los headers se agregan al pasar el mensaje
+`http.response.start` y el cuerpo fluye tal cual (las respuestas en streaming se siguen
+enviando por partes).
+"""
+import hmac
+import math
 import time
-from .logger import logger
-from .exceptions import BaseAPIException
-from sqlalchemy.exc import SQLAlchemyError
 import traceback
+from typing import Iterable, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 from .config import settings
-from collections import defaultdict
-from datetime import datetime, timedelta
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
-        # Agregar headers de seguridad
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Content-Security-Policy"] = "default-src 'self'"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-        
-        return response
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
-        self.requests = defaultdict(list)
-        self.cleanup_task = None
-
-    async def dispatch(self, request: Request, call_next):
-        # Obtener IP del cliente
-        client_ip = request.client.host
-        
-        # Limpiar solicitudes antiguas
-        current_time = datetime.now()
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests[client_ip]
-            if current_time - req_time < timedelta(minutes=1)
-        ]
-        
-        # Verificar límite de tasa
-        if len(self.requests[client_ip]) >= settings.RATE_LIMIT_PER_MINUTE:
+from .exceptions import BaseAPIException
+from .logger import logger
+from .rate_limit import rate_limiter
+
+
+def _header(scope: Scope, nombre: bytes) -> Optional[str]:
+    for clave, valor in scope["headers"]:
+        if clave == nombre:
+            return valor.decode("latin-1")
+    return None
+
+
+def _ip_cliente(scope: Scope) -> str:
+    cliente = scope.get("client")
+    return cliente[0] if cliente else "desconocido"
+
+
+def _agregar_headers(message: Message, headers: Iterable[Tuple[bytes, bytes]]) -> None:
+    message["headers"] = list(message.get("headers", [])) + list(headers)
+
+
+class SecurityHeadersMiddleware:
+    HEADERS = [
+        (b"x-content-type-options", b"nosniff"),
+        (b"x-frame-options", b"DENY"),
+        (b"x-xss-protection", b"1; mode=block"),
+        (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+        (b"referrer-policy", b"strict-origin-when-cross-origin"),
+        (b"permissions-policy", b"geolocation=(), microphone=(), camera=()"),
+    ]
+    CSP = (b"content-security-policy", b"default-src 'self'")
+    # Swagger UI y ReDoc cargan sus recursos desde un CDN
+    RUTAS_SIN_CSP = ("/docs", "/redoc")
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = self.HEADERS
+        if not scope["path"].startswith(self.RUTAS_SIN_CSP):
+            headers = headers + [self.CSP]
+
+        async def send_con_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                _agregar_headers(message, headers)
+            await send(message)
+
+        await self.app(scope, receive, send_con_headers)
+
+
+class RateLimitMiddleware:
+    # Sondas y scraping no consumen cupo
+    RUTAS_EXENTAS = ("/api/v1/health", "/metrics")
+
+    def __init__(self, app: ASGIApp, limiter=rate_limiter, token_interno: str = settings.TOKEN_SERVICIOS_INTERNOS):
+        self.app = app
+        self.limiter = limiter
+        self.token_interno = token_interno.encode()
+
+    def _es_servicio_interno(self, scope: Scope) -> bool:
+        if not self.token_interno:
+            return False
+        token = _header(scope, b"x-service-token")
+        return token is not None and hmac.compare_digest(token.encode("latin-1"), self.token_interno)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.RUTAS_EXENTAS) or self._es_servicio_interno(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # Verificar límite de tasa (compartido entre réplicas vía Redis)
+        client_ip = _ip_cliente(scope)
+        permitido, reintentar_en = await self.limiter.permitir(client_ip)
+        if not permitido:
             logger.warning(f"Rate limit excedido para IP: {client_ip}")
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=429,
-                content={"detail": "Demasiadas solicitudes. Por favor, intente más tarde."}
+                content={"detail": "Demasiadas solicitudes. Por favor, intente más tarde."},
+                headers={"Retry-After": str(max(math.ceil(reintentar_en), 1))}
             )
-        
-        # Agregar solicitud actual
-        self.requests[client_ip].append(current_time)
-        
-        # Continuar con la solicitud
-        return await call_next(request)
-
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        request_id = request.headers.get("X-Request-ID", "N/A")
-        
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+
+class LoggingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        request_id = _header(scope, b"x-request-id") or "N/A"
+        method = scope["method"]
+        path = scope["path"]
+
         # Log de la petición
         logger.info(
             f"Request ID: {request_id} - "
-            f"Method: {request.method} - "
-            f"Path: {request.url.path} - "
-            f"Client IP: {request.client.host}"
+            f"Method: {method} - "
+            f"Path: {path} - "
+            f"Client IP: {_ip_cliente(scope)}"
         )
-        
+
+        async def send_con_tiempo(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Tiempo hasta que la respuesta empieza a enviarse
+                process_time = time.perf_counter() - inicio
+                _agregar_headers(message, [
+                    (b"x-process-time", str(process_time).encode()),
+                    (b"x-request-id", request_id.encode("latin-1")),
+                ])
+                # Log de la respuesta
+                logger.info(
+                    f"Request ID: {request_id} - "
+                    f"Method: {method} - "
+                    f"Path: {path} - "
+                    f"Status: {message['status']} - "
+                    f"Time: {process_time:.2f}s"
+                )
+            await send(message)
+
         try:
-            response = await call_next(request)
-            
-            # Calcular tiempo de procesamiento
-            process_time = time.time() - start_time
-            response.headers["X-Process-Time"] = str(process_time)
-            response.headers["X-Request-ID"] = request_id
-            
-            # Log de la respuesta
-            logger.info(
-                f"Request ID: {request_id} - "
-                f"Method: {request.method} - "
-                f"Path: {request.url.path} - "
-                f"Status: {response.status_code} - "
-                f"Time: {process_time:.2f}s"
-            )
-            
-            return response
-            
+            await self.app(scope, receive, send_con_tiempo)
         except Exception as e:
             logger.error(
                 f"Request ID: {request_id} - "
@@ -96,13 +157,36 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             logger.error(traceback.format_exc())
             raise
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = request.headers.get("X-Request-ID", "N/A")
+
+class ErrorHandlingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        respuesta_iniciada = False
+
+        async def send_registrando(message: Message) -> None:
+            nonlocal respuesta_iniciada
+            if message["type"] == "http.response.start":
+                respuesta_iniciada = True
+            await send(message)
+
         try:
-            return await call_next(request)
-            
-        except BaseAPIException as e:
+            await self.app(scope, receive, send_registrando)
+        except Exception as e:
+            # Con la respuesta ya en curso no se puede enviar otra: se deja al servidor
+            if respuesta_iniciada:
+                raise
+            response = self._respuesta_error(e, _header(scope, b"x-request-id") or "N/A")
+            await response(scope, receive, send)
+
+    @staticmethod
+    def _respuesta_error(e: Exception, request_id: str) -> JSONResponse:
+        if isinstance(e, BaseAPIException):
             logger.error(
                 f"Request ID: {request_id} - "
                 f"API Error: {str(e)}"
@@ -115,8 +199,8 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
                 },
                 headers=e.headers
             )
-            
-        except SQLAlchemyError as e:
+
+        if isinstance(e, SQLAlchemyError):
             logger.error(
                 f"Request ID: {request_id} - "
                 f"Database Error: {str(e)}"
@@ -128,17 +212,16 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
                     "request_id": request_id
                 }
             )
-            
-        except Exception as e:
-            logger.error(
-                f"Request ID: {request_id} - "
-                f"Unhandled Error: {str(e)}"
-            )
-            logger.error(traceback.format_exc())
-            return JSONResponse(
-                status_code=500,
-                content={
-                    "detail": "Error interno del servidor",
-                    "request_id": request_id
-                }
-            ) 
\ No newline at end of file
+
+        logger.error(
+            f"Request ID: {request_id} - "
+            f"Unhandled Error: {str(e)}"
+        )
+        logger.error(traceback.format_exc())
+        return JSONResponse(
+            status_code=500,
+            content={
+                "detail": "Error interno del servidor",
+                "request_id": request_id
+            }
+        )
@@ -0,0 +1,136 @@
+import time
+from array import array
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from .config import settings
+from .logger import logger
+
+# GCRA (token bucket sin temporizadores): por cliente se guarda un único valor, el
+# "theoretical arrival time" (TAT). Cada petición lo adelanta un intervalo de emisión;
+# se rechaza si quedaría más de un periodo por delante del reloj. Un GET y un SET por
+# petición, atómicos dentro del script, con el reloj del propio Redis para que todas
+# las réplicas compartan la misma referencia de tiempo.
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local ahora = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local intervalo = tonumber(ARGV[1])
+local periodo = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or ahora)
+if tat < ahora then
+    tat = ahora
+end
+local nuevo_tat = tat + intervalo
+local permitido_desde = nuevo_tat - periodo
+if ahora < permitido_desde then
+    return {0, permitido_desde - ahora}
+end
+redis.call('SET', KEYS[1], nuevo_tat, 'PX', nuevo_tat - ahora)
+return {1, 0}
+"""
+
+
+class LimitadorLocal:
+    """
+    Ventana deslizante en memoria, usada mientras Redis no está disponible.
+
+    Cada cliente tiene un ring buffer de tamaño fijo (`limite` marcas de tiempo): la
+    marca en la posición actual es la petición de hace `limite` peticiones, así que
+    basta compararla con el inicio de la ventana. Las claves se guardan en orden de
+    último uso y se desalojan las que llevan más de un periodo inactivas (o las más
+    antiguas si se supera `max_claves`), por lo que la memoria queda acotada.
+    """
+
+    def __init__(self, limite: int, periodo: float, max_claves: int):
+        self.limite = limite
+        self.periodo = periodo
+        self.max_claves = max_claves
+        # clave -> (ring buffer, posición siguiente, último uso)
+        self._ventanas: "OrderedDict[str, Tuple[array, int, float]]" = OrderedDict()
+
+    def _desalojar(self, ahora: float) -> None:
+        while self._ventanas:
+            clave, (_, _, ultimo_uso) = next(iter(self._ventanas.items()))
+            if ahora - ultimo_uso < self.periodo and len(self._ventanas) <= self.max_claves:
+                break
+            del self._ventanas[clave]
+
+    def permitir(self, clave: str) -> Tuple[bool, float]:
+        """Devuelve (permitido, segundos hasta poder reintentar)."""
+        ahora = time.monotonic()
+        entrada = self._ventanas.pop(clave, None)
+        if entrada is None:
+            # -inf: posiciones aún sin usar, siempre fuera de la ventana
+            marcas, posicion = array("d", [float("-inf")] * self.limite), 0
+        else:
+            marcas, posicion, _ = entrada
+
+        mas_antigua = marcas[posicion]
+        if ahora - mas_antigua < self.periodo:
+            self._ventanas[clave] = (marcas, posicion, ahora)
+            return False, self.periodo - (ahora - mas_antigua)
+
+        marcas[posicion] = ahora
+        self._ventanas[clave] = (marcas, (posicion + 1) % self.limite, ahora)
+        self._desalojar(ahora)
+        return True, 0.0
+
+
+class RateLimiter:
+    """
+    Límite de peticiones por cliente compartido por todas las réplicas (GCRA en Redis).
+
+    Si Redis falla se pasa al LimitadorLocal y no se vuelve a intentar Redis durante
+    `RATE_LIMIT_REINTENTO_REDIS_SEGUNDOS`, para no pagar un timeout en cada petición.
+    """
+
+    def __init__(self, limite: int, periodo: float = 60.0):
+        self.limite = limite
+        self.periodo_ms = int(periodo * 1000)
+        self.intervalo_ms = max(self.periodo_ms // limite, 1)
+        self.local = LimitadorLocal(limite, periodo, settings.RATE_LIMIT_MAX_CLAVES_LOCALES)
+        self._redis: Optional[redis.Redis] = None
+        self._script = None
+        self._redis_suspendido_hasta = 0.0
+
+    def _get_script(self):
+        if self._script is None:
+            self._redis = redis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=settings.RATE_LIMIT_REDIS_TIMEOUT,
+                socket_connect_timeout=settings.RATE_LIMIT_REDIS_TIMEOUT
+            )
+            # register_script usa EVALSHA y recarga el script si Redis no lo tiene
+            self._script = self._redis.register_script(GCRA_SCRIPT)
+        return self._script
+
+    async def permitir(self, clave: str) -> Tuple[bool, float]:
+        """Devuelve (permitido, segundos hasta poder reintentar)."""
+        if time.monotonic() >= self._redis_suspendido_hasta:
+            try:
+                permitido, espera_ms = await self._get_script()(
+                    keys=[f"ratelimit:{clave}"],
+                    args=[self.intervalo_ms, self.periodo_ms]
+                )
+                return bool(permitido), int(espera_ms) / 1000
+            except (RedisError, OSError) as e:
+                self._redis_suspendido_hasta = time.monotonic() + settings.RATE_LIMIT_REINTENTO_REDIS_SEGUNDOS
+                logger.warning(f"Redis no disponible para rate limiting, usando límite local: {str(e)}")
+        return self.local.permitir(clave)
+
+    async def ping(self) -> None:
+        """Sonda de salud del Redis que respalda el límite."""
+        self._get_script()
+        await self._redis.ping()
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+            self._script = None
+
+
+rate_limiter = RateLimiter(settings.RATE_LIMIT_PER_MINUTE)
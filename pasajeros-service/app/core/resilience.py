@@ -1,11 +1,16 @@
+import asyncio
 from typing import Optional, Callable, Any
 import pybreaker
 from functools import wraps
 import logging
 from ..core.config import settings
+from .health_sampler import HealthSampler
 
 logger = logging.getLogger(__name__)
 
+# Estado de las dependencias, muestreado en segundo plano (las sondas se registran en main)
+health_sampler = HealthSampler(settings.HEALTH_INTERVALO_SEGUNDOS, settings.HEALTH_TIMEOUT_SEGUNDOS)
+
 # Circuit breaker para operaciones de base de datos
 db_breaker = pybreaker.CircuitBreaker(
     fail_max=5,  # Número máximo de fallos antes de abrir el circuito
@@ -75,21 +80,8 @@ async def retry_with_backoff(
     raise last_exception
 
 # Función para verificar el estado de salud de dependencias
-async def check_dependency_health(dependency_name: str) -> bool:
+def check_dependency_health(dependency_name: str) -> bool:
     """
-    Verifica el estado de salud de una dependencia específica
+    Estado de una dependencia según el último muestreo del health_sampler (sin I/O)
     """
-    try:
-        if dependency_name == "database":
-            # Implementar verificación de base de datos
-            return True
-        elif dependency_name == "rabbitmq":
-            # Implementar verificación de RabbitMQ
-            return True
-        elif dependency_name == "redis":
-            # Implementar verificación de Redis
-            return True
-        return False
-    except Exception as e:
-        logger.error(f"Error verificando salud de {dependency_name}: {str(e)}")
-        return False 
\ No newline at end of file
+    return health_sampler.estado(dependency_name) == "healthy" 
\ No newline at end of file
@@ -1,15 +1,24 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+from typing import Callable, Optional, TypeVar
+from jose import jwt
 from passlib.context import CryptContext
+from prometheus_client import Counter, Gauge
 from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
 from ..core.config import settings
 from ..core.logger import logger
+# La validación del bearer token (con caché de tokens verificados) vive en jwt_auth
+from ..core.jwt_auth import get_current_claims, get_current_user, oauth2_scheme
+
+__all__ = [
+    "EjecutorBcrypt", "Role", "check_permissions", "create_access_token", "ejecutor_bcrypt",
+    "generate_test_hash", "get_current_claims", "get_current_user", "get_password_hash",
+    "oauth2_scheme", "verify_password", "verify_password_async"
+]
 
 # Configuración de seguridad
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_PREFIX}/auth/token")
 
 # Funciones de seguridad
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -26,6 +35,69 @@ def generate_test_hash(password: str) -> str:
     logger.info(f"Hash generado para '{password}': {test_hash}")
     return test_hash
 
+# bcrypt (cost 12) consume ~250 ms de CPU por operación: se ejecuta en un pool de hilos
+# propio (bcrypt libera el GIL) para no congelar el event loop, y con un tope de operaciones
+# pendientes para que una avalancha de logins falle rápido en lugar de acumular latencia
+BCRYPT_EN_EJECUCION = Gauge(
+    "bcrypt_operations_in_progress",
+    "Operaciones bcrypt ejecutándose en el pool dedicado"
+)
+BCRYPT_EN_COLA = Gauge(
+    "bcrypt_queue_depth",
+    "Operaciones bcrypt esperando un hilo libre del pool dedicado"
+)
+BCRYPT_RECHAZADAS = Counter(
+    "bcrypt_rejected_total",
+    "Operaciones bcrypt rechazadas con 503 por pool saturado"
+)
+
+T = TypeVar("T")
+
+class EjecutorBcrypt:
+    """Pool de hilos acotado para hash y verificación de contraseñas."""
+
+    def __init__(self, hilos: int, max_cola: int):
+        self.hilos = hilos
+        self.max_cola = max_cola
+        self._ejecutor = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="bcrypt")
+        # Solo se modifica desde el event loop, no necesita lock
+        self._pendientes = 0
+
+    def _actualizar_metricas(self) -> None:
+        BCRYPT_EN_EJECUCION.set(min(self._pendientes, self.hilos))
+        BCRYPT_EN_COLA.set(max(self._pendientes - self.hilos, 0))
+
+    def _liberar(self) -> None:
+        self._pendientes -= 1
+        self._actualizar_metricas()
+
+    async def ejecutar(self, funcion: Callable[..., T], *args) -> T:
+        if self._pendientes >= self.hilos + self.max_cola:
+            BCRYPT_RECHAZADAS.inc()
+            logger.warning(f"Pool de bcrypt saturado ({self._pendientes} operaciones pendientes), respondiendo 503")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servicio de autenticación saturado, intente nuevamente en unos segundos",
+                headers={"Retry-After": "1"}
+            )
+        loop = asyncio.get_running_loop()
+        self._pendientes += 1
+        self._actualizar_metricas()
+        futuro = self._ejecutor.submit(funcion, *args)
+        # Se libera el cupo cuando el hilo termina (o la tarea se cancela antes de empezar),
+        # no cuando el cliente se desconecta: la operación sigue ocupando el hilo
+        futuro.add_done_callback(lambda _: loop.call_soon_threadsafe(self._liberar))
+        return await asyncio.wrap_future(futuro)
+
+    def cerrar(self) -> None:
+        self._ejecutor.shutdown(wait=False, cancel_futures=True)
+
+ejecutor_bcrypt = EjecutorBcrypt(settings.BCRYPT_HILOS, settings.BCRYPT_MAX_COLA)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifica la contraseña en el pool de bcrypt, sin bloquear el event loop."""
+    return await ejecutor_bcrypt.ejecutar(verify_password, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Crea un token JWT."""
     to_encode = data.copy()
@@ -48,30 +120,6 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
             detail="Error al generar token de acceso"
         )
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Obtiene el usuario actual basado en el token JWT."""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Credenciales inválidas",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
-        )
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError as e:
-        logger.error(f"Error al decodificar token JWT: {str(e)}")
-        raise credentials_exception
-    
-    # Aquí deberías obtener el usuario de tu base de datos
-    # Por ahora retornamos el username como ejemplo
-    return username
-
 # Roles y permisos
 class Role:
     ADMIN = "admin"
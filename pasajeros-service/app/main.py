@@ -1,11 +1,24 @@
 import asyncio
+from urllib.parse import urlparse
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import make_asgi_app
 from .api.endpoints import pasajeros, health, auth
 from .core.config import settings
-from .core.database import Base, engine
+from .core.database import arranque_db, engine, async_engine
 from .core.messaging import MessageBroker
 from .core.events import setup_event_handlers
+from .core.security import ejecutor_bcrypt
+from .core.middleware import (
+    RateLimitMiddleware,
+    ErrorHandlingMiddleware,
+    SecurityHeadersMiddleware,
+    LoggingMiddleware
+)
+from .core.metrics import MetricsMiddleware, registrar_pool
+from .core.rate_limit import rate_limiter
+from .core.resilience import health_sampler
+from .core.health_sampler import sonda_tcp
 import logging
 
 # Configurar logging
@@ -22,6 +35,15 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Middlewares ASGI puros; el último agregado es el más externo:
+# CORS -> métricas -> logging -> headers de seguridad -> manejo de errores -> rate limit -> app.
+# Así los 429 y las respuestas de error también llevan headers, tiempo y log, y cuentan en las métricas
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(ErrorHandlingMiddleware)
+app.add_middleware(SecurityHeadersMiddleware)
+app.add_middleware(LoggingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -29,17 +51,28 @@ app.add_middleware(
     allow_credentials=settings.CORS_CREDENTIALS,
     allow_methods=settings.CORS_METHODS,
     allow_headers=settings.CORS_HEADERS,
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Configurar el broker de mensajes
 message_broker = MessageBroker()
 
+# Dependencias muestreadas en segundo plano para /health
+_rabbitmq = urlparse(settings.RABBITMQ_URL)
+health_sampler.registrar("database", arranque_db.sonda)
+health_sampler.registrar("rabbitmq", sonda_tcp(_rabbitmq.hostname, _rabbitmq.port or 5672))
+health_sampler.registrar("redis", rate_limiter.ping, critica=False)
+health_sampler.registrar("system_resources", health.check_system_resources, critica=False)
+
 @app.on_event("startup")
 async def startup_event():
     logger.info(f"Iniciando {settings.APP_NAME} v{settings.VERSION}")
     logger.info(f"Modo debug: {settings.DEBUG}")
     logger.info(f"Base de datos: {settings.DATABASE_URL}")
-    Base.metadata.create_all(bind=engine)
+    # La base de datos se espera en segundo plano: el proceso acepta conexiones
+    # (liveness) de inmediato y /health/ready se activa cuando el pool está listo
+    app.state.inicializacion_db = asyncio.create_task(arranque_db.iniciar())
+    health_sampler.start()
     
     # Configurar el event loop
     loop = asyncio.get_event_loop()
@@ -53,13 +86,24 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info(f"Deteniendo {settings.APP_NAME}")
+    app.state.inicializacion_db.cancel()
+    await health_sampler.stop()
     await message_broker.disconnect()
+    await arranque_db.cerrar()
+    ejecutor_bcrypt.cerrar()
+    await rate_limiter.close()
 
 # Incluir routers
 app.include_router(auth.router, prefix="/api/v1", tags=["Autenticación"])
 app.include_router(pasajeros.router, prefix="/api/v1/pasajeros", tags=["Pasajeros"])
 app.include_router(health.router, prefix="/api/v1/health", tags=["Salud"])
 
+# Métricas de Prometheus (RED por ruta, pools de la base de datos y cola del pool de bcrypt)
+registrar_pool("sync", engine)
+registrar_pool("async", async_engine)
+metrics_app = make_asgi_app()
+app.mount("/metrics", metrics_app)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -1,17 +1,19 @@
-from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.usuario import Usuario
-from ..core.security import verify_password
+from ..core.security import verify_password_async
 from ..core.logger import logger
 
 class AuthService:
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str) -> Usuario:
+    async def authenticate_user(db: AsyncSession, email: str, password: str) -> Usuario:
         """
         Autentica un usuario usando email y contraseña.
         """
         try:
             logger.info(f"Intentando autenticar usuario: {email}")
-            user = db.query(Usuario).filter(Usuario.email == email).first()
+            user = await db.scalar(select(Usuario).where(Usuario.email == email).limit(1))
             
             if not user:
                 logger.warning(f"Intento de login fallido: usuario no encontrado - {email}")
@@ -21,12 +23,15 @@ class AuthService:
             logger.info(f"Hash almacenado: {user.password_hash}")
             logger.info(f"Contraseña proporcionada: {password}")
             
-            if not verify_password(password, user.password_hash):
+            if not await verify_password_async(password, user.password_hash):
                 logger.warning(f"Intento de login fallido: contraseña incorrecta - {email}")
                 return None
             
             logger.info(f"Login exitoso para usuario: {email}")
             return user
+        except HTTPException:
+            # Pool de bcrypt saturado (503): no es un fallo de credenciales
+            raise
         except Exception as e:
             logger.error(f"Error en autenticación: {str(e)}")
             return None 
\ No newline at end of file
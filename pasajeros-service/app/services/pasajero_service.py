@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from ..models.pasajero import Pasajero
 from ..models.usuario import Usuario
@@ -10,6 +12,7 @@ from ..core.exceptions import (
     UsuarioNotFoundException
 )
 from ..core.logger import logger
+from ..core.pagination import paginar_por_id
 from ..core.events import EventTypes, publish_pasajero_event
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -26,6 +29,20 @@ class PasajeroService:
             logger.error(f"Error de base de datos al obtener pasajero {pasajero_id}: {str(e)}")
             raise DatabaseException(str(e))
 
+    @staticmethod
+    async def _obtener_pasajero(db: AsyncSession, pasajero_id: int) -> Pasajero:
+        pasajero = await db.get(Pasajero, pasajero_id)
+        if not pasajero:
+            logger.warning(f"Pasajero no encontrado con ID: {pasajero_id}")
+            raise PasajeroNotFoundException(pasajero_id)
+        return pasajero
+
+    @staticmethod
+    async def _documento_existe(db: AsyncSession, numero_documento: str) -> bool:
+        return await db.scalar(
+            select(Pasajero.id).where(Pasajero.numero_documento == numero_documento).limit(1)
+        ) is not None
+
     @staticmethod
     def get_pasajero_by_documento(db: Session, numero_documento: str) -> Optional[Pasajero]:
         try:
@@ -35,35 +52,39 @@ class PasajeroService:
             raise DatabaseException(str(e))
 
     @staticmethod
-    def get_pasajeros(db: Session, skip: int = 0, limit: int = 100) -> List[Pasajero]:
+    def get_pasajeros(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        ultimo_id: Optional[int] = None
+    ) -> List[Pasajero]:
         try:
-            pasajeros = db.query(Pasajero).offset(skip).limit(limit).all()
-            logger.info(f"Obtenidos {len(pasajeros)} pasajeros (skip={skip}, limit={limit})")
+            pasajeros = paginar_por_id(db.query(Pasajero), Pasajero.id, ultimo_id, skip, limit)
+            logger.info(f"Obtenidos {len(pasajeros)} pasajeros (skip={skip}, ultimo_id={ultimo_id}, limit={limit})")
             return pasajeros
         except SQLAlchemyError as e:
             logger.error(f"Error de base de datos al listar pasajeros: {str(e)}")
             raise DatabaseException(str(e))
 
     @staticmethod
-    async def create_pasajero(db: Session, pasajero: PasajeroCreate) -> Pasajero:
+    async def create_pasajero(db: AsyncSession, pasajero: PasajeroCreate) -> Pasajero:
         try:
             # Verificar si el usuario existe
-            usuario = db.query(Usuario).filter(Usuario.id == pasajero.usuario_id).first()
+            usuario = await db.get(Usuario, pasajero.usuario_id)
             if not usuario:
                 logger.warning(f"Usuario no encontrado con ID: {pasajero.usuario_id}")
                 raise UsuarioNotFoundException(pasajero.usuario_id)
 
             # Verificar si ya existe un pasajero con el mismo número de documento
-            db_pasajero = PasajeroService.get_pasajero_by_documento(db, pasajero.numero_documento)
-            if db_pasajero:
+            if await PasajeroService._documento_existe(db, pasajero.numero_documento):
                 logger.warning(f"Intento de crear pasajero con documento duplicado: {pasajero.numero_documento}")
                 raise PasajeroDuplicadoException(pasajero.numero_documento)
             
             # Crear nuevo pasajero
             db_pasajero = Pasajero(**pasajero.model_dump())
             db.add(db_pasajero)
-            db.commit()
-            db.refresh(db_pasajero)
+            await db.commit()
+            await db.refresh(db_pasajero)
             
             # Publicar evento de pasajero creado
             await publish_pasajero_event(
@@ -80,19 +101,18 @@ class PasajeroService:
             logger.info(f"Pasajero creado exitosamente con ID: {db_pasajero.id}")
             return db_pasajero
         except SQLAlchemyError as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Error de base de datos al crear pasajero: {str(e)}")
             raise DatabaseException(str(e))
 
     @staticmethod
-    async def update_pasajero(db: Session, pasajero_id: int, pasajero: PasajeroUpdate) -> Optional[Pasajero]:
+    async def update_pasajero(db: AsyncSession, pasajero_id: int, pasajero: PasajeroUpdate) -> Optional[Pasajero]:
         try:
-            db_pasajero = PasajeroService.get_pasajero(db, pasajero_id)
+            db_pasajero = await PasajeroService._obtener_pasajero(db, pasajero_id)
 
             # Verificar si el nuevo número de documento ya existe
             if pasajero.numero_documento and pasajero.numero_documento != db_pasajero.numero_documento:
-                existing_pasajero = PasajeroService.get_pasajero_by_documento(db, pasajero.numero_documento)
-                if existing_pasajero:
+                if await PasajeroService._documento_existe(db, pasajero.numero_documento):
                     logger.warning(f"Intento de actualizar pasajero {pasajero_id} con documento duplicado: {pasajero.numero_documento}")
                     raise PasajeroDuplicadoException(pasajero.numero_documento)
 
@@ -110,8 +130,8 @@ class PasajeroService:
             for field, value in update_data.items():
                 setattr(db_pasajero, field, value)
 
-            db.commit()
-            db.refresh(db_pasajero)
+            await db.commit()
+            await db.refresh(db_pasajero)
 
             # Publicar evento de pasajero actualizado
             await publish_pasajero_event(
@@ -131,14 +151,14 @@ class PasajeroService:
             logger.info(f"Pasajero {pasajero_id} actualizado exitosamente")
             return db_pasajero
         except SQLAlchemyError as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Error de base de datos al actualizar pasajero {pasajero_id}: {str(e)}")
             raise DatabaseException(str(e))
 
     @staticmethod
-    async def delete_pasajero(db: Session, pasajero_id: int) -> bool:
+    async def delete_pasajero(db: AsyncSession, pasajero_id: int) -> bool:
         try:
-            db_pasajero = PasajeroService.get_pasajero(db, pasajero_id)
+            db_pasajero = await PasajeroService._obtener_pasajero(db, pasajero_id)
             
             # Guardar datos para el evento
             pasajero_data = {
@@ -149,8 +169,8 @@ class PasajeroService:
                 "usuario_id": db_pasajero.usuario_id
             }
             
-            db.delete(db_pasajero)
-            db.commit()
+            await db.delete(db_pasajero)
+            await db.commit()
 
             # Publicar evento de pasajero eliminado
             await publish_pasajero_event(
@@ -161,6 +181,6 @@ class PasajeroService:
             logger.info(f"Pasajero {pasajero_id} eliminado exitosamente")
             return True
         except SQLAlchemyError as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Error de base de datos al eliminar pasajero {pasajero_id}: {str(e)}")
             raise DatabaseException(str(e)) 
\ No newline at end of file
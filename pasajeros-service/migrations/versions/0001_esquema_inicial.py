@@ -0,0 +1,55 @@
+"""Esquema inicial: usuarios y pasajeros
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usuarios",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("password_hash", sa.String(length=255), nullable=False),
+        sa.Column("nombre", sa.String(length=100), nullable=False),
+        sa.Column("apellido", sa.String(length=100), nullable=False),
+        sa.Column("rol", sa.Enum("admin", "usuario", name="rol_enum"), nullable=False),
+        sa.Column("fecha_creacion", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("fecha_actualizacion", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("activo", sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_usuarios_id", "usuarios", ["id"])
+    op.create_index("ix_usuarios_email", "usuarios", ["email"], unique=True)
+
+    op.create_table(
+        "pasajeros",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("usuario_id", sa.Integer(), nullable=False),
+        sa.Column("tipo_documento", sa.Enum("DNI", "PASAPORTE", "CE", name="tipo_documento_enum"), nullable=False),
+        sa.Column("numero_documento", sa.String(length=20), nullable=False),
+        sa.Column("fecha_nacimiento", sa.Date(), nullable=False),
+        sa.Column("nacionalidad", sa.String(length=100), nullable=False),
+        sa.Column("telefono", sa.String(length=20), nullable=True),
+        sa.Column("direccion", sa.Text(), nullable=True),
+        sa.Column("fecha_creacion", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("fecha_actualizacion", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["usuario_id"], ["usuarios.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("numero_documento"),
+    )
+    op.create_index("ix_pasajeros_id", "pasajeros", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("pasajeros")
+    op.drop_table("usuarios")
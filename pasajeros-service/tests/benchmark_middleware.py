@@ -0,0 +1,144 @@
+"""
+Microbenchmark del costo por petición de la cadena de middlewares.
+
+Invoca directamente la aplicación ASGI (sin servidor ni red) con 0 a 4 middlewares
+apilados, en dos variantes: los middlewares ASGI puros de app.core.middleware y el mismo
+número de capas BaseHTTPMiddleware que solo llaman a call_next (el piso de costo de la
+implementación anterior). Se reporta la mediana y el p99 por petición.
+
+Uso, desde pasajeros-service/:
+
+    python -m tests.benchmark_middleware --peticiones 20000
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import List
+
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.logger import logger
+from app.core.middleware import (
+    ErrorHandlingMiddleware,
+    LoggingMiddleware,
+    RateLimitMiddleware,
+    SecurityHeadersMiddleware,
+)
+from app.core.rate_limit import LimitadorLocal
+
+
+class LimitadorEnMemoria:
+    """Limitador sin Redis y con cupo de sobra, para medir solo el costo del middleware."""
+
+    def __init__(self, peticiones: int):
+        self.local = LimitadorLocal(peticiones + 1001, 60.0, 10)
+
+    async def permitir(self, clave: str):
+        return self.local.permitir(clave)
+
+
+class PasoBaseHTTP(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def apilar_asgi(cantidad: int, peticiones: int):
+    app = endpoint
+    capas = [
+        lambda a: RateLimitMiddleware(a, limiter=LimitadorEnMemoria(peticiones)),
+        ErrorHandlingMiddleware,
+        SecurityHeadersMiddleware,
+        LoggingMiddleware,
+    ]
+    for capa in capas[:cantidad]:
+        app = capa(app)
+    return app
+
+
+def apilar_base_http(cantidad: int):
+    app = endpoint
+    for _ in range(cantidad):
+        app = PasoBaseHTTP(app)
+    return app
+
+
+def scope_http():
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/pasajeros/1",
+        "raw_path": b"/api/v1/pasajeros/1",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), (b"x-request-id", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8001),
+    }
+
+
+def canal_receive():
+    """receive de una petición sin cuerpo: después del primer mensaje espera como un cliente conectado."""
+    enviado = False
+
+    async def receive():
+        nonlocal enviado
+        if not enviado:
+            enviado = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    return receive
+
+
+async def send(message):
+    pass
+
+
+async def medir(app, peticiones: int) -> List[float]:
+    # Calentamiento
+    for _ in range(min(1000, peticiones)):
+        await app(scope_http(), canal_receive(), send)
+
+    tiempos = []
+    for _ in range(peticiones):
+        receive = canal_receive()
+        inicio = time.perf_counter()
+        await app(scope_http(), receive, send)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def fila(nombre: str, cantidad: int, tiempos: List[float]) -> str:
+    ordenados = sorted(tiempos)
+    p99 = ordenados[int(len(ordenados) * 0.99) - 1]
+    return f"{nombre:<20}{cantidad:>6}{statistics.median(tiempos) * 1e6:>14.1f}{p99 * 1e6:>14.1f}"
+
+
+async def main(peticiones: int, con_logs: bool):
+    if not con_logs:
+        # Los logs por petición (consola y archivo) dominarían la medición
+        logger.setLevel(logging.WARNING)
+
+    print(f"{'variante':<20}{'capas':>6}{'mediana (µs)':>14}{'p99 (µs)':>14}")
+    for cantidad in range(5):
+        print(fila("ASGI puro", cantidad, await medir(apilar_asgi(cantidad, peticiones), peticiones)))
+    for cantidad in range(5):
+        print(fila("BaseHTTPMiddleware", cantidad, await medir(apilar_base_http(cantidad), peticiones)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Costo por petición de 0 a 4 middlewares apilados")
+    parser.add_argument("--peticiones", type=int, default=20000)
+    parser.add_argument("--con-logs", action="store_true", help="Mantener los logs INFO por petición")
+    args = parser.parse_args()
+    asyncio.run(main(args.peticiones, args.con_logs))
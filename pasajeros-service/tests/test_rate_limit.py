@@ -0,0 +1,141 @@
+"""
+Pruebas del limitador en memoria (app.core.rate_limit.LimitadorLocal) y de RateLimitMiddleware.
+
+El reloj se sustituye por uno manual para fijar exactamente los bordes de la ventana; el
+middleware se prueba con un limitador que rechaza todo.
+
+Uso, desde pasajeros-service/:
+
+    python -m pytest tests/test_rate_limit.py
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.core import rate_limit
+from app.core.middleware import RateLimitMiddleware
+from app.core.rate_limit import LimitadorLocal
+
+
+class Reloj:
+    def __init__(self, ahora: float = 1000.0):
+        self.ahora = ahora
+
+    def __call__(self) -> float:
+        return self.ahora
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    reloj = Reloj()
+    monkeypatch.setattr(rate_limit.time, "monotonic", reloj)
+    return reloj
+
+
+def test_permite_hasta_el_limite(reloj):
+    limitador = LimitadorLocal(limite=3, periodo=10.0, max_claves=100)
+    assert [limitador.permitir("a")[0] for _ in range(3)] == [True, True, True]
+    assert limitador.permitir("a") == (False, 10.0)
+    # Cada cliente tiene su propia ventana
+    assert limitador.permitir("b") == (True, 0.0)
+
+
+def test_borde_de_la_ventana(reloj):
+    limitador = LimitadorLocal(limite=2, periodo=10.0, max_claves=100)
+    limitador.permitir("a")            # t=1000
+    reloj.ahora += 4
+    limitador.permitir("a")            # t=1004
+
+    reloj.ahora = 1009.5
+    permitido, espera = limitador.permitir("a")
+    assert not permitido
+    assert espera == pytest.approx(0.5)
+
+    # Justo al cumplirse el periodo la petición de t=1000 sale de la ventana
+    reloj.ahora = 1010.0
+    assert limitador.permitir("a") == (True, 0.0)
+    # La siguiente más antigua (t=1004) sigue dentro
+    permitido, espera = limitador.permitir("a")
+    assert not permitido
+    assert espera == pytest.approx(4.0)
+
+
+def test_rechazos_no_consumen_cupo(reloj):
+    limitador = LimitadorLocal(limite=1, periodo=10.0, max_claves=100)
+    assert limitador.permitir("a")[0]
+    for _ in range(5):
+        reloj.ahora += 1
+        assert not limitador.permitir("a")[0]
+    reloj.ahora = 1010.0
+    assert limitador.permitir("a")[0]
+
+
+def test_desaloja_claves_inactivas(reloj):
+    limitador = LimitadorLocal(limite=1, periodo=10.0, max_claves=100)
+    limitador.permitir("a")
+    reloj.ahora += 5
+    limitador.permitir("b")
+    reloj.ahora += 5
+    # "a" lleva un periodo completo inactiva y se desaloja; "b" no
+    limitador.permitir("c")
+    assert list(limitador._ventanas) == ["b", "c"]
+
+
+def test_max_claves_desaloja_las_menos_recientes(reloj):
+    limitador = LimitadorLocal(limite=1, periodo=10.0, max_claves=2)
+    limitador.permitir("a")
+    limitador.permitir("b")
+    # Usar "a" (aunque se rechace) la mueve al final del orden de uso
+    assert not limitador.permitir("a")[0]
+    limitador.permitir("c")
+    assert list(limitador._ventanas) == ["a", "c"]
+    # "b" se desalojó: vuelve con la ventana vacía
+    assert limitador.permitir("b")[0]
+    assert len(limitador._ventanas) == 2
+
+
+class LimitadorAgotado:
+    """Rechaza todo y registra qué claves se consultaron."""
+
+    def __init__(self):
+        self.claves = []
+
+    async def permitir(self, clave):
+        self.claves.append(clave)
+        return False, 30.0
+
+
+async def _app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _get(middleware, headers=None) -> httpx.Response:
+    async def pedir():
+        transporte = httpx.ASGITransport(app=middleware)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://test") as cliente:
+            return await cliente.get("/api/v1/pasajeros/1", headers=headers)
+    return asyncio.run(pedir())
+
+
+def test_middleware_limita_por_ip():
+    limitador = LimitadorAgotado()
+    respuesta = _get(RateLimitMiddleware(_app, limiter=limitador, token_interno="secreto"))
+    assert respuesta.status_code == 429
+    assert respuesta.headers["retry-after"] == "30"
+    assert len(limitador.claves) == 1
+
+
+def test_middleware_exime_servicios_internos():
+    limitador = LimitadorAgotado()
+    middleware = RateLimitMiddleware(_app, limiter=limitador, token_interno="secreto")
+    assert _get(middleware, {"X-Service-Token": "secreto"}).status_code == 200
+    assert limitador.claves == []
+    # Un token distinto no exime
+    assert _get(middleware, {"X-Service-Token": "otro"}).status_code == 429
+
+
+def test_middleware_sin_token_configurado_no_exime():
+    middleware = RateLimitMiddleware(_app, limiter=LimitadorAgotado(), token_interno="")
+    assert _get(middleware, {"X-Service-Token": ""}).status_code == 429
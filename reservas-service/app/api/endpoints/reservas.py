@@ -1,16 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 import httpx
 import random
 import string
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.config import settings
 from app.models.reserva import Reserva, EstadoReserva
 from app.schemas.reserva import ReservaCreate, ReservaUpdate, Reserva as ReservaSchema
 from app.core.vuelos_client import VuelosServiceClient
+from app.core.seat_inventory import seat_inventory
+from app.core.http_client import http_client, HTTPClient
+from app.core.pagination import consulta_por_id, decode_cursor, set_next_cursor
 from app.core.auth import get_current_user
 
 router = APIRouter(prefix="/reservas", tags=["reservas"])
@@ -18,15 +22,14 @@ vuelos_client = VuelosServiceClient()
 
 # Cliente HTTP para comunicación con otros microservicios
 async def get_http_client():
-    async with httpx.AsyncClient() as client:
-        yield client
+    yield http_client
 
 # Función para generar código de reserva único
 def generar_codigo_reserva():
     return ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
 
 # Validar existencia del pasajero
-async def validar_pasajero(pasajero_id: int, client: httpx.AsyncClient):
+async def validar_pasajero(pasajero_id: int, client: HTTPClient):
     try:
         response = await client.get(f"{settings.PASAJEROS_SERVICE_URL}/api/v1/pasajeros/{pasajero_id}")
         if response.status_code != 200:
@@ -41,7 +44,7 @@ async def validar_pasajero(pasajero_id: int, client: httpx.AsyncClient):
         )
 
 # Validar disponibilidad del vuelo
-async def validar_vuelo(vuelo_id: int, client: httpx.AsyncClient):
+async def validar_vuelo(vuelo_id: int, client: HTTPClient):
     try:
         response = await client.get(f"{settings.VUELOS_SERVICE_URL}/api/v1/vuelos/{vuelo_id}")
         if response.status_code != 200:
@@ -59,17 +62,17 @@ async def validar_vuelo(vuelo_id: int, client: httpx.AsyncClient):
 @router.post("", response_model=ReservaSchema, status_code=status.HTTP_201_CREATED)
 async def crear_reserva(
     reserva: ReservaCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Crea una nueva reserva con validaciones de vuelo.
     """
     # Verificar si el pasajero ya tiene una reserva para este vuelo
-    reserva_existente = db.query(Reserva).filter(
+    reserva_existente = await db.scalar(select(Reserva).where(
         Reserva.pasajero_id == reserva.pasajero_id,
         Reserva.vuelo_id == reserva.vuelo_id
-    ).first()
+    ).limit(1))
     
     if reserva_existente:
         raise HTTPException(
@@ -77,6 +80,9 @@ async def crear_reserva(
             detail="El pasajero ya tiene una reserva para este vuelo"
         )
 
+    # Cargar el inventario de asientos del vuelo (solo la primera vez)
+    await vuelos_client.cargar_vuelo(reserva.vuelo_id, db)
+
     # Verificar cupo en el vuelo
     hay_cupo = await vuelos_client.verificar_cupo(reserva.vuelo_id)
     if not hay_cupo:
@@ -94,11 +100,7 @@ async def crear_reserva(
         )
 
     # Verificar si el asiento está disponible
-    asiento_disponible = await vuelos_client.verificar_asiento_disponible(
-        reserva.vuelo_id,
-        reserva.numero_asiento
-    )
-    if not asiento_disponible:
+    if not seat_inventory.ocupar(reserva.vuelo_id, reserva.asiento):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="El asiento seleccionado no está disponible"
@@ -106,22 +108,27 @@ async def crear_reserva(
 
     # Crear la reserva
     nueva_reserva = Reserva(**reserva.dict())
-    db.add(nueva_reserva)
-    db.commit()
-    db.refresh(nueva_reserva)
+    try:
+        db.add(nueva_reserva)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        seat_inventory.liberar(reserva.vuelo_id, reserva.asiento)
+        raise
+    await db.refresh(nueva_reserva)
     
     return nueva_reserva
 
 @router.get("/{reserva_id}", response_model=ReservaSchema)
 async def obtener_reserva(
     reserva_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Obtiene una reserva específica por su ID.
     """
-    reserva = db.query(Reserva).filter(Reserva.id == reserva_id).first()
+    reserva = await db.get(Reserva, reserva_id)
     if not reserva:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -131,28 +138,33 @@ async def obtener_reserva(
 
 @router.get("", response_model=List[ReservaSchema])
 async def listar_reservas(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Lista todas las reservas con paginación.
+    Lista todas las reservas con paginación por cursor (header X-Next-Cursor).
     """
-    reservas = db.query(Reserva).offset(skip).limit(limit).all()
+    reservas = list(await db.scalars(
+        consulta_por_id(select(Reserva), Reserva.id, decode_cursor(cursor), skip, limit)
+    ))
+    set_next_cursor(response, reservas, limit)
     return reservas
 
 @router.put("/{reserva_id}", response_model=ReservaSchema)
 async def actualizar_reserva(
     reserva_id: int,
     reserva_update: ReservaUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Actualiza una reserva existente.
     """
-    reserva = db.query(Reserva).filter(Reserva.id == reserva_id).first()
+    reserva = await db.get(Reserva, reserva_id)
     if not reserva:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -175,50 +187,50 @@ async def actualizar_reserva(
     for key, value in reserva_update.dict(exclude_unset=True).items():
         setattr(reserva, key, value)
     
-    db.commit()
-    db.refresh(reserva)
+    await db.commit()
+    await db.refresh(reserva)
     return reserva
 
 @router.delete("/{reserva_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def eliminar_reserva(
     reserva_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Elimina una reserva existente.
     """
-    reserva = db.query(Reserva).filter(Reserva.id == reserva_id).first()
+    reserva = await db.get(Reserva, reserva_id)
     if not reserva:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reserva no encontrada"
         )
     
-    db.delete(reserva)
-    db.commit()
+    await db.delete(reserva)
+    await db.commit()
     return None
 
 @router.get("/pasajero/{pasajero_id}", response_model=List[ReservaSchema])
 async def listar_reservas_pasajero(
     pasajero_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Lista todas las reservas de un pasajero específico.
     """
-    reservas = db.query(Reserva).filter(Reserva.pasajero_id == pasajero_id).all()
+    reservas = list(await db.scalars(select(Reserva).where(Reserva.pasajero_id == pasajero_id)))
     return reservas
 
 @router.get("/vuelo/{vuelo_id}", response_model=List[ReservaSchema])
 async def listar_reservas_vuelo(
     vuelo_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Lista todas las reservas de un vuelo específico.
     """
-    reservas = db.query(Reserva).filter(Reserva.vuelo_id == vuelo_id).all()
+    reservas = list(await db.scalars(select(Reserva).where(Reserva.vuelo_id == vuelo_id)))
     return reservas 
\ No newline at end of file
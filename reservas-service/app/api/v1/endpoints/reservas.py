@@ -1,44 +1,266 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, select
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+import logging
 import uuid
 from datetime import datetime
+from redis.exceptions import RedisError
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.models.reserva import Reserva, EstadoReserva
-from app.schemas.reserva import ReservaCreate, ReservaUpdate, Reserva as ReservaSchema
+from app.schemas.reserva import (
+    ReservaCreate, ReservaUpdate, Reserva as ReservaSchema, HoldCreate, Hold,
+    ReservaBatchCreate, ReservaBatchItem, ReservaBatchResult
+)
 from app.services.reserva_service import ReservaService
+from app.services.hold_service import hold_service, HoldNoDisponibleError
+from app.services.export_service import exportar_csv, exportar_ndjson
+from app.core.vuelos_client import VuelosServiceClient
+from app.core.seat_inventory import seat_inventory
+from app.core.pagination import decode_cursor, paginar_por_id, set_next_cursor
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
+vuelos_client = VuelosServiceClient()
 
 @router.get("/", response_model=List[ReservaSchema])
 def get_reservas(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Obtener todas las reservas con paginación
+    Obtener todas las reservas con paginación por cursor (header X-Next-Cursor)
     """
-    return db.query(Reserva).offset(skip).limit(limit).all()
+    reservas = paginar_por_id(db.query(Reserva), Reserva.id, decode_cursor(cursor), skip, limit)
+    set_next_cursor(response, reservas, limit)
+    return reservas
 
 @router.post("/", response_model=ReservaSchema, status_code=status.HTTP_201_CREATED)
-def create_reserva(reserva: ReservaCreate, db: Session = Depends(get_db)):
+async def create_reserva(reserva: ReservaCreate, db: AsyncSession = Depends(get_async_db)):
+    # Cargar el inventario de asientos del vuelo (solo la primera vez)
+    await vuelos_client.cargar_vuelo(reserva.vuelo_id, db)
+
+    if not await vuelos_client.verificar_fecha_vuelo(reserva.vuelo_id):
+        raise HTTPException(status_code=400, detail="No se pueden crear reservas para vuelos que ya partieron")
+    if not await vuelos_client.verificar_cupo(reserva.vuelo_id):
+        raise HTTPException(status_code=400, detail="No hay cupos disponibles en este vuelo")
+
+    # Ocupar el asiento en memoria antes de insertar para evitar sobreventa
+    if not seat_inventory.ocupar(reserva.vuelo_id, reserva.asiento):
+        raise HTTPException(status_code=400, detail="El asiento seleccionado no está disponible")
+
+    # El asiento puede estar retenido por un hold de otro cliente
+    if await hold_service.asiento_retenido(reserva.vuelo_id, reserva.asiento):
+        seat_inventory.liberar(reserva.vuelo_id, reserva.asiento)
+        raise HTTPException(status_code=409, detail="El asiento seleccionado está retenido temporalmente")
+
+    return await _insertar_reserva(db, reserva.model_dump(), EstadoReserva.PENDIENTE)
+
+async def _insertar_reserva(db: AsyncSession, datos: dict, estado: EstadoReserva) -> Reserva:
+    """
+    Inserta la reserva de un asiento ya ocupado en el inventario.
+    Si la inserción falla el asiento se libera.
+    """
     # Generar código de reserva único
     codigo_reserva = str(uuid.uuid4())[:8].upper()
     
     # Crear nueva reserva
     db_reserva = Reserva(
-        **reserva.model_dump(),
+        **datos,
         codigo_reserva=codigo_reserva,
-        estado=EstadoReserva.PENDIENTE
+        estado=estado
     )
     
-    db.add(db_reserva)
-    db.commit()
-    db.refresh(db_reserva)
+    try:
+        db.add(db_reserva)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        seat_inventory.liberar(datos["vuelo_id"], datos["asiento"])
+        raise
+    await db.refresh(db_reserva)
     return db_reserva
 
+@router.post("/batch", response_model=ReservaBatchResult, status_code=status.HTTP_201_CREATED)
+async def create_reservas_batch(batch: ReservaBatchCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Crear las reservas de un grupo en una sola transacción.
+    Cada reserva que no pasa la validación (vuelo inexistente o no disponible, asiento
+    ocupado o retenido, pasajero repetido) se informa en `resultados` con su índice y
+    su error, y el resto se inserta. Solo un error de la base de datos al insertar
+    rechaza el grupo completo, sin crear ninguna reserva.
+    """
+    reservas = batch.reservas
+    vuelo_ids = {reserva.vuelo_id for reserva in reservas}
+    # Un vuelo que no existe o no se pudo consultar solo rechaza sus propios ítems
+    vuelos_fallidos = {}
+    for vuelo_id in vuelo_ids:
+        try:
+            await vuelos_client.cargar_vuelo(vuelo_id, db)
+        except HTTPException as e:
+            vuelos_fallidos[vuelo_id] = e.detail
+
+    # Pasajeros que ya tienen reserva activa en alguno de los vuelos (una sola consulta)
+    existentes = set(
+        tuple(fila) for fila in await db.execute(
+            select(Reserva.pasajero_id, Reserva.vuelo_id).where(
+                Reserva.vuelo_id.in_(vuelo_ids),
+                Reserva.pasajero_id.in_({reserva.pasajero_id for reserva in reservas}),
+                Reserva.estado != EstadoReserva.CANCELADA
+            )
+        )
+    )
+    retenidos = await hold_service.asientos_retenidos(
+        [(reserva.vuelo_id, reserva.asiento.strip().upper()) for reserva in reservas]
+    )
+
+    errores = {}
+    aceptadas = []
+    for indice, reserva in enumerate(reservas):
+        clave = (reserva.pasajero_id, reserva.vuelo_id)
+        if reserva.vuelo_id in vuelos_fallidos:
+            errores[indice] = vuelos_fallidos[reserva.vuelo_id]
+        elif not await vuelos_client.verificar_fecha_vuelo(reserva.vuelo_id):
+            errores[indice] = "No se pueden crear reservas para vuelos que ya partieron"
+        elif clave in existentes:
+            errores[indice] = "El pasajero ya tiene una reserva para este vuelo"
+        elif (reserva.vuelo_id, reserva.asiento.strip().upper()) in retenidos:
+            errores[indice] = "El asiento seleccionado está retenido temporalmente"
+        elif not seat_inventory.ocupar(reserva.vuelo_id, reserva.asiento):
+            errores[indice] = "El asiento seleccionado no está disponible"
+        else:
+            existentes.add(clave)
+            aceptadas.append((indice, reserva))
+
+    codigos = {}
+    if aceptadas:
+        filas = []
+        for indice, reserva in aceptadas:
+            codigos[indice] = str(uuid.uuid4())[:8].upper()
+            filas.append({
+                **reserva.model_dump(),
+                "codigo_reserva": codigos[indice],
+                "estado": EstadoReserva.PENDIENTE
+            })
+        try:
+            # Un único INSERT multi-fila y un único commit para todo el grupo
+            await db.execute(insert(Reserva), filas)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            for _, reserva in aceptadas:
+                seat_inventory.liberar(reserva.vuelo_id, reserva.asiento)
+            raise
+
+    creadas = {
+        reserva.codigo_reserva: ReservaSchema.model_validate(reserva)
+        for reserva in await db.scalars(select(Reserva).where(Reserva.codigo_reserva.in_(codigos.values())))
+    } if codigos else {}
+
+    resultados = [
+        ReservaBatchItem(indice=indice, creada=True, reserva=creadas.get(codigos[indice]))
+        if indice in codigos else
+        ReservaBatchItem(indice=indice, creada=False, error=errores[indice])
+        for indice in range(len(reservas))
+    ]
+    return ReservaBatchResult(creadas=len(codigos), rechazadas=len(errores), resultados=resultados)
+
+@router.post("/holds", response_model=Hold, status_code=status.HTTP_201_CREATED)
+async def create_hold(hold: HoldCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retener un asiento durante unos minutos mientras se completa la reserva
+    """
+    await vuelos_client.cargar_vuelo(hold.vuelo_id, db)
+
+    if not await vuelos_client.verificar_fecha_vuelo(hold.vuelo_id):
+        raise HTTPException(status_code=400, detail="No se pueden crear reservas para vuelos que ya partieron")
+    if not await vuelos_client.verificar_asiento_disponible(hold.vuelo_id, hold.asiento):
+        raise HTTPException(status_code=400, detail="El asiento seleccionado no está disponible")
+
+    try:
+        datos = await hold_service.tomar(hold.model_dump(exclude={"minutos"}), hold.minutos)
+    except HoldNoDisponibleError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except RedisError:
+        raise HTTPException(status_code=503, detail="Servicio de retenciones no disponible")
+
+    return Hold(**datos, expira_en=hold_service.expiracion(datos))
+
+@router.post("/holds/{hold_id}/confirm", response_model=ReservaSchema, status_code=status.HTTP_201_CREATED)
+async def confirm_hold(hold_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Convertir un hold vigente en una reserva confirmada
+    """
+    try:
+        datos = await hold_service.consumir(hold_id)
+    except HoldNoDisponibleError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except RedisError:
+        raise HTTPException(status_code=503, detail="Servicio de retenciones no disponible")
+
+    # El hold se consume antes de insertar para que dos confirmaciones simultáneas no
+    # creen dos reservas. Si después falla algo transitorio (base de datos o servicio de
+    # vuelos no disponibles) se devuelve al cliente para que reintente; si el asiento ya
+    # está vendido el hold no podría confirmarse nunca y queda descartado
+    try:
+        reserva = ReservaCreate(**datos)
+        await vuelos_client.cargar_vuelo(reserva.vuelo_id, db)
+        if not seat_inventory.ocupar(reserva.vuelo_id, reserva.asiento):
+            raise HTTPException(status_code=409, detail="El asiento seleccionado ya no está disponible")
+
+        return await _insertar_reserva(db, reserva.model_dump(), EstadoReserva.CONFIRMADA)
+    except HTTPException as e:
+        if e.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+            await _restaurar_hold(datos, e.detail)
+        raise
+    except (OperationalError, InterfaceError) as e:
+        logger.error(f"Error de base de datos confirmando el hold {hold_id}: {str(e)}")
+        await _restaurar_hold(datos, "Base de datos no disponible")
+
+async def _restaurar_hold(datos: dict, motivo: str) -> None:
+    """
+    Devuelve el hold tras un fallo transitorio y responde 503 para que el cliente reintente.
+    Si no se puede devolver (venció, el asiento fue tomado o Redis falla) se responde 409:
+    reintentar la confirmación ya no serviría y hay que crear un hold nuevo.
+    """
+    try:
+        restaurado = await hold_service.restaurar(datos)
+    except RedisError as e:
+        logger.error(f"Error restaurando el hold {datos['hold_id']}: {str(e)}")
+        restaurado = False
+    if not restaurado:
+        logger.warning(f"No se pudo restaurar el hold {datos['hold_id']}: vencido, asiento tomado o Redis no disponible")
+        raise HTTPException(
+            status_code=409,
+            detail=f"{motivo}. El hold ya no está disponible: cree uno nuevo"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"{motivo}. El hold se mantiene: reintente la confirmación",
+        headers={"Retry-After": "1"}
+    )
+
+@router.delete("/holds/{hold_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_hold(hold_id: str):
+    """
+    Liberar un hold antes de que venza
+    """
+    try:
+        await hold_service.consumir(hold_id)
+    except HoldNoDisponibleError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RedisError:
+        raise HTTPException(status_code=503, detail="Servicio de retenciones no disponible")
+    return None
+
 @router.get("/{reserva_id}", response_model=ReservaSchema)
 def get_reserva(reserva_id: int, db: Session = Depends(get_db)):
     reserva = db.query(Reserva).filter(Reserva.id == reserva_id).first()
@@ -61,20 +283,56 @@ def get_reservas_by_pasajero(pasajero_id: int, db: Session = Depends(get_db)):
 def get_reservas_by_vuelo(vuelo_id: int, db: Session = Depends(get_db)):
     return db.query(Reserva).filter(Reserva.vuelo_id == vuelo_id).all()
 
+@router.get("/vuelo/{vuelo_id}/export")
+def export_manifiesto_vuelo(vuelo_id: int, formato: str = Query("ndjson", pattern="^(ndjson|csv)$")):
+    """
+    Exportar el manifiesto de pasajeros de un vuelo fila a fila (NDJSON o CSV)
+    """
+    if formato == "csv":
+        return StreamingResponse(
+            exportar_csv(vuelo_id),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="manifiesto_vuelo_{vuelo_id}.csv"'}
+        )
+    return StreamingResponse(exportar_ndjson(vuelo_id), media_type="application/x-ndjson")
+
 @router.put("/{reserva_id}", response_model=ReservaSchema)
-def update_reserva(reserva_id: int, reserva: ReservaUpdate, db: Session = Depends(get_db)):
-    db_reserva = db.query(Reserva).filter(Reserva.id == reserva_id).first()
+async def update_reserva(reserva_id: int, reserva: ReservaUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_reserva = await db.get(Reserva, reserva_id)
     if not db_reserva:
         raise HTTPException(status_code=404, detail="Reserva no encontrada")
-    
-    # Actualizar solo los campos proporcionados
+
+    asiento_anterior = db_reserva.asiento
+    activa_antes = db_reserva.estado != EstadoReserva.CANCELADA
     update_data = reserva.model_dump(exclude_unset=True)
+    nuevo_asiento = update_data.get("asiento", asiento_anterior)
+    activa_despues = update_data.get("estado", db_reserva.estado) != EstadoReserva.CANCELADA
+
+    # Ocupar el nuevo asiento si la reserva queda activa en un asiento distinto
+    ocupa_nuevo = activa_despues and (not activa_antes or nuevo_asiento != asiento_anterior)
+    if ocupa_nuevo:
+        await vuelos_client.cargar_vuelo(db_reserva.vuelo_id, db)
+        if not seat_inventory.ocupar(db_reserva.vuelo_id, nuevo_asiento):
+            raise HTTPException(status_code=400, detail="El nuevo asiento seleccionado no está disponible")
+
+    # Actualizar solo los campos proporcionados
     for field, value in update_data.items():
         setattr(db_reserva, field, value)
     
     db_reserva.fecha_actualizacion = datetime.utcnow()
-    db.commit()
-    db.refresh(db_reserva)
+    try:
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        if ocupa_nuevo:
+            seat_inventory.liberar(db_reserva.vuelo_id, nuevo_asiento)
+        raise
+
+    # Liberar el asiento anterior si la reserva se canceló o cambió de asiento
+    if activa_antes and (not activa_despues or nuevo_asiento != asiento_anterior):
+        seat_inventory.liberar(db_reserva.vuelo_id, asiento_anterior)
+
+    await db.refresh(db_reserva)
     return db_reserva
 
 @router.delete("/{reserva_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -85,4 +343,6 @@ def delete_reserva(reserva_id: int, db: Session = Depends(get_db)):
     
     db.delete(reserva)
     db.commit()
+    if reserva.estado != EstadoReserva.CANCELADA:
+        seat_inventory.liberar(reserva.vuelo_id, reserva.asiento)
     return None 
\ No newline at end of file
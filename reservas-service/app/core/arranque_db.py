@@ -0,0 +1,99 @@
+# Copia de comun/arranque_db.py: editar allí y ejecutar `python comun/sincronizar.py`
+import asyncio
+import logging
+import random
+from typing import Callable, Optional
+
+from sqlalchemy import text
+
+from .config import settings
+from .health_sampler import sonda_sql
+from .migraciones import ejecutar_migraciones
+
+logger = logging.getLogger(__name__)
+
+
+class ArranqueDB:
+    """
+    Arranque de la base de datos de un servicio: espera, migraciones y pool caliente.
+
+    `iniciar()` se lanza como tarea en segundo plano desde el startup: el proceso acepta
+    conexiones (liveness) de inmediato y `sonda` no da la base de datos por sana hasta que
+    las migraciones están aplicadas y el pool abierto, así /health/ready espera a ambas cosas.
+    `despues_de_migrar` recibe el motor síncrono para verificaciones propias del servicio.
+    """
+
+    def __init__(
+        self,
+        engine,
+        async_engine=None,
+        despues_de_migrar: Optional[Callable[[object], None]] = None
+    ):
+        self.engine = engine
+        self.async_engine = async_engine
+        self.despues_de_migrar = despues_de_migrar
+        self.lista = False
+        self._select = sonda_sql(async_engine if async_engine is not None else engine)
+
+    def _conectar_y_migrar(self) -> None:
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        ejecutar_migraciones(self.engine)
+        if self.despues_de_migrar is not None:
+            self.despues_de_migrar(self.engine)
+
+    async def _calentar_pool(self) -> None:
+        # Abre en paralelo todas las conexiones del pool y las devuelve, para que las
+        # primeras peticiones no paguen el handshake con MySQL
+        conexiones = await asyncio.gather(
+            *(asyncio.to_thread(self.engine.connect) for _ in range(settings.DB_POOL_SIZE)),
+            return_exceptions=True
+        )
+        for conexion in conexiones:
+            if isinstance(conexion, Exception):
+                raise conexion
+            conexion.close()
+
+        if self.async_engine is None:
+            return
+        conexiones_async = await asyncio.gather(
+            *(self.async_engine.connect() for _ in range(settings.DB_POOL_SIZE)),
+            return_exceptions=True
+        )
+        for conexion in conexiones_async:
+            if isinstance(conexion, Exception):
+                raise conexion
+            await conexion.close()
+
+    async def iniciar(self) -> None:
+        """
+        Espera a la base de datos con backoff exponencial (sin bloquear el event loop),
+        aplica las migraciones y calienta el pool. Reintenta hasta lograrlo; mientras tanto
+        el servicio responde a liveness pero no a readiness.
+        """
+        espera = settings.DB_INIT_ESPERA_INICIAL_SEGUNDOS
+        intento = 0
+        while True:
+            intento += 1
+            try:
+                await asyncio.to_thread(self._conectar_y_migrar)
+                await self._calentar_pool()
+                self.lista = True
+                logger.info(f"Base de datos lista (intento {intento})")
+                return
+            except Exception as e:
+                pausa = espera * random.uniform(0.5, 1.0)
+                logger.warning(f"Base de datos no disponible (intento {intento}): {str(e)}. Reintentando en {pausa:.1f}s")
+                await asyncio.sleep(pausa)
+                espera = min(espera * 2, settings.DB_INIT_ESPERA_MAXIMA_SEGUNDOS)
+
+    async def sonda(self) -> None:
+        """Sonda "database" del HealthSampler: falla mientras el arranque no terminó."""
+        if not self.lista:
+            raise RuntimeError("Inicializando conexión y migraciones")
+        await self._select()
+
+    async def cerrar(self) -> None:
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
+
@@ -0,0 +1,4 @@
+# La validación del bearer token (con caché de tokens verificados) vive en jwt_auth
+from app.core.jwt_auth import get_current_claims, get_current_user, oauth2_scheme
+
+__all__ = ["get_current_claims", "get_current_user", "oauth2_scheme"]
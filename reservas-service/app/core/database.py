@@ -1,20 +1,59 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from .arranque_db import ArranqueDB
 from .config import settings
 
 # Usar la URL de la base de datos directamente desde la configuración
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# create_engine no abre conexiones: la primera se abre en arranque_db.iniciar(), desde el lifespan
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    connect_args={
+        "connect_timeout": 10
+    }
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Motor asíncrono (aiomysql) para los endpoints `async def`: las consultas no bloquean
+# el event loop y se solapan con las llamadas HTTP a otros servicios
+ASYNC_DATABASE_URL = make_url(SQLALCHEMY_DATABASE_URL).set(drivername="mysql+aiomysql")
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    connect_args={
+        "connect_timeout": 10
+    }
+)
+# expire_on_commit=False: tras el commit los atributos siguen cargados y no hace falta
+# una carga perezosa (que en modo asíncrono no está permitida) al serializar la respuesta
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 Base = declarative_base()
 
+# Espera, migraciones y calentamiento del pool en el arranque (ver comun/arranque_db.py)
+arranque_db = ArranqueDB(engine, async_engine)
+
+
 # Dependency
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,19 @@
+from typing import Optional
+import redis.asyncio as redis
+from .config import settings
+
+_redis: Optional[redis.Redis] = None
+
+def get_redis() -> redis.Redis:
+    """Retorna el cliente de Redis compartido, creándolo en el primer uso."""
+    global _redis
+    if _redis is None:
+        _redis = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis
+
+async def close_redis() -> None:
+    """Cierra el cliente de Redis compartido."""
+    global _redis
+    if _redis is not None:
+        await _redis.close()
+        _redis = None
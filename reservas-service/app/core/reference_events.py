@@ -0,0 +1,91 @@
+# Copia de comun/reference_events.py: editar allí y ejecutar `python comun/sincronizar.py`
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aio_pika
+
+from app.core.reference_cache import reference_cache
+
+logger = logging.getLogger(__name__)
+
+ExtraerId = Callable[[Dict[str, Any]], Optional[int]]
+
+
+def extraer_id(body: Dict[str, Any]) -> Optional[int]:
+    """Formato de aviones/vuelos: {"id": ..., ...}."""
+    return body.get("id")
+
+
+class ReferenceEventListener:
+    """
+    Escucha los eventos de eliminación (o modificación) de otros servicios e invalida la caché de referencias.
+
+    Cada instancia usa su propia cola exclusiva, de modo que todas las réplicas
+    reciben cada evento y limpian su caché local.
+    """
+
+    def __init__(self):
+        self.connection = None
+        self._suscripciones: List[Tuple[str, bool, str, str, ExtraerId]] = []
+        self._callbacks: Dict[str, List[Callable[[int], Awaitable[None]]]] = {}
+
+    def suscribir(
+        self,
+        exchange: str,
+        routing_key: str,
+        tipo: str,
+        extraer: ExtraerId = extraer_id,
+        durable: bool = False
+    ) -> None:
+        """Registra un evento que invalida las referencias de `tipo`. Llamar antes de start()."""
+        self._suscripciones.append((exchange, durable, routing_key, tipo, extraer))
+
+    def al_invalidar(self, tipo: str, callback: Callable[[int], Awaitable[None]]) -> None:
+        """Registra una acción adicional a ejecutar cuando se invalida una referencia de `tipo`."""
+        self._callbacks.setdefault(tipo, []).append(callback)
+
+    async def start(self, url: str) -> None:
+        try:
+            self.connection = await aio_pika.connect_robust(url)
+            channel = await self.connection.channel()
+            queue = await channel.declare_queue(exclusive=True, auto_delete=True)
+            exchanges = {}
+            for exchange, durable, routing_key, tipo, extraer in self._suscripciones:
+                if exchange not in exchanges:
+                    exchanges[exchange] = await channel.declare_exchange(
+                        exchange,
+                        aio_pika.ExchangeType.TOPIC,
+                        durable=durable
+                    )
+                await queue.bind(exchanges[exchange], routing_key=routing_key)
+            await queue.consume(self._procesar)
+            logger.info(f"Escuchando eventos de invalidación: {[s[2] for s in self._suscripciones]}")
+        except Exception as e:
+            # Sin eventos la caché sigue siendo válida: las entradas caducan por TTL
+            logger.warning(f"No se pudo suscribir a los eventos de invalidación: {str(e)}")
+
+    async def _procesar(self, message: aio_pika.IncomingMessage) -> None:
+        async with message.process():
+            try:
+                body = json.loads(message.body.decode())
+            except ValueError:
+                logger.error(f"Evento de invalidación con cuerpo inválido en {message.routing_key}")
+                return
+            for _, _, routing_key, tipo, extraer in self._suscripciones:
+                if routing_key != message.routing_key:
+                    continue
+                ref_id = extraer(body)
+                if ref_id is None:
+                    continue
+                await reference_cache.invalidar(tipo, int(ref_id))
+                for callback in self._callbacks.get(tipo, []):
+                    await callback(int(ref_id))
+
+    async def close(self) -> None:
+        if self.connection:
+            await self.connection.close()
+            self.connection = None
+
+
+reference_event_listener = ReferenceEventListener()
@@ -0,0 +1,139 @@
+import re
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from app.core.config import settings
+
+# Formato de asiento: número de fila seguido de la letra de la columna (ej. "12C")
+_ASIENTO_RE = re.compile(r"^\s*(\d{1,3})\s*([A-Za-z])\s*$")
+
+
+class AsientosVuelo:
+    """
+    Mapa de bits con la ocupación de los asientos de un vuelo.
+    Cada asiento ocupa un bit, de modo que un avión de 400 plazas cabe en 50 bytes.
+    """
+    __slots__ = ("vuelo_id", "capacidad", "fecha_salida", "ocupados", "_bits")
+
+    def __init__(self, vuelo_id: int, capacidad: int, fecha_salida: Optional[datetime] = None):
+        self.vuelo_id = vuelo_id
+        self.capacidad = capacidad
+        self.fecha_salida = fecha_salida
+        self.ocupados = 0
+        self._bits = bytearray((capacidad + 7) // 8)
+
+    def esta_ocupado(self, indice: int) -> bool:
+        return bool(self._bits[indice >> 3] & (1 << (indice & 7)))
+
+    def marcar(self, indice: int) -> bool:
+        """Marca el asiento como ocupado. Retorna False si ya lo estaba."""
+        mascara = 1 << (indice & 7)
+        if self._bits[indice >> 3] & mascara:
+            return False
+        self._bits[indice >> 3] |= mascara
+        self.ocupados += 1
+        return True
+
+    def desmarcar(self, indice: int) -> bool:
+        """Libera el asiento. Retorna False si ya estaba libre."""
+        mascara = 1 << (indice & 7)
+        if not self._bits[indice >> 3] & mascara:
+            return False
+        self._bits[indice >> 3] &= ~mascara
+        self.ocupados -= 1
+        return True
+
+    @property
+    def disponibles(self) -> int:
+        return self.capacidad - self.ocupados
+
+
+class SeatInventory:
+    """
+    Inventario de asientos en memoria, indexado por vuelo_id.
+
+    Los vuelos se cargan una vez (capacidad del avión + reservas activas) y se
+    mantienen al día con cada escritura de reservas, de modo que las
+    verificaciones de cupo y de asiento son O(1) y no requieren llamadas HTTP.
+    Si el vuelo cambia o se elimina en vuelos-service, el evento correspondiente
+    lo invalida y la siguiente reserva lo vuelve a cargar.
+    """
+
+    def __init__(self, asientos_por_fila: int = settings.ASIENTOS_POR_FILA):
+        self.asientos_por_fila = asientos_por_fila
+        self._vuelos: Dict[int, AsientosVuelo] = {}
+        self._lock = threading.Lock()
+
+    def indice_asiento(self, asiento: str, capacidad: int) -> Optional[int]:
+        """Convierte un asiento tipo "12C" en su posición dentro del mapa de bits."""
+        match = _ASIENTO_RE.match(asiento or "")
+        if not match:
+            return None
+        fila = int(match.group(1))
+        columna = ord(match.group(2).upper()) - ord("A")
+        if fila < 1 or columna >= self.asientos_por_fila:
+            return None
+        indice = (fila - 1) * self.asientos_por_fila + columna
+        return indice if indice < capacidad else None
+
+    def esta_cargado(self, vuelo_id: int) -> bool:
+        return vuelo_id in self._vuelos
+
+    def obtener(self, vuelo_id: int) -> Optional[AsientosVuelo]:
+        return self._vuelos.get(vuelo_id)
+
+    def cargar(
+        self,
+        vuelo_id: int,
+        capacidad: int,
+        fecha_salida: Optional[datetime],
+        asientos_ocupados: Iterable[str]
+    ) -> AsientosVuelo:
+        """Construye el mapa de bits de un vuelo a partir de sus reservas activas."""
+        vuelo = AsientosVuelo(vuelo_id, capacidad, fecha_salida)
+        for asiento in asientos_ocupados:
+            indice = self.indice_asiento(asiento, capacidad)
+            if indice is not None:
+                vuelo.marcar(indice)
+        with self._lock:
+            # Si otra petición cargó el vuelo mientras tanto, se conserva esa versión
+            return self._vuelos.setdefault(vuelo_id, vuelo)
+
+    def invalidar(self, vuelo_id: int) -> None:
+        with self._lock:
+            self._vuelos.pop(vuelo_id, None)
+
+    def hay_cupo(self, vuelo_id: int) -> bool:
+        vuelo = self._vuelos.get(vuelo_id)
+        return vuelo is not None and vuelo.disponibles > 0
+
+    def asiento_disponible(self, vuelo_id: int, asiento: str) -> bool:
+        vuelo = self._vuelos.get(vuelo_id)
+        if vuelo is None:
+            return False
+        indice = self.indice_asiento(asiento, vuelo.capacidad)
+        return indice is not None and not vuelo.esta_ocupado(indice)
+
+    def ocupar(self, vuelo_id: int, asiento: str) -> bool:
+        """Reserva el asiento de forma atómica. Retorna False si no está disponible."""
+        with self._lock:
+            vuelo = self._vuelos.get(vuelo_id)
+            if vuelo is None:
+                return False
+            indice = self.indice_asiento(asiento, vuelo.capacidad)
+            if indice is None:
+                return False
+            return vuelo.marcar(indice)
+
+    def liberar(self, vuelo_id: int, asiento: str) -> None:
+        with self._lock:
+            vuelo = self._vuelos.get(vuelo_id)
+            if vuelo is None:
+                return
+            indice = self.indice_asiento(asiento, vuelo.capacidad)
+            if indice is not None:
+                vuelo.desmarcar(indice)
+
+
+seat_inventory = SeatInventory()
@@ -1,47 +1,94 @@
 from typing import Optional, Dict, Any
+from datetime import datetime
 import httpx
-from fastapi import HTTPException
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..core.config import settings
+from ..core.http_client import http_client
+from ..core.seat_inventory import seat_inventory, AsientosVuelo
+from ..models.reserva import Reserva, EstadoReserva
 
 class VuelosServiceClient:
     def __init__(self):
         self.base_url = settings.VUELOS_SERVICE_URL
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.aviones_url = settings.AVIONES_SERVICE_URL
 
-    async def verificar_cupo(self, vuelo_id: str) -> bool:
+    async def cargar_vuelo(self, vuelo_id: int, db: AsyncSession) -> AsientosVuelo:
         """
-        Simula la verificación de cupos disponibles en un vuelo.
-        Por ahora, siempre retorna True para permitir la creación de reservas.
+        Carga el inventario de asientos del vuelo si aún no está en memoria.
+        Solo la primera reserva de cada vuelo consulta a los servicios de vuelos y aviones;
+        los eventos vuelos.updated y vuelos.deleted descartan la entrada para recargarla.
         """
-        return True
+        vuelo = seat_inventory.obtener(vuelo_id)
+        if vuelo is not None:
+            return vuelo
 
-    async def verificar_fecha_vuelo(self, vuelo_id: str) -> bool:
+        info_vuelo = await self.obtener_info_vuelo(vuelo_id)
+        capacidad = await self.obtener_capacidad_avion(info_vuelo["avion_id"])
+        fecha_salida = datetime.fromisoformat(info_vuelo["fecha_hora_salida"])
+
+        asientos_ocupados = await db.scalars(
+            select(Reserva.asiento).where(
+                Reserva.vuelo_id == vuelo_id,
+                Reserva.estado != EstadoReserva.CANCELADA
+            )
+        )
+        return seat_inventory.cargar(vuelo_id, capacidad, fecha_salida, asientos_ocupados)
+
+    async def verificar_cupo(self, vuelo_id: int) -> bool:
         """
-        Simula la verificación de fecha del vuelo.
-        Por ahora, siempre retorna True para permitir la creación de reservas.
+        Verifica si quedan asientos libres en el vuelo usando el inventario en memoria.
         """
-        return True
+        return seat_inventory.hay_cupo(vuelo_id)
 
-    async def verificar_asiento_disponible(self, vuelo_id: str, numero_asiento: str) -> bool:
+    async def verificar_fecha_vuelo(self, vuelo_id: int) -> bool:
         """
-        Simula la verificación de disponibilidad de asientos.
-        Por ahora, siempre retorna True para permitir la creación de reservas.
+        Verifica que el vuelo aún no haya partido.
         """
-        return True
+        vuelo = seat_inventory.obtener(vuelo_id)
+        if vuelo is None:
+            return False
+        return vuelo.fecha_salida is None or vuelo.fecha_salida > datetime.utcnow()
 
-    async def obtener_info_vuelo(self, vuelo_id: str) -> Dict[str, Any]:
+    async def verificar_asiento_disponible(self, vuelo_id: int, numero_asiento: str) -> bool:
         """
-        Simula la obtención de información del vuelo.
-        Retorna datos de ejemplo para permitir la creación de reservas.
+        Verifica que el asiento exista en el avión y no esté ocupado.
         """
-        return {
-            "id": vuelo_id,
-            "origen": "Ciudad de Origen",
-            "destino": "Ciudad de Destino",
-            "fecha": "2025-05-20T10:00:00",
-            "estado": "PROGRAMADO"
-        }
+        return seat_inventory.asiento_disponible(vuelo_id, numero_asiento)
 
-    async def close(self):
-        """Cierra el cliente HTTP."""
-        await self.client.aclose() 
\ No newline at end of file
+    async def obtener_info_vuelo(self, vuelo_id: int) -> Dict[str, Any]:
+        """
+        Obtiene la información del vuelo desde el servicio de vuelos.
+        """
+        try:
+            response = await http_client.get(f"{self.base_url}/api/v1/vuelos/{vuelo_id}")
+        except httpx.RequestError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servicio de vuelos no disponible"
+            )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Vuelo no encontrado"
+            )
+        return response.json()
+
+    async def obtener_capacidad_avion(self, avion_id: int) -> int:
+        """
+        Obtiene la capacidad de pasajeros del avión asignado al vuelo.
+        """
+        try:
+            response = await http_client.get(f"{self.aviones_url}/api/v1/aviones/{avion_id}")
+        except httpx.RequestError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servicio de aviones no disponible"
+            )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Avión del vuelo no encontrado"
+            )
+        return response.json()["capacidad_pasajeros"]
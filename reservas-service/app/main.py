@@ -1,14 +1,24 @@
+import asyncio
 import logging
 import sys
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import make_asgi_app
 from contextlib import asynccontextmanager
 import traceback
 
 from app.api.v1.endpoints import reservas
 from app.core.config import settings
-from app.database import Base, engine, init_db
+from app.core.database import arranque_db, async_engine, engine
+from app.core.health_sampler import HealthSampler, sonda_tcp
+from app.core.metrics import MetricsMiddleware, registrar_pool
+from app.core.redis_client import close_redis, get_redis
+from app.core.http_client import http_client
+from app.core.reference_cache import reference_cache
+from app.core.reference_events import reference_event_listener
+from app.core.seat_inventory import seat_inventory
+from app.services.hold_service import hold_service
 
 # Configurar logging
 logging.basicConfig(
@@ -18,14 +28,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def _sonda_redis():
+    await get_redis().ping()
+
+# Estado de las dependencias, muestreado en segundo plano para los endpoints de salud
+health_sampler = HealthSampler(settings.HEALTH_INTERVALO_SEGUNDOS, settings.HEALTH_TIMEOUT_SEGUNDOS)
+health_sampler.registrar("database", arranque_db.sonda)
+health_sampler.registrar("redis", _sonda_redis, critica=False)
+health_sampler.registrar("rabbitmq", sonda_tcp(settings.RABBITMQ_HOST, settings.RABBITMQ_PORT), critica=False)
+if settings.REFERENCE_CACHE_REDIS_URL:
+    health_sampler.registrar("reference_cache_redis", reference_cache.ping, critica=False)
+
+def _extraer_pasajero_id(body: dict):
+    """Formato de pasajeros-service: {"timestamp": ..., "data": {"pasajero": {"id": ...}}}."""
+    return body.get("data", {}).get("pasajero", {}).get("id")
+
+async def _descartar_inventario(vuelo_id: int) -> None:
+    seat_inventory.invalidar(vuelo_id)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Inicializar la base de datos al iniciar la aplicación
     try:
         logger.info("Iniciando la aplicación...")
-        init_db()
-        logger.info("Base de datos inicializada correctamente")
+        # La base de datos se espera en segundo plano: el proceso acepta conexiones
+        # (liveness) de inmediato y /health/ready se activa cuando el pool está listo
+        inicializacion_db = asyncio.create_task(arranque_db.iniciar())
+        health_sampler.start()
+        await http_client.start()
+        reference_event_listener.suscribir("airline_events", "vuelos.deleted", "vuelo")
+        # Un cambio de fecha o de avión invalida la fecha de salida y la capacidad cargadas
+        reference_event_listener.suscribir("airline_events", "vuelos.updated", "vuelo")
+        reference_event_listener.suscribir(
+            "aerolinea_events", "pasajero.eliminado", "pasajero", _extraer_pasajero_id, durable=True
+        )
+        reference_event_listener.al_invalidar("vuelo", _descartar_inventario)
+        await reference_event_listener.start(settings.RABBITMQ_URL)
+        barrido_holds = asyncio.create_task(hold_service.barrer_periodicamente())
         yield
+        inicializacion_db.cancel()
+        barrido_holds.cancel()
+        await health_sampler.stop()
+        await reference_event_listener.close()
+        await reference_cache.close()
+        await http_client.close()
+        await close_redis()
+        await arranque_db.cerrar()
     except Exception as e:
         logger.error(f"Error al inicializar la aplicación: {str(e)}")
         logger.error(traceback.format_exc())
@@ -44,8 +91,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Configurar métricas de Prometheus: RED por plantilla de ruta y estado de los pools
+app.add_middleware(MetricsMiddleware)
+registrar_pool("sync", engine)
+registrar_pool("async", async_engine)
+metrics_app = make_asgi_app()
+app.mount("/metrics", metrics_app)
+
 # Middleware para logging de requests y responses
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -71,7 +126,17 @@ app.include_router(
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return health_sampler.resumen()
+
+@app.get("/health/ready")
+async def readiness_check():
+    if not health_sampler.listo():
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=health_sampler.resumen())
+    return health_sampler.resumen()
+
+@app.get("/health/detailed")
+async def detailed_health_check():
+    return health_sampler.detalle()
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from app.models.reserva import EstadoReserva
+from app.core.config import settings
 
 class ReservaBase(BaseModel):
     pasajero_id: int
@@ -30,4 +31,25 @@ class ReservaInDB(ReservaBase):
         from_attributes = True
 
 class Reserva(ReservaInDB):
-    pass 
\ No newline at end of file
+    pass 
+
+class ReservaBatchCreate(BaseModel):
+    reservas: List[ReservaCreate] = Field(..., min_length=1, max_length=settings.RESERVAS_BATCH_MAX)
+
+class ReservaBatchItem(BaseModel):
+    indice: int
+    creada: bool
+    reserva: Optional[Reserva] = None
+    error: Optional[str] = None
+
+class ReservaBatchResult(BaseModel):
+    creadas: int
+    rechazadas: int
+    resultados: List[ReservaBatchItem]
+
+class HoldCreate(ReservaBase):
+    minutos: int = Field(settings.HOLD_TTL_MINUTOS, ge=1, le=settings.HOLD_TTL_MAX_MINUTOS)
+
+class Hold(ReservaBase):
+    hold_id: str
+    expira_en: datetime
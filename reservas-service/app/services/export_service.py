@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+from typing import Iterator
+
+from app.core.database import SessionLocal
+from app.models.reserva import Reserva
+
+# Columnas exportadas en el manifiesto de pasajeros
+COLUMNAS_MANIFIESTO = [
+    Reserva.id,
+    Reserva.codigo_reserva,
+    Reserva.pasajero_id,
+    Reserva.vuelo_id,
+    Reserva.asiento,
+    Reserva.clase,
+    Reserva.precio,
+    Reserva.estado,
+    Reserva.fecha_reserva,
+]
+NOMBRES_COLUMNAS = [columna.key for columna in COLUMNAS_MANIFIESTO]
+
+# Filas que se traen del cursor del servidor en cada viaje a MySQL
+FILAS_POR_LOTE = 1000
+# Tamaño aproximado de cada bloque enviado al cliente
+BYTES_POR_BLOQUE = 64 * 1024
+
+
+def _valor(valor):
+    if hasattr(valor, "isoformat"):
+        return valor.isoformat()
+    if hasattr(valor, "value"):
+        return valor.value
+    return valor
+
+
+def _filas_manifiesto(vuelo_id: int) -> Iterator[tuple]:
+    """
+    Recorre las reservas del vuelo con un cursor del lado del servidor (yield_per),
+    de modo que nunca hay más de FILAS_POR_LOTE filas en memoria.
+    La sesión es propia del generador porque vive lo mismo que la respuesta.
+    """
+    db = SessionLocal()
+    try:
+        filas = (
+            db.query(*COLUMNAS_MANIFIESTO)
+            .filter(Reserva.vuelo_id == vuelo_id)
+            .order_by(Reserva.id)
+            .yield_per(FILAS_POR_LOTE)
+        )
+        for fila in filas:
+            yield tuple(_valor(valor) for valor in fila)
+    finally:
+        db.close()
+
+
+def exportar_ndjson(vuelo_id: int) -> Iterator[bytes]:
+    """Genera el manifiesto como NDJSON, un objeto por línea."""
+    bloque = []
+    tamano = 0
+    for fila in _filas_manifiesto(vuelo_id):
+        linea = json.dumps(dict(zip(NOMBRES_COLUMNAS, fila)), ensure_ascii=False) + "\n"
+        bloque.append(linea)
+        tamano += len(linea)
+        if tamano >= BYTES_POR_BLOQUE:
+            yield "".join(bloque).encode()
+            bloque = []
+            tamano = 0
+    if bloque:
+        yield "".join(bloque).encode()
+
+
+def exportar_csv(vuelo_id: int) -> Iterator[bytes]:
+    """Genera el manifiesto como CSV con cabecera."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(NOMBRES_COLUMNAS)
+    for fila in _filas_manifiesto(vuelo_id):
+        writer.writerow(fila)
+        if buffer.tell() >= BYTES_POR_BLOQUE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode()
@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Claves en Redis:
+#   hold:asiento:{vuelo_id}:{asiento} -> hold_id (con TTL, es el candado del asiento)
+#   hold:{hold_id}                    -> hash con los datos de la reserva retenida
+#   holds:expiracion                  -> sorted set hold_id -> expiración en ms (para el barrido)
+HOLDS_EXPIRACION_KEY = "holds:expiracion"
+
+# Toma el asiento solo si está libre y registra los datos del hold en una única operación atómica
+_TOMAR_HOLD = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) == false then
+    return 0
+end
+redis.call('HSET', KEYS[2], unpack(ARGV, 4))
+redis.call('ZADD', KEYS[3], ARGV[3], ARGV[1])
+return 1
+"""
+
+# Consume el hold solo si el asiento sigue retenido por ese mismo hold (compare-and-delete)
+_CONSUMIR_HOLD = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1], KEYS[2])
+redis.call('ZREM', KEYS[3], ARGV[1])
+return 1
+"""
+
+
+class HoldNoDisponibleError(Exception):
+    pass
+
+
+class HoldService:
+    """
+    Retenciones temporales de asientos respaldadas por Redis.
+
+    El asiento se toma con un SET NX PX atómico, así dos peticiones concurrentes
+    nunca obtienen el mismo asiento y MySQL no necesita bloqueos de fila.
+    Los holds vencidos se limpian en bloque por un barrido periódico.
+    """
+
+    @staticmethod
+    def _asiento_key(vuelo_id: int, asiento: str) -> str:
+        return f"hold:asiento:{vuelo_id}:{asiento.strip().upper()}"
+
+    @staticmethod
+    def _hold_key(hold_id: str) -> str:
+        return f"hold:{hold_id}"
+
+    async def _guardar(self, hold: Dict[str, Any], ttl_ms: int) -> bool:
+        campos = []
+        for clave, valor in hold.items():
+            campos.extend([clave, str(valor)])
+
+        tomado = await get_redis().eval(
+            _TOMAR_HOLD,
+            3,
+            self._asiento_key(int(hold["vuelo_id"]), hold["asiento"]),
+            self._hold_key(hold["hold_id"]),
+            HOLDS_EXPIRACION_KEY,
+            hold["hold_id"],
+            ttl_ms,
+            hold["expira_ms"],
+            *campos
+        )
+        return bool(tomado)
+
+    async def tomar(self, datos: Dict[str, Any], minutos: int) -> Dict[str, Any]:
+        """Retiene el asiento por `minutos`. Lanza HoldNoDisponibleError si ya está retenido."""
+        ttl_ms = minutos * 60 * 1000
+        hold = {
+            **datos,
+            "hold_id": uuid.uuid4().hex,
+            "expira_ms": int(time.time() * 1000) + ttl_ms
+        }
+        if not await self._guardar(hold, ttl_ms):
+            raise HoldNoDisponibleError("El asiento ya está retenido por otra reserva")
+        return hold
+
+    async def restaurar(self, hold: Dict[str, Any]) -> bool:
+        """
+        Vuelve a retener el asiento de un hold ya consumido, con el mismo id y el tiempo
+        que le quedaba. Retorna False si el hold venció entretanto o el asiento fue tomado.
+        """
+        ttl_ms = int(hold["expira_ms"]) - int(time.time() * 1000)
+        if ttl_ms <= 0:
+            return False
+        return await self._guardar(hold, ttl_ms)
+
+    async def obtener(self, hold_id: str) -> Optional[Dict[str, str]]:
+        datos = await get_redis().hgetall(self._hold_key(hold_id))
+        return datos or None
+
+    async def consumir(self, hold_id: str) -> Dict[str, str]:
+        """
+        Consume el hold de forma atómica y retorna sus datos.
+        Lanza HoldNoDisponibleError si no existe o ya venció.
+        """
+        datos = await self.obtener(hold_id)
+        if not datos:
+            raise HoldNoDisponibleError("Hold no encontrado o vencido")
+
+        consumido = await get_redis().eval(
+            _CONSUMIR_HOLD,
+            3,
+            self._asiento_key(int(datos["vuelo_id"]), datos["asiento"]),
+            self._hold_key(hold_id),
+            HOLDS_EXPIRACION_KEY,
+            hold_id
+        )
+        if not consumido:
+            raise HoldNoDisponibleError("Hold no encontrado o vencido")
+        return datos
+
+    async def asiento_retenido(self, vuelo_id: int, asiento: str) -> bool:
+        """Indica si el asiento está retenido por un hold vigente."""
+        try:
+            return bool(await get_redis().exists(self._asiento_key(vuelo_id, asiento)))
+        except RedisError as e:
+            # Si Redis no responde no se bloquean las reservas directas
+            logger.warning(f"No se pudo consultar holds en Redis: {str(e)}")
+            return False
+
+    async def asientos_retenidos(self, asientos: List[Tuple[int, str]]) -> Set[Tuple[int, str]]:
+        """Retorna cuáles de los pares (vuelo_id, asiento) tienen un hold vigente, en un solo round trip."""
+        if not asientos:
+            return set()
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                for vuelo_id, asiento in asientos:
+                    pipe.exists(self._asiento_key(vuelo_id, asiento))
+                existe = await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"No se pudo consultar holds en Redis: {str(e)}")
+            return set()
+        return {par for par, retenido in zip(asientos, existe) if retenido}
+
+    async def barrer_vencidos(self) -> int:
+        """Elimina en bloque los datos de todos los holds vencidos."""
+        redis = get_redis()
+        ahora_ms = int(time.time() * 1000)
+        vencidos = await redis.zrangebyscore(HOLDS_EXPIRACION_KEY, "-inf", ahora_ms)
+        if not vencidos:
+            return 0
+
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*[self._hold_key(hold_id) for hold_id in vencidos])
+            pipe.zrem(HOLDS_EXPIRACION_KEY, *vencidos)
+            await pipe.execute()
+
+        logger.info(f"Barrido de holds: {len(vencidos)} holds vencidos eliminados")
+        return len(vencidos)
+
+    async def barrer_periodicamente(self) -> None:
+        """Tarea de fondo que ejecuta el barrido de holds vencidos."""
+        while True:
+            try:
+                await self.barrer_vencidos()
+            except RedisError as e:
+                logger.warning(f"Error en el barrido de holds: {str(e)}")
+            await asyncio.sleep(settings.HOLD_BARRIDO_SEGUNDOS)
+
+    @staticmethod
+    def expiracion(hold: Dict[str, Any]) -> datetime:
+        return datetime.utcfromtimestamp(int(hold["expira_ms"]) / 1000)
+
+
+hold_service = HoldService()
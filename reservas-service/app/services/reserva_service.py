@@ -1,29 +1,57 @@
+import logging
+from typing import Optional
 from sqlalchemy.orm import Session
-from fastapi import HTTPException
+from fastapi import HTTPException, status
 from app.models.reserva import Reserva, EstadoReserva
 from app.schemas.reserva import ReservaCreate, ReservaUpdate
-import httpx
 from app.core.config import settings
+from app.core.http_client import http_client
+from app.core.reference_cache import reference_cache
+
+logger = logging.getLogger(__name__)
 
 class ReservaService:
     def __init__(self, db: Session):
         self.db = db
 
-    async def verificar_pasajero(self, pasajero_id: int) -> bool:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{settings.PASAJEROS_SERVICE_URL}/api/v1/pasajeros/{pasajero_id}")
+    @staticmethod
+    async def _verificar_referencia(tipo: str, ref_id: int, url: str) -> bool:
+        """
+        True/False si el servicio dueño confirma o niega la referencia. Un 429, un 5xx o un
+        error de conexión no dicen nada sobre su existencia: se responde 503 para reintentar.
+        """
+        headers = {"X-Service-Token": settings.TOKEN_SERVICIOS_INTERNOS} if settings.TOKEN_SERVICIOS_INTERNOS else {}
+
+        async def consultar() -> Optional[bool]:
+            response = await http_client.get(url, headers=headers)
+            if response.status_code in (200, 404):
                 return response.status_code == 200
-            except Exception:
-                return False
+            # Respuesta no concluyente: no se cachea
+            logger.warning(f"Respuesta {response.status_code} al verificar {tipo} {ref_id}")
+            return None
+
+        try:
+            existe = await reference_cache.existe(tipo, ref_id, consultar)
+        except Exception as e:
+            logger.warning(f"No se pudo verificar {tipo} {ref_id}: {str(e)}")
+            existe = None
+        if existe is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"No se pudo verificar el {tipo}, intente más tarde",
+                headers={"Retry-After": "1"}
+            )
+        return existe
+
+    async def verificar_pasajero(self, pasajero_id: int) -> bool:
+        return await self._verificar_referencia(
+            "pasajero", pasajero_id, f"{settings.PASAJEROS_SERVICE_URL}/api/v1/pasajeros/{pasajero_id}"
+        )
 
     async def verificar_vuelo(self, vuelo_id: int) -> bool:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{settings.VUELOS_SERVICE_URL}/api/v1/vuelos/{vuelo_id}")
-                return response.status_code == 200
-            except Exception:
-                return False
+        return await self._verificar_referencia(
+            "vuelo", vuelo_id, f"{settings.VUELOS_SERVICE_URL}/api/v1/vuelos/{vuelo_id}"
+        )
 
     async def verificar_asiento_disponible(self, vuelo_id: int, asiento: str) -> bool:
         # Verificar si el asiento ya está reservado
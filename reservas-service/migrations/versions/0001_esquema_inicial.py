@@ -0,0 +1,41 @@
+"""Esquema inicial: reservas
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reservas",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("pasajero_id", sa.Integer(), nullable=False),
+        sa.Column("vuelo_id", sa.Integer(), nullable=False),
+        sa.Column("asiento", sa.String(length=10), nullable=False),
+        sa.Column(
+            "estado",
+            sa.Enum("PENDIENTE", "CONFIRMADA", "CANCELADA", "COMPLETADA", name="estadoreserva"),
+            nullable=True,
+        ),
+        sa.Column("fecha_reserva", sa.DateTime(), nullable=True),
+        sa.Column("fecha_actualizacion", sa.DateTime(), nullable=True),
+        sa.Column("codigo_reserva", sa.String(length=10), nullable=True),
+        sa.Column("precio", sa.Integer(), nullable=False),
+        sa.Column("clase", sa.String(length=20), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_reservas_id", "reservas", ["id"])
+    op.create_index("ix_reservas_codigo_reserva", "reservas", ["codigo_reserva"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_table("reservas")
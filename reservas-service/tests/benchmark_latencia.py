@@ -0,0 +1,118 @@
+"""
+Benchmark de latencia bajo carga concurrente.
+
+Lanza `--concurrencia` clientes que crean reservas (escrituras que pasan por la base de
+datos y por vuelos-service) y, en paralelo, mide la latencia de /health. Si las consultas
+bloquean el event loop, /health se degrada junto con las escrituras; con la capa de datos
+asíncrona debe mantenerse estable.
+
+Uso (con el servicio levantado, antes y después del cambio):
+
+    python tests/benchmark_latencia.py --url http://localhost:8002 --vuelo-id 1 --etiqueta sync
+    python tests/benchmark_latencia.py --url http://localhost:8002 --vuelo-id 1 --etiqueta async
+
+Cada ejecución imprime p50/p95/p99 y agrega el resultado a `--salida` para compararlos.
+"""
+import argparse
+import asyncio
+import json
+import random
+import string
+import time
+from typing import Dict, List
+
+import httpx
+
+
+def percentil(muestras: List[float], p: float) -> float:
+    if not muestras:
+        return 0.0
+    ordenadas = sorted(muestras)
+    indice = min(len(ordenadas) - 1, max(0, round(p / 100 * len(ordenadas)) - 1))
+    return ordenadas[indice]
+
+
+def resumen(muestras: List[float]) -> Dict[str, float]:
+    return {
+        "peticiones": len(muestras),
+        "p50_ms": round(percentil(muestras, 50) * 1000, 2),
+        "p95_ms": round(percentil(muestras, 95) * 1000, 2),
+        "p99_ms": round(percentil(muestras, 99) * 1000, 2),
+    }
+
+
+def asiento_aleatorio() -> str:
+    return f"{random.randint(1, 60)}{random.choice(string.ascii_uppercase[:6])}"
+
+
+async def cliente_escritura(cliente: httpx.AsyncClient, args, fin: float, latencias: List[float], errores: List[int]):
+    while time.perf_counter() < fin:
+        reserva = {
+            "pasajero_id": random.randint(1, 1000),
+            "vuelo_id": args.vuelo_id,
+            "asiento": asiento_aleatorio(),
+            "precio": 100,
+            "clase": "ECONOMICA",
+        }
+        inicio = time.perf_counter()
+        try:
+            respuesta = await cliente.post(f"{args.prefijo}/reservas/", json=reserva)
+            # 400/409 (asiento ocupado) también recorren la base de datos
+            if respuesta.status_code >= 500:
+                errores.append(respuesta.status_code)
+        except httpx.HTTPError:
+            errores.append(0)
+        latencias.append(time.perf_counter() - inicio)
+
+
+async def cliente_health(cliente: httpx.AsyncClient, fin: float, latencias: List[float]):
+    while time.perf_counter() < fin:
+        inicio = time.perf_counter()
+        try:
+            await cliente.get("/health")
+        except httpx.HTTPError:
+            pass
+        latencias.append(time.perf_counter() - inicio)
+        await asyncio.sleep(0.01)
+
+
+async def ejecutar(args) -> Dict[str, object]:
+    limites = httpx.Limits(max_connections=args.concurrencia + 5)
+    async with httpx.AsyncClient(base_url=args.url, timeout=30, limits=limites) as cliente:
+        fin = time.perf_counter() + args.duracion
+        escrituras: List[float] = []
+        health: List[float] = []
+        errores: List[int] = []
+        await asyncio.gather(
+            cliente_health(cliente, fin, health),
+            *(cliente_escritura(cliente, args, fin, escrituras, errores) for _ in range(args.concurrencia))
+        )
+    return {
+        "etiqueta": args.etiqueta,
+        "concurrencia": args.concurrencia,
+        "duracion_s": args.duracion,
+        "escrituras": resumen(escrituras),
+        "health": resumen(health),
+        "errores_5xx": len(errores),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de latencia p50/p95/p99 de reservas-service")
+    parser.add_argument("--url", default="http://localhost:8002")
+    parser.add_argument("--prefijo", default="/api/v1")
+    parser.add_argument("--vuelo-id", type=int, default=1)
+    parser.add_argument("--concurrencia", type=int, default=50)
+    parser.add_argument("--duracion", type=float, default=30.0)
+    parser.add_argument("--etiqueta", default="actual")
+    parser.add_argument("--salida", default="benchmark_latencia.jsonl")
+    args = parser.parse_args()
+
+    resultado = asyncio.run(ejecutar(args))
+    print(json.dumps(resultado, indent=2))
+    with open(args.salida, "a") as archivo:
+        archivo.write(json.dumps(resultado) + "\n")
+
+
+if __name__ == "__main__":
+    main()
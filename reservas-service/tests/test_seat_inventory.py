@@ -0,0 +1,135 @@
+"""
+Pruebas del inventario de asientos en memoria (app.core.seat_inventory).
+
+Uso, desde reservas-service/:
+
+    python -m pytest tests/test_seat_inventory.py
+"""
+import pytest
+
+from app.core.seat_inventory import SeatInventory
+
+VUELO_ID = 1
+# 30 filas de 6 asientos (A-F)
+CAPACIDAD = 180
+
+
+@pytest.fixture
+def inventario():
+    inventario = SeatInventory(asientos_por_fila=6)
+    inventario.cargar(VUELO_ID, CAPACIDAD, None, [])
+    return inventario
+
+
+@pytest.mark.parametrize("asiento, indice", [
+    ("1A", 0),
+    ("1F", 5),
+    ("2A", 6),
+    ("12C", 68),
+    ("30F", 179),
+    (" 12c ", 68),
+])
+def test_indice_asiento_valido(asiento, indice):
+    assert SeatInventory(asientos_por_fila=6).indice_asiento(asiento, CAPACIDAD) == indice
+
+
+@pytest.mark.parametrize("asiento", [
+    "0A",    # las filas empiezan en 1
+    "1G",    # columna fuera de la fila
+    "31A",   # primera posición después del último asiento
+    "A12",
+    "12",
+    "1234A",
+    "",
+    None,
+])
+def test_indice_asiento_invalido(asiento):
+    assert SeatInventory(asientos_por_fila=6).indice_asiento(asiento, CAPACIDAD) is None
+
+
+def test_indice_asiento_ultima_fila_incompleta():
+    """Con capacidad 8 y 6 asientos por fila la segunda fila solo tiene A y B."""
+    inventario = SeatInventory(asientos_por_fila=6)
+    assert inventario.indice_asiento("2B", 8) == 7
+    assert inventario.indice_asiento("2C", 8) is None
+
+
+def test_ocupar_y_liberar(inventario):
+    assert inventario.ocupar(VUELO_ID, "12C")
+    assert not inventario.ocupar(VUELO_ID, "12c")
+    assert not inventario.asiento_disponible(VUELO_ID, "12C")
+    assert inventario.obtener(VUELO_ID).disponibles == CAPACIDAD - 1
+
+    inventario.liberar(VUELO_ID, "12C")
+    assert inventario.asiento_disponible(VUELO_ID, "12C")
+    assert inventario.obtener(VUELO_ID).disponibles == CAPACIDAD
+
+    # Liberar un asiento libre no descuenta dos veces
+    inventario.liberar(VUELO_ID, "12C")
+    assert inventario.obtener(VUELO_ID).disponibles == CAPACIDAD
+    assert inventario.ocupar(VUELO_ID, "12C")
+
+
+def test_ocupar_asientos_vecinos_en_bytes_distintos(inventario):
+    """Los índices 7 y 8 caen en bytes distintos del mapa de bits."""
+    assert inventario.ocupar(VUELO_ID, "2B")   # índice 7
+    assert inventario.asiento_disponible(VUELO_ID, "2C")   # índice 8
+    assert inventario.ocupar(VUELO_ID, "2C")
+    inventario.liberar(VUELO_ID, "2B")
+    assert inventario.asiento_disponible(VUELO_ID, "2B")
+    assert not inventario.asiento_disponible(VUELO_ID, "2C")
+
+
+def test_ocupar_primer_y_ultimo_asiento(inventario):
+    assert inventario.ocupar(VUELO_ID, "1A")
+    assert inventario.ocupar(VUELO_ID, "30F")
+    assert not inventario.ocupar(VUELO_ID, "31A")
+    assert inventario.obtener(VUELO_ID).ocupados == 2
+
+
+def test_ocupar_vuelo_no_cargado():
+    inventario = SeatInventory(asientos_por_fila=6)
+    assert not inventario.ocupar(VUELO_ID, "1A")
+    assert not inventario.hay_cupo(VUELO_ID)
+    # Liberar en un vuelo no cargado no falla
+    inventario.liberar(VUELO_ID, "1A")
+
+
+def test_cargar_ignora_asientos_invalidos_y_repetidos():
+    inventario = SeatInventory(asientos_por_fila=6)
+    vuelo = inventario.cargar(VUELO_ID, CAPACIDAD, None, ["1A", "1a", "99Z", "2B"])
+    assert vuelo.ocupados == 2
+    assert not inventario.asiento_disponible(VUELO_ID, "1A")
+    assert not inventario.asiento_disponible(VUELO_ID, "2B")
+
+
+def test_sin_cupo_con_todos_los_asientos_ocupados():
+    inventario = SeatInventory(asientos_por_fila=6)
+    inventario.cargar(VUELO_ID, 2, None, [])
+    assert inventario.ocupar(VUELO_ID, "1A")
+    assert inventario.hay_cupo(VUELO_ID)
+    assert inventario.ocupar(VUELO_ID, "1B")
+    assert not inventario.hay_cupo(VUELO_ID)
+
+
+def test_invalidar_y_recargar_cambia_el_tamano_del_mapa():
+    """Tras un cambio de avión (vuelos.updated) el vuelo se recarga con la nueva capacidad."""
+    inventario = SeatInventory(asientos_por_fila=6)
+    inventario.cargar(VUELO_ID, 12, None, ["1A"])
+    assert not inventario.ocupar(VUELO_ID, "3A")
+
+    # Mientras no se invalide, una nueva carga conserva la versión existente
+    assert inventario.cargar(VUELO_ID, 18, None, ["1A"]).capacidad == 12
+
+    inventario.invalidar(VUELO_ID)
+    assert not inventario.esta_cargado(VUELO_ID)
+    vuelo = inventario.cargar(VUELO_ID, 18, None, ["1A"])
+    assert vuelo.capacidad == 18
+    assert vuelo.disponibles == 17
+    assert inventario.ocupar(VUELO_ID, "3F")
+
+    # Y a la inversa: un avión más pequeño deja fuera los asientos que ya no existen
+    inventario.invalidar(VUELO_ID)
+    inventario.cargar(VUELO_ID, 6, None, ["1A", "3F"])
+    assert inventario.obtener(VUELO_ID).ocupados == 1
+    assert not inventario.asiento_disponible(VUELO_ID, "2A")
@@ -3,18 +3,30 @@ from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
 from app.models.tripulacion import TripulacionVuelo
-from app.schemas.tripulacion import TripulacionCreate, TripulacionUpdate, Tripulacion as TripulacionSchema
+from app.schemas.tripulacion import (
+    TripulacionCreate, TripulacionUpdate, Tripulacion as TripulacionSchema, RosterValidacion, ResultadoRoster
+)
+from app.services.tripulacion_service import validar_asignacion, validar_roster
 
 router = APIRouter()
 
 @router.post("/", response_model=TripulacionSchema, status_code=status.HTTP_201_CREATED)
 def create_tripulacion(tripulacion: TripulacionCreate, db: Session = Depends(get_db)):
+    validar_asignacion(db, tripulacion.vuelo_id, tripulacion.personal_id)
     db_tripulacion = TripulacionVuelo(**tripulacion.dict())
     db.add(db_tripulacion)
     db.commit()
     db.refresh(db_tripulacion)
     return db_tripulacion
 
+@router.post("/validar-roster", response_model=ResultadoRoster)
+def validate_roster(roster: RosterValidacion, db: Session = Depends(get_db)):
+    """
+    Valida en una sola llamada un roster completo (p. ej. un mes de asignaciones):
+    solapes y descanso mínimo entre asignaciones del roster y con las ya guardadas.
+    """
+    return validar_roster(db, roster.asignaciones)
+
 @router.get("/", response_model=List[TripulacionSchema])
 def read_tripulacion(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     tripulacion = db.query(TripulacionVuelo).offset(skip).limit(limit).all()
@@ -39,6 +51,13 @@ def update_tripulacion(tripulacion_id: int, tripulacion: TripulacionUpdate, db:
         raise HTTPException(status_code=404, detail="Tripulación no encontrada")
     
     update_data = tripulacion.dict(exclude_unset=True)
+    if "vuelo_id" in update_data or "personal_id" in update_data:
+        validar_asignacion(
+            db,
+            update_data.get("vuelo_id") or db_tripulacion.vuelo_id,
+            update_data.get("personal_id") or db_tripulacion.personal_id,
+            excluir_asignacion_id=tripulacion_id
+        )
     for field, value in update_data.items():
         setattr(db_tripulacion, field, value)
     
@@ -1,48 +1,102 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.schemas.vuelo import VueloCreate, VueloUpdate, Vuelo as VueloSchema
-from app.services.vuelo_service import VueloService
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.schemas.vuelo import VueloCreate, VueloUpdate, Vuelo as VueloSchema, Itinerario
+from app.services.itinerarios import motor_itinerarios
+from app.core.config import settings
+from app.services.vuelo_service import VueloService, buscar_vuelos_json
+from app.core.pagination import decode_cursor, set_next_cursor
 
 router = APIRouter()
 
 @router.post("/", response_model=VueloSchema, status_code=status.HTTP_201_CREATED)
-async def create_vuelo(vuelo: VueloCreate, db: Session = Depends(get_db)):
+async def create_vuelo(vuelo: VueloCreate, db: AsyncSession = Depends(get_async_db)):
     vuelo_service = VueloService(db)
     return await vuelo_service.create_vuelo(vuelo)
 
 @router.get("/", response_model=List[VueloSchema])
-def read_vuelos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def read_vuelos(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
     vuelo_service = VueloService(db)
-    return vuelo_service.get_vuelos(skip, limit)
+    vuelos = await vuelo_service.get_vuelos(skip, limit, decode_cursor(cursor))
+    set_next_cursor(response, vuelos, limit)
+    return vuelos
+
+def _utc_naive(fecha: Optional[datetime]) -> Optional[datetime]:
+    # Las fechas se guardan sin zona horaria (UTC)
+    if fecha is not None and fecha.tzinfo is not None:
+        return fecha.astimezone(timezone.utc).replace(tzinfo=None)
+    return fecha
+
+@router.get("/search", response_model=List[VueloSchema])
+def search_vuelos(
+    origen: int,
+    destino: int,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None
+):
+    """
+    Vuelos de una ruta con salida entre `desde` y `hasta`, transmitidos en orden de salida.
+    """
+    return StreamingResponse(
+        buscar_vuelos_json(origen, destino, _utc_naive(desde), _utc_naive(hasta)),
+        media_type="application/json"
+    )
+
+@router.get("/itinerarios", response_model=List[Itinerario])
+def search_itinerarios(
+    origen: int,
+    destino: int,
+    desde: datetime,
+    max_tramos: int = Query(settings.ITINERARIO_MAX_TRAMOS, ge=1, le=settings.ITINERARIO_MAX_TRAMOS),
+    conexion_minima: int = Query(settings.ITINERARIO_CONEXION_MINIMA_MINUTOS, ge=0)
+):
+    """
+    Itinerarios con conexiones de `origen` a `destino` saliendo desde `desde`.
+    Retorna el conjunto de Pareto: el primero usa la menor cantidad de tramos
+    y el último llega lo más temprano posible.
+    """
+    if not motor_itinerarios.cargado:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="El grafo de itinerarios aún no está disponible"
+        )
+    return motor_itinerarios.buscar(origen, destino, _utc_naive(desde), max_tramos, conexion_minima)
 
 @router.get("/{vuelo_id}", response_model=VueloSchema)
-def read_vuelo(vuelo_id: int, db: Session = Depends(get_db)):
+async def read_vuelo(vuelo_id: int, db: AsyncSession = Depends(get_async_db)):
     vuelo_service = VueloService(db)
-    return vuelo_service.get_vuelo(vuelo_id)
+    return await vuelo_service.get_vuelo(vuelo_id)
 
 @router.put("/{vuelo_id}", response_model=VueloSchema)
-async def update_vuelo(vuelo_id: int, vuelo: VueloUpdate, db: Session = Depends(get_db)):
+async def update_vuelo(vuelo_id: int, vuelo: VueloUpdate, db: AsyncSession = Depends(get_async_db)):
     vuelo_service = VueloService(db)
     return await vuelo_service.update_vuelo(vuelo_id, vuelo)
 
 @router.delete("/{vuelo_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_vuelo(vuelo_id: int, db: Session = Depends(get_db)):
+async def delete_vuelo(vuelo_id: int, db: AsyncSession = Depends(get_async_db)):
     vuelo_service = VueloService(db)
     await vuelo_service.delete_vuelo(vuelo_id)
     return None
 
 @router.get("/numero/{numero_vuelo}", response_model=VueloSchema)
-def read_vuelo_by_numero(numero_vuelo: str, db: Session = Depends(get_db)):
+async def read_vuelo_by_numero(numero_vuelo: str, db: AsyncSession = Depends(get_async_db)):
     vuelo_service = VueloService(db)
-    db_vuelo = vuelo_service.get_vuelo_by_numero(numero_vuelo)
+    db_vuelo = await vuelo_service.get_vuelo_by_numero(numero_vuelo)
     if db_vuelo is None:
         raise HTTPException(status_code=404, detail="Vuelo no encontrado")
     return db_vuelo
 
 @router.get("/estado/{estado}", response_model=List[VueloSchema])
-def read_vuelos_by_estado(estado: str, db: Session = Depends(get_db)):
+async def read_vuelos_by_estado(estado: str, db: AsyncSession = Depends(get_async_db)):
     vuelo_service = VueloService(db)
-    vuelos = vuelo_service.get_vuelos_by_estado(estado)
+    vuelos = await vuelo_service.get_vuelos_by_estado(estado)
     return vuelos 
\ No newline at end of file
@@ -26,11 +26,18 @@ class Settings(BaseSettings):
     RABBITMQ_PORT: int = 5672
     RABBITMQ_USER: str = "guest"
     RABBITMQ_PASSWORD: str = "guest"
+
+    @property
+    def RABBITMQ_URL(self) -> str:
+        return f"amqp://{self.RABBITMQ_USER}:{self.RABBITMQ_PASSWORD}@{self.RABBITMQ_HOST}:{self.RABBITMQ_PORT}/"
     
     # JWT
     SECRET_KEY: str = "your-secret-key-here"  # En producción, usar una clave segura
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Ruta de emisión de tokens (documentación OpenAPI) y tamaño de la caché de tokens verificados
+    AUTH_TOKEN_URL: str = "/api/v1/auth/token"
+    TOKEN_CACHE_MAX_ENTRADAS: int = 10000
 
     # Service
     SERVICE_PORT: int = 8003
@@ -41,11 +48,38 @@ class Settings(BaseSettings):
     AEROPUERTOS_SERVICE_URL: str = "http://aeropuertos-service:8005/api/v1"
     AVIONES_SERVICE_URL: str = "http://aviones-service:8004/api/v1"
     ESCALAS_SERVICE_URL: str = "http://escalas-service:8006/api/v1"
+
+    # Cliente HTTP compartido
+    HTTP_CONNECT_TIMEOUT: float = 2.0
+    HTTP_READ_TIMEOUT: float = 5.0
+    HTTP_POOL_TIMEOUT: float = 5.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 20
+
+    # Caché de existencia de referencias externas (TTL en segundos)
+    REFERENCE_CACHE_TTL_POSITIVO: int = 300
+    REFERENCE_CACHE_TTL_NEGATIVO: int = 30
+    REFERENCE_CACHE_MAX_ENTRADAS: int = 10000
+    REFERENCE_CACHE_REDIS_URL: Optional[str] = None
+
+    # Búsqueda de itinerarios con conexiones
+    ITINERARIO_CONEXION_MINIMA_MINUTOS: int = 45
+    ITINERARIO_MAX_TRAMOS: int = 4
+    ITINERARIOS_RECARGA_SEGUNDOS: int = 600
+
+    # Descanso mínimo de un tripulante entre dos vuelos asignados
+    TRIPULACION_DESCANSO_MINIMO_MINUTOS: int = 60
     
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
+    # Muestreo de salud de dependencias en segundo plano (segundos)
+    HEALTH_INTERVALO_SEGUNDOS: float = 5.0
+    HEALTH_TIMEOUT_SEGUNDOS: float = 2.0
+
     class Config:
         env_file = ".env"
 
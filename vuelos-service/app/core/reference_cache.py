@@ -0,0 +1,146 @@
+# Copia de comun/reference_cache.py: editar allí y ejecutar `python comun/sincronizar.py`
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Tuple
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from prometheus_client import Counter, Gauge
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_CACHE_REQUESTS = Counter(
+    "reference_cache_requests_total",
+    "Consultas de existencia de referencias externas por tipo y resultado (hit_local, hit_redis, miss)",
+    ["tipo", "resultado"]
+)
+REFERENCE_CACHE_INVALIDATIONS = Counter(
+    "reference_cache_invalidations_total",
+    "Entradas invalidadas por eventos de otros servicios",
+    ["tipo"]
+)
+REFERENCE_CACHE_ENTRIES = Gauge(
+    "reference_cache_entries",
+    "Entradas en la caché local de referencias"
+)
+
+
+class ReferenceCache:
+    """
+    Caché de existencia de referencias a otros servicios (aviones, aeropuertos, vuelos, pasajeros...).
+
+    Guarda tanto las respuestas positivas como las negativas, cada una con su propio TTL,
+    en un LRU local acotado y, opcionalmente, en Redis para compartirlas entre instancias.
+    Solo se cachean respuestas definitivas: si la consulta no puede determinar la
+    existencia (servicio caído, error 5xx) no se guarda nada.
+    """
+
+    def __init__(self):
+        self._entradas: "OrderedDict[Tuple[str, int], Tuple[bool, float]]" = OrderedDict()
+        self._redis: Optional[redis.Redis] = None
+
+    def _get_redis(self) -> Optional[redis.Redis]:
+        if not settings.REFERENCE_CACHE_REDIS_URL:
+            return None
+        if self._redis is None:
+            self._redis = redis.from_url(settings.REFERENCE_CACHE_REDIS_URL, decode_responses=True)
+        return self._redis
+
+    @staticmethod
+    def _redis_key(tipo: str, ref_id: int) -> str:
+        return f"refcache:{tipo}:{ref_id}"
+
+    @staticmethod
+    def _ttl(existe: bool) -> int:
+        return settings.REFERENCE_CACHE_TTL_POSITIVO if existe else settings.REFERENCE_CACHE_TTL_NEGATIVO
+
+    def _leer_local(self, clave: Tuple[str, int]) -> Optional[bool]:
+        entrada = self._entradas.get(clave)
+        if entrada is None:
+            return None
+        existe, expira = entrada
+        if expira <= time.monotonic():
+            del self._entradas[clave]
+            return None
+        self._entradas.move_to_end(clave)
+        return existe
+
+    def _guardar_local(self, clave: Tuple[str, int], existe: bool) -> None:
+        self._entradas[clave] = (existe, time.monotonic() + self._ttl(existe))
+        self._entradas.move_to_end(clave)
+        while len(self._entradas) > settings.REFERENCE_CACHE_MAX_ENTRADAS:
+            self._entradas.popitem(last=False)
+        REFERENCE_CACHE_ENTRIES.set(len(self._entradas))
+
+    async def existe(
+        self,
+        tipo: str,
+        ref_id: int,
+        consultar: Callable[[], Awaitable[Optional[bool]]]
+    ) -> Optional[bool]:
+        """
+        Indica si la referencia existe, consultando primero la caché local, luego Redis
+        y por último al servicio dueño mediante `consultar`. `consultar` retorna None
+        cuando no puede determinarlo, y en ese caso el resultado no se cachea.
+        """
+        clave = (tipo, ref_id)
+        existe = self._leer_local(clave)
+        if existe is not None:
+            REFERENCE_CACHE_REQUESTS.labels(tipo=tipo, resultado="hit_local").inc()
+            return existe
+
+        cliente = self._get_redis()
+        if cliente is not None:
+            try:
+                valor = await cliente.get(self._redis_key(tipo, ref_id))
+            except RedisError as e:
+                logger.warning(f"No se pudo leer la caché de referencias en Redis: {str(e)}")
+                valor = None
+            if valor is not None:
+                existe = valor == "1"
+                self._guardar_local(clave, existe)
+                REFERENCE_CACHE_REQUESTS.labels(tipo=tipo, resultado="hit_redis").inc()
+                return existe
+
+        REFERENCE_CACHE_REQUESTS.labels(tipo=tipo, resultado="miss").inc()
+        existe = await consultar()
+        if existe is None:
+            return None
+
+        self._guardar_local(clave, existe)
+        if cliente is not None:
+            try:
+                await cliente.set(self._redis_key(tipo, ref_id), "1" if existe else "0", ex=self._ttl(existe))
+            except RedisError as e:
+                logger.warning(f"No se pudo escribir la caché de referencias en Redis: {str(e)}")
+        return existe
+
+    async def invalidar(self, tipo: str, ref_id: int) -> None:
+        """Elimina la referencia de la caché local y de Redis."""
+        self._entradas.pop((tipo, ref_id), None)
+        REFERENCE_CACHE_ENTRIES.set(len(self._entradas))
+        REFERENCE_CACHE_INVALIDATIONS.labels(tipo=tipo).inc()
+        cliente = self._get_redis()
+        if cliente is not None:
+            try:
+                await cliente.delete(self._redis_key(tipo, ref_id))
+            except RedisError as e:
+                logger.warning(f"No se pudo invalidar la caché de referencias en Redis: {str(e)}")
+        logger.info(f"Referencia invalidada en caché: {tipo} {ref_id}")
+
+    async def ping(self) -> None:
+        """Sonda de salud del Redis compartido (si está configurado)."""
+        cliente = self._get_redis()
+        if cliente is not None:
+            await cliente.ping()
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+
+reference_cache = ReferenceCache()
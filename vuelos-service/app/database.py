@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -19,10 +21,22 @@ except Exception as e:
     logger.error(f"Error connecting to database: {str(e)}")
     raise
 
+# Motor asíncrono (aiomysql) para los endpoints `async def`: las consultas no bloquean
+# el event loop y se solapan con las llamadas HTTP a otros servicios
+ASYNC_DATABASE_URL = make_url(SQLALCHEMY_DATABASE_URL).set(drivername="mysql+aiomysql")
+async_engine = create_async_engine(ASYNC_DATABASE_URL, pool_pre_ping=True, pool_recycle=3600)
+# expire_on_commit=False: tras el commit los atributos siguen cargados y no hace falta
+# una carga perezosa (que en modo asíncrono no está permitida) al serializar la respuesta
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 # Dependency
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,13 +1,26 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import make_asgi_app
 from app.api.v1.endpoints import vuelos, tripulacion as tripulacion_endpoints, auth
 from app.core.config import settings
+from app.core.health_sampler import HealthSampler, sonda_sql, sonda_tcp
+from app.core.http_client import http_client
+from app.core.metrics import MetricsMiddleware, registrar_pool
+from app.core.reference_cache import reference_cache
+from app.core.reference_events import reference_event_listener
+from app.database import SessionLocal
+from app.services.indice_rutas import indice_rutas
+from app.services.itinerarios import motor_itinerarios
+from app.services.external_service import external_service, ExternalServiceError
+from app.models.vuelo import Vuelo
+import asyncio
 import logging
 from pythonjsonlogger import jsonlogger
-from app.database import Base, engine
+from app.database import engine, async_engine
+from app.core.migraciones import ejecutar_migraciones
 from app.models import base, vuelo, tripulacion as tripulacion_models  # Importar todos los modelos
 from contextlib import asynccontextmanager
-from sqlalchemy import text
 
 # Configuración del logger
 logger = logging.getLogger()
@@ -17,27 +30,87 @@ logHandler.setFormatter(formatter)
 logger.addHandler(logHandler)
 logger.setLevel(settings.LOG_LEVEL)
 
+# Estado de las dependencias, muestreado en segundo plano para los endpoints de salud
+health_sampler = HealthSampler(settings.HEALTH_INTERVALO_SEGUNDOS, settings.HEALTH_TIMEOUT_SEGUNDOS)
+health_sampler.registrar("database", sonda_sql(async_engine))
+health_sampler.registrar("rabbitmq", sonda_tcp(settings.RABBITMQ_HOST, settings.RABBITMQ_PORT), critica=False)
+if settings.REFERENCE_CACHE_REDIS_URL:
+    health_sampler.registrar("redis", reference_cache.ping, critica=False)
+
+def _cargar_indice_rutas():
+    db = SessionLocal()
+    try:
+        indice_rutas.cargar(db)
+    finally:
+        db.close()
+
+def _refrescar_vuelo_en_indice(vuelo_id: int):
+    db = SessionLocal()
+    try:
+        indice_rutas.refrescar(db, vuelo_id)
+        return db.query(Vuelo).filter(Vuelo.id == vuelo_id).first()
+    finally:
+        db.close()
+
+async def _al_cambiar_vuelo(vuelo_id: int):
+    # Mantiene el índice de rutas y el grafo de itinerarios al día, también con cambios de otras réplicas
+    vuelo = await asyncio.to_thread(_refrescar_vuelo_en_indice, vuelo_id)
+    escalas = []
+    if vuelo is not None:
+        try:
+            escalas = await external_service.get_escalas_vuelo(vuelo_id)
+        except ExternalServiceError:
+            logger.warning(f"Vuelo {vuelo_id} agregado al grafo de itinerarios sin sus escalas")
+    motor_itinerarios.actualizar(vuelo, vuelo_id, escalas)
+
+def _cargar_grafo_itinerarios(escalas):
+    db = SessionLocal()
+    try:
+        motor_itinerarios.cargar(db, escalas)
+    finally:
+        db.close()
+
+async def _construir_grafo_itinerarios():
+    try:
+        escalas = await external_service.get_escalas()
+    except ExternalServiceError:
+        logger.warning("Servicio de escalas no disponible: el grafo de itinerarios solo tendrá vuelos directos")
+        escalas = []
+    await asyncio.to_thread(_cargar_grafo_itinerarios, escalas)
+
+async def _reconstruir_grafo_periodicamente():
+    # Las escalas no publican eventos: una reconstrucción completa periódica recoge sus cambios
+    while True:
+        await asyncio.sleep(settings.ITINERARIOS_RECARGA_SEGUNDOS)
+        try:
+            await _construir_grafo_itinerarios()
+        except Exception as e:
+            logger.warning(f"Error al reconstruir el grafo de itinerarios: {str(e)}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     try:
-        # Eliminar tablas existentes
-        logger.info("Eliminando tablas existentes...")
-        with engine.connect() as conn:
-            conn.execute(text("SET FOREIGN_KEY_CHECKS=0"))
-            conn.execute(text("DROP TABLE IF EXISTS vuelos"))
-            conn.execute(text("DROP TABLE IF EXISTS tripulacion_vuelo"))
-            conn.execute(text("DROP TABLE IF EXISTS personal"))
-            conn.execute(text("SET FOREIGN_KEY_CHECKS=1"))
-            conn.commit()
-        logger.info("Tablas eliminadas exitosamente")
-
-        # Recrear tablas
-        logger.info("Recreando tablas...")
-        Base.metadata.create_all(bind=engine)
-        logger.info("Tablas recreadas exitosamente")
+        health_sampler.start()
+        # Aplicar migraciones pendientes (si el esquema está al día es una sola consulta)
+        await asyncio.to_thread(ejecutar_migraciones, engine)
+        await asyncio.to_thread(_cargar_indice_rutas)
+        await http_client.start()
+        await _construir_grafo_itinerarios()
+        reconstruccion_grafo = asyncio.create_task(_reconstruir_grafo_periodicamente())
+        reference_event_listener.suscribir("airline_events", "aviones.deleted", "avion")
+        for evento in ("created", "updated", "deleted"):
+            reference_event_listener.suscribir("airline_events", f"vuelos.{evento}", "vuelo")
+        reference_event_listener.al_invalidar("vuelo", _al_cambiar_vuelo)
+        await reference_event_listener.start(settings.RABBITMQ_URL)
         yield
+        reconstruccion_grafo.cancel()
+        await health_sampler.stop()
+        await reference_event_listener.close()
+        await reference_cache.close()
+        await http_client.close()
+        await async_engine.dispose()
     except Exception as e:
-        logger.error(f"Error al recrear la base de datos: {str(e)}")
+        logger.error(f"Error al iniciar el servicio: {str(e)}")
         raise
 
 app = FastAPI(
@@ -54,8 +127,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Configurar métricas de Prometheus: RED por plantilla de ruta y estado de los pools
+app.add_middleware(MetricsMiddleware)
+registrar_pool("sync", engine)
+registrar_pool("async", async_engine)
+metrics_app = make_asgi_app()
+app.mount("/metrics", metrics_app)
+
 # Incluir routers
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
 app.include_router(vuelos.router, prefix=f"{settings.API_V1_STR}/vuelos", tags=["vuelos"])
@@ -65,6 +146,20 @@ app.include_router(tripulacion_endpoints.router, prefix=f"{settings.API_V1_STR}/
 async def root():
     return {"message": "Bienvenido al servicio de vuelos"}
 
+@app.get("/health")
+async def health_check():
+    return health_sampler.resumen()
+
+@app.get("/health/ready")
+async def readiness_check():
+    if not health_sampler.listo():
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=health_sampler.resumen())
+    return health_sampler.resumen()
+
+@app.get("/health/detailed")
+async def detailed_health_check():
+    return health_sampler.detalle()
+
 if __name__ == "__main__":
     import uvicorn
     logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
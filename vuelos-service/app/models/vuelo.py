@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class Vuelo(Base):
     __tablename__ = "vuelos"
+    __table_args__ = (
+        # Búsqueda por ruta y rango de salida (GET /vuelos/search)
+        Index("ix_vuelos_ruta_salida", "aeropuerto_origen_id", "aeropuerto_destino_id", "fecha_hora_salida"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     numero_vuelo = Column(String(10), unique=True, nullable=False)
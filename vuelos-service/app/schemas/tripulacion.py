@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
 class RolTripulacion(str, Enum):
@@ -30,4 +30,18 @@ class TripulacionInDB(TripulacionBase):
         from_attributes = True
 
 class Tripulacion(TripulacionInDB):
-    pass 
\ No newline at end of file
+    pass 
+
+class RosterValidacion(BaseModel):
+    asignaciones: List[TripulacionBase]
+
+class ConflictoTripulacion(BaseModel):
+    indice: int
+    personal_id: int
+    vuelo_id: int
+    vuelo_conflicto_id: int
+
+class ResultadoRoster(BaseModel):
+    valido: bool
+    conflictos: List[ConflictoTripulacion]
+    vuelos_inexistentes: List[int]
@@ -40,4 +40,18 @@ class VueloInDB(VueloBase):
         from_attributes = True
 
 class Vuelo(VueloInDB):
-    pass 
\ No newline at end of file
+    pass 
+
+class TramoItinerario(BaseModel):
+    vuelo_id: int
+    numero_vuelo: str
+    aeropuerto_origen_id: int
+    aeropuerto_destino_id: int
+    fecha_hora_salida: datetime
+    fecha_hora_llegada: datetime
+
+class Itinerario(BaseModel):
+    numero_tramos: int
+    fecha_hora_salida: datetime
+    fecha_hora_llegada: datetime
+    tramos: List[TramoItinerario]
@@ -0,0 +1,11 @@
+import logging
+
+from app.core.migraciones import ejecutar_migraciones
+from app.database import engine
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+if __name__ == "__main__":
+    ejecutar_migraciones(engine)
@@ -6,8 +6,8 @@ from sqlalchemy import create_engine, text
 # Agregar el directorio raíz al path de Python
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from app.database import Base
 from app.core.config import settings
+from app.core.migraciones import ejecutar_migraciones
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -26,13 +26,14 @@ def recreate_database():
             conn.execute(text("DROP TABLE IF EXISTS tripulacion_vuelo"))
             conn.execute(text("DROP TABLE IF EXISTS escalas"))
             conn.execute(text("DROP TABLE IF EXISTS personal"))
+            conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
             conn.execute(text("SET FOREIGN_KEY_CHECKS=1"))
             conn.commit()
         logger.info("Tablas eliminadas exitosamente")
 
-        # Recrear tablas
+        # Recrear tablas aplicando todas las migraciones
         logger.info("Recreando tablas...")
-        Base.metadata.create_all(bind=engine)
+        ejecutar_migraciones(engine)
         logger.info("Tablas recreadas exitosamente")
 
     except Exception as e:
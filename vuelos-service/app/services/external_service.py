@@ -1,7 +1,8 @@
-import httpx
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from app.core.config import settings
+from app.core.http_client import http_client
+from app.core.reference_cache import reference_cache
 
 logger = logging.getLogger(__name__)
 
@@ -15,46 +16,79 @@ class ExternalService:
         self.personal_url = "http://personal-service:8006/api/v1"
         self.escalas_url = settings.ESCALAS_SERVICE_URL
 
-    async def verify_aeropuerto(self, aeropuerto_id: int) -> bool:
-        """Verifica si un aeropuerto existe en el servicio de aeropuertos."""
+    async def _verify(self, tipo: str, ref_id: int, url: str, descripcion: str) -> bool:
+        """Verifica la existencia de una referencia pasando por la caché de referencias."""
+        async def consultar() -> Optional[bool]:
+            response = await http_client.get(url)
+            if response.status_code == 200:
+                return True
+            if response.status_code == 404:
+                return False
+            # Cualquier otra respuesta no permite saber si existe: no se cachea
+            return None
+
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.aeropuertos_url}/aeropuertos/{aeropuerto_id}")
-                return response.status_code == 200
+            existe = await reference_cache.existe(tipo, ref_id, consultar)
         except Exception as e:
-            logger.error(f"Error verificando aeropuerto {aeropuerto_id}: {str(e)}")
-            raise ExternalServiceError(f"Error verificando aeropuerto: {str(e)}")
+            logger.error(f"Error verificando {descripcion} {ref_id}: {str(e)}")
+            raise ExternalServiceError(f"Error verificando {descripcion}: {str(e)}")
+        if existe is None:
+            logger.error(f"Respuesta inesperada verificando {descripcion} {ref_id}")
+            raise ExternalServiceError(f"Error verificando {descripcion}: respuesta inesperada del servicio")
+        return existe
+
+    async def verify_aeropuerto(self, aeropuerto_id: int) -> bool:
+        """Verifica si un aeropuerto existe en el servicio de aeropuertos."""
+        return await self._verify(
+            "aeropuerto", aeropuerto_id, f"{self.aeropuertos_url}/aeropuertos/{aeropuerto_id}", "aeropuerto"
+        )
 
     async def verify_avion(self, avion_id: int) -> bool:
         """Verifica si un avión existe en el servicio de aviones."""
-        try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.aviones_url}/aviones/{avion_id}")
-                return response.status_code == 200
-        except Exception as e:
-            logger.error(f"Error verificando avión {avion_id}: {str(e)}")
-            raise ExternalServiceError(f"Error verificando avión: {str(e)}")
+        return await self._verify("avion", avion_id, f"{self.aviones_url}/aviones/{avion_id}", "avión")
 
     async def verify_personal(self, personal_id: int) -> bool:
         """Verifica si un miembro del personal existe en el servicio de personal."""
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.personal_url}/personal/{personal_id}")
-                return response.status_code == 200
-        except Exception as e:
-            logger.error(f"Error verificando personal {personal_id}: {str(e)}")
-            raise ExternalServiceError(f"Error verificando personal: {str(e)}")
+        return await self._verify("personal", personal_id, f"{self.personal_url}/personal/{personal_id}", "personal")
 
     async def create_escala(self, escala_data: Dict[str, Any]) -> Dict[str, Any]:
         """Crea una escala en el servicio de escalas."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(f"{self.escalas_url}/escalas/", json=escala_data)
-                if response.status_code != 201:
-                    raise ExternalServiceError(f"Error creando escala: {response.text}")
-                return response.json()
+            response = await http_client.post(f"{self.escalas_url}/escalas/", json=escala_data)
+            if response.status_code != 201:
+                raise ExternalServiceError(f"Error creando escala: {response.text}")
+            return response.json()
         except Exception as e:
             logger.error(f"Error creando escala: {str(e)}")
             raise ExternalServiceError(f"Error creando escala: {str(e)}")
 
+    async def get_escalas(self, por_pagina: int = 1000) -> List[Dict[str, Any]]:
+        """Obtiene todas las escalas del servicio de escalas, recorriendo la paginación por cursor."""
+        escalas: List[Dict[str, Any]] = []
+        cursor = None
+        try:
+            while True:
+                params = {"limit": por_pagina}
+                if cursor:
+                    params["cursor"] = cursor
+                response = await http_client.get(f"{self.escalas_url}/escalas/", params=params)
+                response.raise_for_status()
+                escalas.extend(response.json())
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor:
+                    return escalas
+        except Exception as e:
+            logger.error(f"Error obteniendo escalas: {str(e)}")
+            raise ExternalServiceError(f"Error obteniendo escalas: {str(e)}")
+
+    async def get_escalas_vuelo(self, vuelo_id: int) -> List[Dict[str, Any]]:
+        """Obtiene las escalas de un vuelo."""
+        try:
+            response = await http_client.get(f"{self.escalas_url}/escalas/vuelo/{vuelo_id}")
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error obteniendo escalas del vuelo {vuelo_id}: {str(e)}")
+            raise ExternalServiceError(f"Error obteniendo escalas: {str(e)}")
+
 external_service = ExternalService() 
\ No newline at end of file
@@ -0,0 +1,97 @@
+import bisect
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.vuelo import Vuelo
+
+logger = logging.getLogger(__name__)
+
+Ruta = Tuple[int, int]
+
+
+class IndiceRutas:
+    """
+    Índice en memoria de salidas por ruta (origen, destino).
+
+    Cada ruta guarda una lista ordenada de (fecha_hora_salida, vuelo_id), de modo que
+    una búsqueda por rango de fechas es un par de bisect y devuelve los ids ya en
+    orden de salida. Se carga al iniciar y se mantiene al crear, actualizar o eliminar vuelos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._salidas: Dict[Ruta, List[Tuple[datetime, int]]] = {}
+        self._vuelos: Dict[int, Tuple[Ruta, datetime]] = {}
+        self.cargado = False
+
+    def cargar(self, db: Session) -> int:
+        salidas: Dict[Ruta, List[Tuple[datetime, int]]] = {}
+        vuelos: Dict[int, Tuple[Ruta, datetime]] = {}
+        filas = db.query(
+            Vuelo.id, Vuelo.aeropuerto_origen_id, Vuelo.aeropuerto_destino_id, Vuelo.fecha_hora_salida
+        ).order_by(Vuelo.fecha_hora_salida, Vuelo.id)
+        for vuelo_id, origen, destino, salida in filas:
+            salidas.setdefault((origen, destino), []).append((salida, vuelo_id))
+            vuelos[vuelo_id] = ((origen, destino), salida)
+        with self._lock:
+            self._salidas = salidas
+            self._vuelos = vuelos
+            self.cargado = True
+        logger.info(f"Índice de rutas cargado: {len(vuelos)} vuelos en {len(salidas)} rutas")
+        return len(vuelos)
+
+    def _quitar(self, vuelo_id: int) -> None:
+        anterior = self._vuelos.pop(vuelo_id, None)
+        if anterior is None:
+            return
+        ruta, salida = anterior
+        lista = self._salidas.get(ruta, [])
+        posicion = bisect.bisect_left(lista, (salida, vuelo_id))
+        if posicion < len(lista) and lista[posicion] == (salida, vuelo_id):
+            del lista[posicion]
+        if not lista:
+            self._salidas.pop(ruta, None)
+
+    def actualizar(self, vuelo: Vuelo) -> None:
+        """Inserta o reubica un vuelo en el índice."""
+        ruta = (vuelo.aeropuerto_origen_id, vuelo.aeropuerto_destino_id)
+        with self._lock:
+            self._quitar(vuelo.id)
+            bisect.insort(self._salidas.setdefault(ruta, []), (vuelo.fecha_hora_salida, vuelo.id))
+            self._vuelos[vuelo.id] = (ruta, vuelo.fecha_hora_salida)
+
+    def eliminar(self, vuelo_id: int) -> None:
+        with self._lock:
+            self._quitar(vuelo_id)
+
+    def refrescar(self, db: Session, vuelo_id: int) -> None:
+        """Vuelve a leer un vuelo de la base de datos (p. ej. al recibir un evento de otra réplica)."""
+        vuelo = db.query(Vuelo).filter(Vuelo.id == vuelo_id).first()
+        if vuelo is None:
+            self.eliminar(vuelo_id)
+        else:
+            self.actualizar(vuelo)
+
+    def buscar(
+        self,
+        origen: int,
+        destino: int,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None
+    ) -> List[int]:
+        """Ids de los vuelos de la ruta con salida en [desde, hasta], en orden de salida."""
+        with self._lock:
+            lista = self._salidas.get((origen, destino))
+            if not lista:
+                return []
+            inicio = 0 if desde is None else bisect.bisect_left(lista, (desde,))
+            # (hasta, inf) queda después de cualquier vuelo que salga exactamente en `hasta`
+            fin = len(lista) if hasta is None else bisect.bisect_right(lista, (hasta, float("inf")))
+            return [vuelo_id for _, vuelo_id in lista[inicio:fin]]
+
+
+indice_rutas = IndiceRutas()
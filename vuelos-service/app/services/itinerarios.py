@@ -0,0 +1,275 @@
+import bisect
+import calendar
+import logging
+import threading
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.vuelo import Vuelo
+
+logger = logging.getLogger(__name__)
+
+# (aeropuerto_id, permite subir/bajar pasajeros) por cada parada del vuelo
+Patron = Tuple[Tuple[int, bool], ...]
+
+INFINITO = 2 ** 62
+
+
+def _segundos(fecha: datetime) -> int:
+    # Las fechas se guardan sin zona horaria, en UTC
+    return calendar.timegm(fecha.utctimetuple())
+
+
+def _fecha(segundos: int) -> datetime:
+    return datetime.utcfromtimestamp(segundos)
+
+
+class Viaje:
+    """Un vuelo expandido en su secuencia de paradas (origen, escalas, destino) con sus horarios."""
+
+    __slots__ = ("vuelo_id", "numero_vuelo", "patron", "llegadas", "salidas")
+
+    def __init__(self, vuelo: Vuelo, escalas: Iterable[Dict[str, Any]]):
+        self.vuelo_id = vuelo.id
+        self.numero_vuelo = vuelo.numero_vuelo
+        salida = _segundos(vuelo.fecha_hora_salida)
+        paradas = [(vuelo.aeropuerto_origen_id, True)]
+        llegadas = [salida]
+        salidas = [salida]
+        for escala in sorted(escalas, key=lambda e: e["orden"]):
+            if escala.get("estado") == "CANCELADA":
+                continue
+            # En una escala técnica los pasajeros no pueden subir ni bajar
+            paradas.append((escala["aeropuerto_id"], escala.get("tipo_escala") == "COMERCIAL"))
+            llegadas.append(_segundos(datetime.fromisoformat(escala["fecha_hora_llegada"])))
+            salidas.append(_segundos(datetime.fromisoformat(escala["fecha_hora_salida"])))
+        llegada = _segundos(vuelo.fecha_hora_llegada)
+        paradas.append((vuelo.aeropuerto_destino_id, True))
+        llegadas.append(llegada)
+        salidas.append(llegada)
+        self.patron: Patron = tuple(paradas)
+        self.llegadas = llegadas
+        self.salidas = salidas
+
+    def no_adelanta(self, otro: "Viaje") -> bool:
+        """True si este viaje sale y llega en cada parada no antes que `otro`."""
+        return all(a >= b for a, b in zip(self.salidas, otro.salidas)) and \
+            all(a >= b for a, b in zip(self.llegadas, otro.llegadas))
+
+
+class Ruta:
+    """
+    Viajes con el mismo patrón de paradas que nunca se adelantan entre sí, guardados
+    por columnas: `salidas[i]` y `llegadas[i]` son arreglos con el horario de cada viaje
+    en la parada i, ordenados, de modo que el primer viaje alcanzable es un bisect.
+    """
+
+    __slots__ = ("paradas", "comercial", "vuelos", "salidas", "llegadas")
+
+    def __init__(self, viajes: List[Viaje]):
+        patron = viajes[0].patron
+        self.paradas = [aeropuerto for aeropuerto, _ in patron]
+        self.comercial = [comercial for _, comercial in patron]
+        self.vuelos = [viaje.vuelo_id for viaje in viajes]
+        self.salidas = [array("q", (v.salidas[i] for v in viajes)) for i in range(len(patron))]
+        self.llegadas = [array("q", (v.llegadas[i] for v in viajes)) for i in range(len(patron))]
+
+
+class MotorItinerarios:
+    """
+    Búsqueda de itinerarios con conexiones sobre las tablas de salidas de todos los vuelos.
+
+    Los vuelos se agrupan por patrón de paradas en rutas con tablas de horarios por columna y
+    las consultas se resuelven con RAPTOR: la ronda k encuentra la llegada más temprana a cada
+    aeropuerto usando k tramos, respetando el tiempo mínimo de conexión. El resultado es el
+    conjunto de Pareto (menos tramos / llegada más temprana).
+    Al cambiar un vuelo solo se reconstruyen las rutas de su patrón.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._viajes: Dict[int, Viaje] = {}
+        self._viajes_por_patron: Dict[Patron, Dict[int, Viaje]] = {}
+        self._rutas: Dict[Patron, List[Ruta]] = {}
+        self._rutas_por_parada: Dict[int, Dict[Patron, None]] = {}
+        self.cargado = False
+
+    @staticmethod
+    def _agrupar_escalas(escalas: Iterable[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+        por_vuelo: Dict[int, List[Dict[str, Any]]] = {}
+        for escala in escalas:
+            por_vuelo.setdefault(escala["vuelo_id"], []).append(escala)
+        return por_vuelo
+
+    def cargar(self, db: Session, escalas: Iterable[Dict[str, Any]]) -> int:
+        """Construye el grafo completo a partir de los vuelos y todas las escalas."""
+        escalas_por_vuelo = self._agrupar_escalas(escalas)
+        vuelos = db.query(Vuelo).filter(Vuelo.estado != "CANCELADO").all()
+        viajes = {v.id: Viaje(v, escalas_por_vuelo.get(v.id, [])) for v in vuelos}
+
+        viajes_por_patron: Dict[Patron, Dict[int, Viaje]] = {}
+        for viaje in viajes.values():
+            viajes_por_patron.setdefault(viaje.patron, {})[viaje.vuelo_id] = viaje
+        rutas = {patron: self._construir_rutas(grupo.values()) for patron, grupo in viajes_por_patron.items()}
+        rutas_por_parada: Dict[int, Dict[Patron, None]] = {}
+        for patron in rutas:
+            for aeropuerto, _ in patron:
+                rutas_por_parada.setdefault(aeropuerto, {})[patron] = None
+
+        with self._lock:
+            self._viajes = viajes
+            self._viajes_por_patron = viajes_por_patron
+            self._rutas = rutas
+            self._rutas_por_parada = rutas_por_parada
+            self.cargado = True
+        logger.info(f"Grafo de itinerarios cargado: {len(viajes)} vuelos en {len(rutas)} patrones")
+        return len(viajes)
+
+    @staticmethod
+    def _construir_rutas(viajes: Iterable[Viaje]) -> List[Ruta]:
+        # Se reparte en rutas FIFO para que el orden de los viajes valga en todas las paradas
+        grupos: List[List[Viaje]] = []
+        for viaje in sorted(viajes, key=lambda v: (v.salidas[0], v.vuelo_id)):
+            for grupo in grupos:
+                if viaje.no_adelanta(grupo[-1]):
+                    grupo.append(viaje)
+                    break
+            else:
+                grupos.append([viaje])
+        return [Ruta(grupo) for grupo in grupos]
+
+    def _reconstruir_patron(self, patron: Patron) -> None:
+        grupo = self._viajes_por_patron.get(patron)
+        if grupo:
+            self._rutas[patron] = self._construir_rutas(grupo.values())
+            for aeropuerto, _ in patron:
+                self._rutas_por_parada.setdefault(aeropuerto, {})[patron] = None
+            return
+        self._viajes_por_patron.pop(patron, None)
+        self._rutas.pop(patron, None)
+        for aeropuerto, _ in patron:
+            patrones = self._rutas_por_parada.get(aeropuerto)
+            if patrones is not None:
+                patrones.pop(patron, None)
+
+    def actualizar(self, vuelo: Optional[Vuelo], vuelo_id: int, escalas: Iterable[Dict[str, Any]] = ()) -> None:
+        """Actualiza un vuelo en el grafo (o lo quita si no existe o está cancelado)."""
+        nuevo = Viaje(vuelo, escalas) if vuelo is not None and vuelo.estado != "CANCELADO" else None
+        with self._lock:
+            anterior = self._viajes.pop(vuelo_id, None)
+            patrones = set()
+            if anterior is not None:
+                self._viajes_por_patron.get(anterior.patron, {}).pop(vuelo_id, None)
+                patrones.add(anterior.patron)
+            if nuevo is not None:
+                self._viajes[vuelo_id] = nuevo
+                self._viajes_por_patron.setdefault(nuevo.patron, {})[vuelo_id] = nuevo
+                patrones.add(nuevo.patron)
+            for patron in patrones:
+                self._reconstruir_patron(patron)
+
+    def buscar(
+        self,
+        origen: int,
+        destino: int,
+        desde: datetime,
+        max_tramos: int,
+        conexion_minima_minutos: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Itinerarios de Pareto desde `origen` saliendo a partir de `desde`: uno por cada cantidad
+        de tramos que mejora la llegada al destino, ordenados de menos tramos a llegada más temprana.
+        """
+        conexion = conexion_minima_minutos * 60
+        # La etiqueta del origen se adelanta una conexión para no exigirla en el primer tramo
+        mejores: Dict[int, int] = {origen: _segundos(desde) - conexion}
+        padres: List[Dict[int, Tuple[Ruta, int, int, int]]] = [{}]
+        marcadas = {origen}
+
+        with self._lock:
+            for _ in range(max_tramos):
+                anteriores = dict(mejores)
+                padre_ronda: Dict[int, Tuple[Ruta, int, int, int]] = {}
+
+                # Para cada ruta basta con recorrerla desde la primera parada marcada
+                cola: Dict[int, Tuple[Ruta, int]] = {}
+                for aeropuerto in marcadas:
+                    for patron in self._rutas_por_parada.get(aeropuerto, ()):
+                        for ruta in self._rutas[patron]:
+                            for i, parada in enumerate(ruta.paradas[:-1]):
+                                if parada == aeropuerto and ruta.comercial[i]:
+                                    actual = cola.get(id(ruta))
+                                    if actual is None or i < actual[1]:
+                                        cola[id(ruta)] = (ruta, i)
+                                    break
+
+                nuevas = set()
+                for ruta, inicio in cola.values():
+                    viaje = None
+                    abordaje = None
+                    for i in range(inicio, len(ruta.paradas)):
+                        parada = ruta.paradas[i]
+                        if viaje is not None and ruta.comercial[i]:
+                            llegada = ruta.llegadas[i][viaje]
+                            if llegada < min(mejores.get(parada, INFINITO), mejores.get(destino, INFINITO)):
+                                mejores[parada] = llegada
+                                padre_ronda[parada] = (ruta, viaje, abordaje, i)
+                                nuevas.add(parada)
+                        listo = anteriores.get(parada)
+                        if listo is not None and ruta.comercial[i] and i < len(ruta.paradas) - 1:
+                            j = bisect.bisect_left(ruta.salidas[i], listo + conexion)
+                            if j < len(ruta.vuelos) and (viaje is None or j < viaje):
+                                viaje = j
+                                abordaje = i
+
+                padres.append(padre_ronda)
+                marcadas = nuevas
+                if not marcadas:
+                    break
+
+            return [
+                self._itinerario(padres, ronda, origen, destino)
+                for ronda in range(1, len(padres))
+                if destino in padres[ronda]
+            ]
+
+    def _itinerario(
+        self,
+        padres: List[Dict[int, Tuple[Ruta, int, int, int]]],
+        ronda: int,
+        origen: int,
+        destino: int
+    ) -> Dict[str, Any]:
+        tramos = []
+        parada = destino
+        while True:
+            ruta, viaje, abordaje, bajada = padres[ronda][parada]
+            vuelo_id = ruta.vuelos[viaje]
+            tramos.append({
+                "vuelo_id": vuelo_id,
+                "numero_vuelo": self._viajes[vuelo_id].numero_vuelo,
+                "aeropuerto_origen_id": ruta.paradas[abordaje],
+                "aeropuerto_destino_id": parada,
+                "fecha_hora_salida": _fecha(ruta.salidas[abordaje][viaje]),
+                "fecha_hora_llegada": _fecha(ruta.llegadas[bajada][viaje]),
+            })
+            parada = ruta.paradas[abordaje]
+            if parada == origen:
+                break
+            # La etiqueta usada para abordar es la de la última ronda anterior que la mejoró
+            ronda -= 1
+            while parada not in padres[ronda]:
+                ronda -= 1
+        tramos.reverse()
+        return {
+            "numero_tramos": len(tramos),
+            "fecha_hora_salida": tramos[0]["fecha_hora_salida"],
+            "fecha_hora_llegada": tramos[-1]["fecha_hora_llegada"],
+            "tramos": tramos,
+        }
+
+
+motor_itinerarios = MotorItinerarios()
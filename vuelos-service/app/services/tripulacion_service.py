@@ -0,0 +1,169 @@
+import bisect
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.base import Personal
+from app.models.tripulacion import TripulacionVuelo
+from app.models.vuelo import Vuelo
+from app.schemas.tripulacion import TripulacionBase
+
+
+class IntervalosTripulante:
+    """
+    Índice de intervalos (salida, llegada) de los vuelos asignados a un tripulante.
+
+    Los intervalos se guardan ordenados por salida junto con la mayor duración vista,
+    así la búsqueda de solapes es un bisect más un recorrido acotado hacia atrás
+    en lugar de comparar contra todas las asignaciones.
+    """
+
+    def __init__(self, descanso: timedelta):
+        self.descanso = descanso
+        self._intervalos: List[Tuple[datetime, datetime, int]] = []
+        self._duracion_maxima = timedelta(0)
+
+    def agregar(self, salida: datetime, llegada: datetime, vuelo_id: int) -> None:
+        bisect.insort(self._intervalos, (salida, llegada, vuelo_id))
+        self._duracion_maxima = max(self._duracion_maxima, llegada - salida)
+
+    def conflictos(self, salida: datetime, llegada: datetime) -> List[int]:
+        """Vuelos que se solapan con [salida, llegada] o no dejan el descanso mínimo."""
+        inicio = salida - self.descanso
+        fin = llegada + self.descanso
+        conflictos = []
+        # Solo pueden chocar intervalos que salen antes de `fin`
+        i = bisect.bisect_left(self._intervalos, (fin,)) - 1
+        # y ninguno que salga antes de inicio - duración máxima puede terminar después de `inicio`
+        limite = inicio - self._duracion_maxima
+        while i >= 0 and self._intervalos[i][0] >= limite:
+            otra_salida, otra_llegada, vuelo_id = self._intervalos[i]
+            if otra_llegada > inicio:
+                conflictos.append(vuelo_id)
+            i -= 1
+        return conflictos
+
+
+def _descanso_minimo() -> timedelta:
+    return timedelta(minutes=settings.TRIPULACION_DESCANSO_MINIMO_MINUTOS)
+
+
+def _bloquear_tripulantes(db: Session, personal_ids: Iterable[int]) -> None:
+    """
+    SELECT ... FOR UPDATE sobre los tripulantes: dos asignaciones concurrentes de un mismo
+    tripulante se serializan hasta el commit de la primera, así la segunda valida viéndola.
+    """
+    db.query(Personal.id).filter(
+        Personal.id.in_(sorted(set(personal_ids)))
+    ).order_by(Personal.id).with_for_update().all()
+
+
+def _intervalos_por_tripulante(
+    db: Session,
+    personal_ids: Iterable[int],
+    excluir_asignacion_id: Optional[int] = None,
+    excluir_pares: Set[Tuple[int, int]] = frozenset(),
+    bloquear: bool = False
+) -> Dict[int, IntervalosTripulante]:
+    """
+    Construye el índice de cada tripulante con sus asignaciones actuales, en una sola consulta.
+    `excluir_pares` son (personal_id, vuelo_id) que no se cuentan; con `bloquear` la lectura es
+    con bloqueo, que ve lo último confirmado aunque la transacción ya tenga su snapshot.
+    """
+    indices: Dict[int, IntervalosTripulante] = defaultdict(lambda: IntervalosTripulante(_descanso_minimo()))
+    personal_ids = list(set(personal_ids))
+    if not personal_ids:
+        return indices
+    query = db.query(
+        TripulacionVuelo.personal_id,
+        TripulacionVuelo.vuelo_id,
+        Vuelo.fecha_hora_salida,
+        Vuelo.fecha_hora_llegada
+    ).join(Vuelo, Vuelo.id == TripulacionVuelo.vuelo_id).filter(
+        TripulacionVuelo.personal_id.in_(personal_ids),
+        Vuelo.estado != "CANCELADO"
+    )
+    if excluir_asignacion_id is not None:
+        query = query.filter(TripulacionVuelo.id != excluir_asignacion_id)
+    if bloquear:
+        query = query.with_for_update(read=True)
+    for personal_id, vuelo_id, salida, llegada in query:
+        if (personal_id, vuelo_id) in excluir_pares:
+            continue
+        indices[personal_id].agregar(salida, llegada, vuelo_id)
+    return indices
+
+
+def validar_asignacion(
+    db: Session,
+    vuelo_id: int,
+    personal_id: int,
+    excluir_asignacion_id: Optional[int] = None
+) -> None:
+    """
+    Rechaza la asignación si el tripulante ya vuela en un horario que se solapa con el vuelo
+    o que no le deja el descanso mínimo.
+
+    Bloquea al tripulante hasta el final de la transacción: se debe llamar en la misma
+    transacción que inserta o modifica la asignación, antes del commit.
+    """
+    _bloquear_tripulantes(db, [personal_id])
+    vuelo = db.query(Vuelo).filter(Vuelo.id == vuelo_id).first()
+    if vuelo is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vuelo no encontrado")
+
+    indice = _intervalos_por_tripulante(db, [personal_id], excluir_asignacion_id, bloquear=True)[personal_id]
+    conflictos = indice.conflictos(vuelo.fecha_hora_salida, vuelo.fecha_hora_llegada)
+    if conflictos:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                f"El tripulante {personal_id} tiene vuelos que se solapan o no respetan el descanso "
+                f"mínimo de {settings.TRIPULACION_DESCANSO_MINIMO_MINUTOS} minutos: {sorted(conflictos)}"
+            )
+        )
+
+
+def validar_roster(db: Session, asignaciones: List[TripulacionBase]) -> dict:
+    """
+    Valida un roster completo contra sí mismo y contra las asignaciones ya guardadas,
+    con una consulta para los vuelos del roster y otra para las asignaciones existentes.
+    Las asignaciones guardadas que el roster repite no cuentan, para que validar de nuevo
+    un roster ya persistido no lo haga chocar consigo mismo.
+    """
+    vuelo_ids = {a.vuelo_id for a in asignaciones}
+    vuelos = {
+        v.id: v for v in db.query(Vuelo).filter(Vuelo.id.in_(vuelo_ids))
+    } if vuelo_ids else {}
+    indices = _intervalos_por_tripulante(
+        db,
+        (a.personal_id for a in asignaciones),
+        excluir_pares={(a.personal_id, a.vuelo_id) for a in asignaciones}
+    )
+
+    conflictos = []
+    for posicion, asignacion in enumerate(asignaciones):
+        vuelo = vuelos.get(asignacion.vuelo_id)
+        if vuelo is None:
+            continue
+        indice = indices[asignacion.personal_id]
+        for vuelo_conflicto_id in indice.conflictos(vuelo.fecha_hora_salida, vuelo.fecha_hora_llegada):
+            conflictos.append({
+                "indice": posicion,
+                "personal_id": asignacion.personal_id,
+                "vuelo_id": asignacion.vuelo_id,
+                "vuelo_conflicto_id": vuelo_conflicto_id,
+            })
+        # Las asignaciones siguientes del roster se validan también contra esta
+        indice.agregar(vuelo.fecha_hora_salida, vuelo.fecha_hora_llegada, vuelo.id)
+
+    vuelos_inexistentes = sorted(vuelo_ids - vuelos.keys())
+    return {
+        "valido": not conflictos and not vuelos_inexistentes,
+        "conflictos": conflictos,
+        "vuelos_inexistentes": vuelos_inexistentes,
+    }
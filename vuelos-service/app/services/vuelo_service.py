@@ -1,45 +1,94 @@
+import asyncio
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import Awaitable, Iterator, List, Optional, Tuple
 from app.models.vuelo import Vuelo
-from app.schemas.vuelo import VueloCreate, VueloUpdate
+from app.schemas.vuelo import VueloCreate, VueloUpdate, Vuelo as VueloSchema
 from app.services.external_service import external_service, ExternalServiceError
 from app.services.rabbitmq_service import rabbitmq_service
+from app.core.pagination import consulta_por_id
+from app.database import SessionLocal
+from app.services.indice_rutas import indice_rutas
 import logging
 from fastapi import HTTPException, status
 
 logger = logging.getLogger(__name__)
 
 class VueloService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
+    @staticmethod
+    def _referencias(
+        aeropuerto_origen_id: Optional[int],
+        aeropuerto_destino_id: Optional[int],
+        avion_id: Optional[int]
+    ) -> List[Tuple[str, Awaitable[bool]]]:
+        """Arma las verificaciones externas necesarias junto al mensaje a mostrar si fallan."""
+        referencias = []
+        if aeropuerto_origen_id:
+            referencias.append((
+                f"Aeropuerto origen {aeropuerto_origen_id} no encontrado",
+                external_service.verify_aeropuerto(aeropuerto_origen_id)
+            ))
+        if aeropuerto_destino_id:
+            referencias.append((
+                f"Aeropuerto destino {aeropuerto_destino_id} no encontrado",
+                external_service.verify_aeropuerto(aeropuerto_destino_id)
+            ))
+        if avion_id:
+            referencias.append((
+                f"Avion {avion_id} no encontrado",
+                external_service.verify_avion(avion_id)
+            ))
+        return referencias
+
+    @staticmethod
+    async def _verificar_referencias(referencias: List[Tuple[str, Awaitable[bool]]]) -> None:
+        """
+        Ejecuta todas las verificaciones en paralelo, de modo que la latencia es la de
+        la más lenta. Si un servicio externo falla se cancelan las verificaciones
+        pendientes; las referencias inexistentes se acumulan en un único 404.
+        """
+        tareas = {asyncio.ensure_future(verificacion): mensaje for mensaje, verificacion in referencias}
+        if not tareas:
+            return
+        try:
+            terminadas, _ = await asyncio.wait(tareas, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            # Ante el primer error no tiene sentido esperar al resto
+            for tarea in tareas:
+                tarea.cancel()
+
+        errores = [tarea.exception() for tarea in terminadas if tarea.exception() is not None]
+        if errores:
+            raise errores[0]
+
+        no_encontradas = [mensaje for tarea, mensaje in tareas.items() if not tarea.result()]
+        if no_encontradas:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="; ".join(no_encontradas)
+            )
+
     async def create_vuelo(self, vuelo: VueloCreate) -> Vuelo:
         """Crea un nuevo vuelo verificando las referencias externas."""
         try:
-            # Verificar aeropuertos
-            if not await external_service.verify_aeropuerto(vuelo.aeropuerto_origen_id):
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Aeropuerto origen {vuelo.aeropuerto_origen_id} no encontrado"
-                )
-            
-            if not await external_service.verify_aeropuerto(vuelo.aeropuerto_destino_id):
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Aeropuerto destino {vuelo.aeropuerto_destino_id} no encontrado"
-                )
-
-            # Verificar avión
-            if not await external_service.verify_avion(vuelo.avion_id):
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Avion {vuelo.avion_id} no encontrado"
-                )
+            # Verificar aeropuertos y avión
+            await self._verificar_referencias(self._referencias(
+                vuelo.aeropuerto_origen_id,
+                vuelo.aeropuerto_destino_id,
+                vuelo.avion_id
+            ))
 
             # Crear el vuelo
             db_vuelo = Vuelo(**vuelo.dict())
             self.db.add(db_vuelo)
-            self.db.commit()
-            self.db.refresh(db_vuelo)
+            await self.db.commit()
+            await self.db.refresh(db_vuelo)
+            indice_rutas.actualizar(db_vuelo)
 
             # Publicar evento
             await rabbitmq_service.publish_event(
@@ -53,24 +102,27 @@ class VueloService:
 
             return db_vuelo
 
+        except HTTPException:
+            await self.db.rollback()
+            raise
         except ExternalServiceError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail=str(e)
             )
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Error creando vuelo: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Error interno del servidor"
             )
 
-    def get_vuelo(self, vuelo_id: int) -> Vuelo:
+    async def get_vuelo(self, vuelo_id: int) -> Vuelo:
         """Obtiene un vuelo por su ID."""
         logger.info(f"Intentando obtener vuelo con ID: {vuelo_id}")
-        vuelo = self.db.query(Vuelo).filter(Vuelo.id == vuelo_id).first()
+        vuelo = await self.db.get(Vuelo, vuelo_id)
         if not vuelo:
             logger.error(f"Vuelo con ID {vuelo_id} no encontrado en la base de datos")
             raise HTTPException(
@@ -80,44 +132,44 @@ class VueloService:
         logger.info(f"Vuelo encontrado: {vuelo.__dict__}")
         return vuelo
 
-    def get_vuelos(self, skip: int = 0, limit: int = 100) -> list[Vuelo]:
-        """Obtiene una lista de vuelos."""
-        return self.db.query(Vuelo).offset(skip).limit(limit).all()
+    async def get_vuelos(self, skip: int = 0, limit: int = 100, ultimo_id: Optional[int] = None) -> list[Vuelo]:
+        """Obtiene una lista de vuelos ordenada por id, a partir de `ultimo_id` si se indica."""
+        consulta = consulta_por_id(select(Vuelo), Vuelo.id, ultimo_id, skip, limit)
+        return list(await self.db.scalars(consulta))
+
+    async def get_vuelo_by_numero(self, numero_vuelo: str) -> Optional[Vuelo]:
+        """Obtiene un vuelo por su número, o None si no existe."""
+        return await self.db.scalar(select(Vuelo).where(Vuelo.numero_vuelo == numero_vuelo))
+
+    async def get_vuelos_by_estado(self, estado: str) -> list[Vuelo]:
+        """Obtiene los vuelos en un estado dado, ordenados por id."""
+        return list(await self.db.scalars(select(Vuelo).where(Vuelo.estado == estado).order_by(Vuelo.id)))
 
     async def update_vuelo(self, vuelo_id: int, vuelo: VueloUpdate) -> Vuelo:
         """Actualiza un vuelo existente."""
-        db_vuelo = self.get_vuelo(vuelo_id)
-
-        # Verificar aeropuertos si se están actualizando
-        if vuelo.aeropuerto_origen_id:
-            if not await external_service.verify_aeropuerto(vuelo.aeropuerto_origen_id):
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Aeropuerto origen {vuelo.aeropuerto_origen_id} no encontrado"
-                )
-
-        if vuelo.aeropuerto_destino_id:
-            if not await external_service.verify_aeropuerto(vuelo.aeropuerto_destino_id):
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Aeropuerto destino {vuelo.aeropuerto_destino_id} no encontrado"
-                )
-
-        # Verificar avión si se está actualizando
-        if vuelo.avion_id:
-            if not await external_service.verify_avion(vuelo.avion_id):
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Avion {vuelo.avion_id} no encontrado"
-                )
+        db_vuelo = await self.get_vuelo(vuelo_id)
+
+        # Verificar aeropuertos y avión si se están actualizando
+        try:
+            await self._verificar_referencias(self._referencias(
+                vuelo.aeropuerto_origen_id,
+                vuelo.aeropuerto_destino_id,
+                vuelo.avion_id
+            ))
+        except ExternalServiceError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e)
+            )
 
         # Actualizar el vuelo
         update_data = vuelo.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_vuelo, field, value)
 
-        self.db.commit()
-        self.db.refresh(db_vuelo)
+        await self.db.commit()
+        await self.db.refresh(db_vuelo)
+        indice_rutas.actualizar(db_vuelo)
 
         # Publicar evento
         await rabbitmq_service.publish_event(
@@ -133,9 +185,10 @@ class VueloService:
 
     async def delete_vuelo(self, vuelo_id: int) -> None:
         """Elimina un vuelo."""
-        db_vuelo = self.get_vuelo(vuelo_id)
-        self.db.delete(db_vuelo)
-        self.db.commit()
+        db_vuelo = await self.get_vuelo(vuelo_id)
+        await self.db.delete(db_vuelo)
+        await self.db.commit()
+        indice_rutas.eliminar(vuelo_id)
 
         # Publicar evento
         await rabbitmq_service.publish_event(
@@ -144,4 +197,68 @@ class VueloService:
                 "id": vuelo_id,
                 "numero_vuelo": db_vuelo.numero_vuelo
             }
-        ) 
\ No newline at end of file
+        ) 
+
+
+# Vuelos que se leen de MySQL por cada viaje al generar la respuesta de búsqueda
+VUELOS_POR_LOTE = 500
+
+
+def buscar_vuelos_json(
+    origen: int,
+    destino: int,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None
+) -> Iterator[bytes]:
+    """
+    Genera un arreglo JSON con los vuelos de la ruta en orden de salida, por lotes.
+    Los ids salen del índice de rutas en memoria y las filas se leen por clave primaria;
+    si el índice no está cargado se usa el índice compuesto (origen, destino, salida) de MySQL.
+    La sesión es propia del generador porque vive lo mismo que la respuesta.
+    """
+    db = SessionLocal()
+    try:
+        yield b"["
+        primero = True
+        for lote in _lotes_busqueda(db, origen, destino, desde, hasta):
+            for vuelo in lote:
+                if not primero:
+                    yield b","
+                primero = False
+                yield VueloSchema.model_validate(vuelo).model_dump_json().encode()
+        yield b"]"
+    finally:
+        db.close()
+
+
+def _lotes_busqueda(
+    db: Session,
+    origen: int,
+    destino: int,
+    desde: Optional[datetime],
+    hasta: Optional[datetime]
+) -> Iterator[List[Vuelo]]:
+    if indice_rutas.cargado:
+        ids = indice_rutas.buscar(origen, destino, desde, hasta)
+        for inicio in range(0, len(ids), VUELOS_POR_LOTE):
+            lote_ids = ids[inicio:inicio + VUELOS_POR_LOTE]
+            por_id = {v.id: v for v in db.query(Vuelo).filter(Vuelo.id.in_(lote_ids))}
+            yield [por_id[vuelo_id] for vuelo_id in lote_ids if vuelo_id in por_id]
+        return
+
+    query = db.query(Vuelo).filter(
+        Vuelo.aeropuerto_origen_id == origen,
+        Vuelo.aeropuerto_destino_id == destino
+    )
+    if desde is not None:
+        query = query.filter(Vuelo.fecha_hora_salida >= desde)
+    if hasta is not None:
+        query = query.filter(Vuelo.fecha_hora_salida <= hasta)
+    lote = []
+    for vuelo in query.order_by(Vuelo.fecha_hora_salida, Vuelo.id).yield_per(VUELOS_POR_LOTE):
+        lote.append(vuelo)
+        if len(lote) == VUELOS_POR_LOTE:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
@@ -7,6 +7,10 @@ while ! nc -z mysql 3306; do
 done
 echo "MySQL está listo!"
 
+# Aplicar migraciones pendientes del esquema
+echo "Aplicando migraciones..."
+python -m app.scripts.migrate
+
 # Ejecutar script de verificación
 echo "Verificando la base de datos..."
 python -m app.scripts.verify_data
@@ -0,0 +1,72 @@
+"""Esquema inicial: personal, vuelos y tripulacion_vuelo
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "personal",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("numero_empleado", sa.String(length=10), nullable=False),
+        sa.Column("nombre", sa.String(length=100), nullable=False),
+        sa.Column("apellido", sa.String(length=100), nullable=False),
+        sa.Column("tipo", sa.Enum("PILOTO", "COPILOTO", "ASISTENTE"), nullable=False),
+        sa.Column("estado", sa.Enum("ACTIVO", "INACTIVO", "VACACIONES"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("numero_empleado"),
+    )
+    op.create_index("ix_personal_id", "personal", ["id"])
+
+    op.create_table(
+        "vuelos",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("numero_vuelo", sa.String(length=10), nullable=False),
+        sa.Column("fecha_hora_salida", sa.DateTime(), nullable=False),
+        sa.Column("fecha_hora_llegada", sa.DateTime(), nullable=False),
+        sa.Column("aeropuerto_origen_id", sa.Integer(), nullable=False),
+        sa.Column("aeropuerto_destino_id", sa.Integer(), nullable=False),
+        sa.Column("avion_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "estado",
+            sa.Enum("PROGRAMADO", "EN_VUELO", "COMPLETADO", "CANCELADO", "RETRASADO"),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("numero_vuelo"),
+    )
+    op.create_index("ix_vuelos_id", "vuelos", ["id"])
+
+    op.create_table(
+        "tripulacion_vuelo",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("vuelo_id", sa.Integer(), nullable=False),
+        sa.Column("personal_id", sa.Integer(), nullable=False),
+        sa.Column("rol", sa.Enum("PILOTO", "COPILOTO", "ASISTENTE"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["personal_id"], ["personal.id"]),
+        sa.ForeignKeyConstraint(["vuelo_id"], ["vuelos.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_tripulacion_vuelo_id", "tripulacion_vuelo", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("tripulacion_vuelo")
+    op.drop_table("vuelos")
+    op.drop_table("personal")
@@ -0,0 +1,29 @@
+"""Índice compuesto (origen, destino, salida) para la búsqueda por ruta
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Las bases creadas con create_all ya lo tienen; las creadas con mysql-init no
+    indices = {i["name"] for i in sa.inspect(op.get_bind()).get_indexes("vuelos")}
+    if "ix_vuelos_ruta_salida" not in indices:
+        op.create_index(
+            "ix_vuelos_ruta_salida",
+            "vuelos",
+            ["aeropuerto_origen_id", "aeropuerto_destino_id", "fecha_hora_salida"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vuelos_ruta_salida", table_name="vuelos")
@@ -0,0 +1,145 @@
+"""
+Pruebas de la búsqueda de itinerarios (RAPTOR) sobre un horario sintético pequeño.
+
+Uso, desde vuelos-service/:
+
+    python -m pytest tests/test_itinerarios.py
+"""
+from datetime import datetime
+
+import pytest
+
+import app.models.tripulacion  # noqa: F401  (Vuelo.tripulacion necesita el modelo registrado)
+from app.models.vuelo import Vuelo
+from app.services.itinerarios import MotorItinerarios
+
+DIA = datetime(2030, 5, 10)
+
+
+def hora(hh: int, mm: int = 0) -> datetime:
+    return DIA.replace(hour=hh, minute=mm)
+
+
+def vuelo(vuelo_id: int, origen: int, destino: int, salida: datetime, llegada: datetime, estado: str = "PROGRAMADO") -> Vuelo:
+    return Vuelo(
+        id=vuelo_id,
+        numero_vuelo=f"AV{vuelo_id:03d}",
+        aeropuerto_origen_id=origen,
+        aeropuerto_destino_id=destino,
+        fecha_hora_salida=salida,
+        fecha_hora_llegada=llegada,
+        avion_id=1,
+        estado=estado
+    )
+
+
+def escala(aeropuerto_id: int, llegada: datetime, salida: datetime, tipo: str, orden: int = 1) -> dict:
+    return {
+        "orden": orden,
+        "aeropuerto_id": aeropuerto_id,
+        "tipo_escala": tipo,
+        "estado": "PROGRAMADA",
+        "fecha_hora_llegada": llegada.isoformat(),
+        "fecha_hora_salida": salida.isoformat(),
+    }
+
+
+@pytest.fixture
+def motor():
+    """
+    Aeropuertos 1 a 4:
+      1 -> 2  08:00-10:00  (vuelo 1)
+      2 -> 3  10:30-12:00  (vuelo 2)
+      2 -> 3  11:00-13:00  (vuelo 3)
+      1 -> 3  09:00-15:00  (vuelo 4, directo)
+      3 -> 4  13:00-14:00  (vuelo 5)
+    """
+    motor = MotorItinerarios()
+    for v in [
+        vuelo(1, 1, 2, hora(8), hora(10)),
+        vuelo(2, 2, 3, hora(10, 30), hora(12)),
+        vuelo(3, 2, 3, hora(11), hora(13)),
+        vuelo(4, 1, 3, hora(9), hora(15)),
+        vuelo(5, 3, 4, hora(13), hora(14)),
+    ]:
+        motor.actualizar(v, v.id)
+    return motor
+
+
+def vuelos_de(itinerario: dict) -> list:
+    return [tramo["vuelo_id"] for tramo in itinerario["tramos"]]
+
+
+def test_directo_y_conexion_respetando_tiempo_minimo(motor):
+    # Con 45 minutos de conexión el vuelo 2 (10:30) no alcanza: se toma el 3
+    itinerarios = motor.buscar(1, 3, hora(7), max_tramos=3, conexion_minima_minutos=45)
+    assert [vuelos_de(i) for i in itinerarios] == [[4], [1, 3]]
+    assert itinerarios[0]["fecha_hora_llegada"] == hora(15)
+    assert itinerarios[1]["numero_tramos"] == 2
+    assert itinerarios[1]["fecha_hora_salida"] == hora(8)
+    assert itinerarios[1]["fecha_hora_llegada"] == hora(13)
+
+
+def test_conexion_justa_al_limite(motor):
+    # Llegada 10:00 + 30 minutos = salida 10:30: la conexión es válida
+    itinerarios = motor.buscar(1, 3, hora(7), max_tramos=3, conexion_minima_minutos=30)
+    assert [vuelos_de(i) for i in itinerarios] == [[4], [1, 2]]
+
+
+def test_tres_tramos(motor):
+    itinerarios = motor.buscar(1, 4, hora(7), max_tramos=3, conexion_minima_minutos=30)
+    assert [vuelos_de(i) for i in itinerarios] == [[1, 2, 5]]
+    tramos = itinerarios[0]["tramos"]
+    assert [(t["aeropuerto_origen_id"], t["aeropuerto_destino_id"]) for t in tramos] == [(1, 2), (2, 3), (3, 4)]
+
+
+def test_sin_conexion_posible(motor):
+    # Con 45 minutos solo se llega a 3 a las 13:00, justo cuando sale el vuelo 5
+    assert motor.buscar(1, 4, hora(7), max_tramos=3, conexion_minima_minutos=45) == []
+
+
+def test_limite_de_tramos(motor):
+    assert motor.buscar(1, 4, hora(7), max_tramos=2, conexion_minima_minutos=30) == []
+    itinerarios = motor.buscar(1, 3, hora(7), max_tramos=1, conexion_minima_minutos=30)
+    assert [vuelos_de(i) for i in itinerarios] == [[4]]
+
+
+def test_salida_posterior_descarta_vuelos_anteriores(motor):
+    # Después de las 08:00 ya no se puede tomar el vuelo 1
+    itinerarios = motor.buscar(1, 3, hora(8, 30), max_tramos=3, conexion_minima_minutos=30)
+    assert [vuelos_de(i) for i in itinerarios] == [[4]]
+
+
+def test_conexion_peor_que_el_directo_no_se_ofrece():
+    motor = MotorItinerarios()
+    for v in [
+        vuelo(1, 1, 2, hora(8), hora(9)),
+        vuelo(2, 2, 3, hora(10), hora(12)),
+        vuelo(3, 1, 3, hora(8), hora(11)),
+    ]:
+        motor.actualizar(v, v.id)
+    itinerarios = motor.buscar(1, 3, hora(7), max_tramos=3, conexion_minima_minutos=30)
+    assert [vuelos_de(i) for i in itinerarios] == [[3]]
+
+
+def test_vuelo_cancelado_sale_del_grafo(motor):
+    motor.actualizar(vuelo(4, 1, 3, hora(9), hora(15), estado="CANCELADO"), 4)
+    itinerarios = motor.buscar(1, 3, hora(7), max_tramos=3, conexion_minima_minutos=45)
+    assert [vuelos_de(i) for i in itinerarios] == [[1, 3]]
+
+
+def test_escala_comercial_permite_bajar_y_tecnica_no():
+    motor = MotorItinerarios()
+    con_escala_comercial = vuelo(1, 1, 3, hora(8), hora(12))
+    con_escala_tecnica = vuelo(2, 1, 4, hora(8), hora(12))
+    motor.actualizar(con_escala_comercial, 1, [escala(2, hora(9), hora(10), "COMERCIAL")])
+    motor.actualizar(con_escala_tecnica, 2, [escala(5, hora(9), hora(10), "TECNICA")])
+
+    itinerarios = motor.buscar(1, 2, hora(7), max_tramos=2, conexion_minima_minutos=30)
+    assert [vuelos_de(i) for i in itinerarios] == [[1]]
+    assert itinerarios[0]["fecha_hora_llegada"] == hora(9)
+
+    assert motor.buscar(1, 5, hora(7), max_tramos=2, conexion_minima_minutos=30) == []
+    # Subir en la escala comercial también vale
+    itinerarios = motor.buscar(2, 3, hora(7), max_tramos=1, conexion_minima_minutos=30)
+    assert itinerarios[0]["fecha_hora_salida"] == hora(10)
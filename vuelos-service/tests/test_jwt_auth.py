@@ -0,0 +1,106 @@
+"""
+Pruebas de la caché de tokens verificados (app.core.jwt_auth.TokenCache).
+
+El reloj del módulo se sustituye por uno manual para vencer las entradas sin esperar.
+
+Uso, desde vuelos-service/:
+
+    python -m pytest tests/test_jwt_auth.py
+"""
+import time
+from types import SimpleNamespace
+
+import pytest
+from jose import JWTError, jwt
+from prometheus_client import REGISTRY
+
+from app.core import jwt_auth
+from app.core.config import settings
+from app.core.jwt_auth import TokenCache
+
+
+def token(sub: str, exp=None) -> str:
+    claims = {"sub": sub}
+    if exp is not None:
+        claims["exp"] = exp
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def consultas(resultado: str) -> float:
+    return REGISTRY.get_sample_value("token_cache_requests_total", {"resultado": resultado}) or 0.0
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    reloj = SimpleNamespace(ahora=time.time())
+    monkeypatch.setattr(jwt_auth, "time", SimpleNamespace(time=lambda: reloj.ahora))
+    return reloj
+
+
+def test_segunda_verificacion_sale_de_la_cache(reloj):
+    cache = TokenCache(max_entradas=10)
+    t = token("ana", exp=int(reloj.ahora) + 3600)
+    aciertos, fallos = consultas("hit"), consultas("miss")
+
+    assert cache.verificar(t)["sub"] == "ana"
+    assert cache.verificar(t)["sub"] == "ana"
+    assert consultas("miss") - fallos == 1
+    assert consultas("hit") - aciertos == 1
+
+
+def test_entrada_vencida_se_descarta(reloj):
+    cache = TokenCache(max_entradas=10)
+    exp = int(reloj.ahora) + 60
+    t = token("ana", exp=exp)
+    cache.verificar(t)
+
+    reloj.ahora = exp - 1
+    aciertos = consultas("hit")
+    cache.verificar(t)
+    assert consultas("hit") - aciertos == 1
+
+    # Al llegar a `exp` la entrada ya no sirve y el token se vuelve a verificar
+    reloj.ahora = exp
+    fallos = consultas("miss")
+    cache.verificar(t)
+    assert consultas("miss") - fallos == 1
+
+
+def test_token_vencido_o_alterado_no_se_cachea(reloj):
+    cache = TokenCache(max_entradas=10)
+    with pytest.raises(JWTError):
+        cache.verificar(token("ana", exp=int(time.time()) - 10))
+    with pytest.raises(JWTError):
+        cache.verificar(token("ana", exp=int(reloj.ahora) + 3600)[:-2] + "xx")
+    assert len(cache._entradas) == 0
+
+
+def test_token_sin_exp_no_se_cachea(reloj):
+    cache = TokenCache(max_entradas=10)
+    assert cache.verificar(token("ana"))["sub"] == "ana"
+    assert len(cache._entradas) == 0
+
+
+def test_lru_desaloja_el_menos_reciente(reloj):
+    cache = TokenCache(max_entradas=2)
+    exp = int(reloj.ahora) + 3600
+    a, b, c = token("a", exp), token("b", exp), token("c", exp)
+    cache.verificar(a)
+    cache.verificar(b)
+    # Usar "a" la convierte en la más reciente: al entrar "c" sale "b"
+    cache.verificar(a)
+    cache.verificar(c)
+    assert len(cache._entradas) == 2
+
+    aciertos, fallos = consultas("hit"), consultas("miss")
+    cache.verificar(a)
+    cache.verificar(c)
+    assert consultas("hit") - aciertos == 2
+    cache.verificar(b)
+    assert consultas("miss") - fallos == 1
+
+
+def test_cache_desactivada(reloj):
+    cache = TokenCache(max_entradas=0)
+    cache.verificar(token("ana", exp=int(reloj.ahora) + 3600))
+    assert len(cache._entradas) == 0
@@ -0,0 +1,75 @@
+"""
+Pruebas del índice de intervalos por tripulante (app.services.tripulacion_service).
+
+Uso, desde vuelos-service/:
+
+    python -m pytest tests/test_tripulacion_intervalos.py
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.tripulacion_service import IntervalosTripulante
+
+DIA = datetime(2030, 5, 10)
+DESCANSO = timedelta(minutes=60)
+
+
+def hora(hh: int, mm: int = 0) -> datetime:
+    return DIA.replace(hour=hh, minute=mm)
+
+
+@pytest.fixture
+def intervalos():
+    """Un tripulante con un vuelo asignado de 10:00 a 12:00 (vuelo 1)."""
+    intervalos = IntervalosTripulante(DESCANSO)
+    intervalos.agregar(hora(10), hora(12), 1)
+    return intervalos
+
+
+def test_sin_asignaciones():
+    assert IntervalosTripulante(DESCANSO).conflictos(hora(10), hora(12)) == []
+
+
+@pytest.mark.parametrize("salida, llegada, esperado", [
+    # Sale justo al cumplirse el descanso tras la llegada de las 12:00
+    (hora(13), hora(14), []),
+    (hora(12, 59), hora(14), [1]),
+    # Llega justo con el descanso antes de la salida de las 10:00
+    (hora(7), hora(9), []),
+    (hora(7), hora(9, 1), [1]),
+    # Solapes directos
+    (hora(11), hora(13), [1]),
+    (hora(10), hora(12), [1]),
+    (hora(10, 30), hora(11), [1]),
+    (hora(8), hora(15), [1]),
+])
+def test_descanso_en_los_bordes(intervalos, salida, llegada, esperado):
+    assert intervalos.conflictos(salida, llegada) == esperado
+
+
+def test_sin_descanso_se_permite_encadenar():
+    intervalos = IntervalosTripulante(timedelta(0))
+    intervalos.agregar(hora(10), hora(12), 1)
+    assert intervalos.conflictos(hora(12), hora(14)) == []
+    assert intervalos.conflictos(hora(8), hora(10)) == []
+    assert intervalos.conflictos(hora(11, 59), hora(14)) == [1]
+
+
+def test_vuelo_largo_anterior_se_encuentra():
+    """Un vuelo que sale mucho antes pero sigue en el aire debe aparecer pese al recorte hacia atrás."""
+    intervalos = IntervalosTripulante(DESCANSO)
+    intervalos.agregar(hora(0), hora(14), 1)
+    intervalos.agregar(hora(9), hora(10), 2)
+    assert sorted(intervalos.conflictos(hora(13), hora(16))) == [1]
+    assert sorted(intervalos.conflictos(hora(10, 30), hora(11))) == [1, 2]
+    assert intervalos.conflictos(hora(15), hora(16)) == []
+
+
+def test_varios_conflictos(intervalos):
+    intervalos.agregar(hora(14), hora(16), 2)
+    intervalos.agregar(hora(18), hora(20), 3)
+    assert sorted(intervalos.conflictos(hora(11), hora(15))) == [1, 2]
+    # Entre el vuelo 2 (llega 16:00) y el 3 (sale 18:00) cabe justo un vuelo de 17:00 a 17:00
+    assert intervalos.conflictos(hora(17), hora(17)) == []
+    assert intervalos.conflictos(hora(17), hora(17, 1)) == [3]
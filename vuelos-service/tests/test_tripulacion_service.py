@@ -0,0 +1,104 @@
+"""
+Pruebas de la validación de asignaciones y rosters (app.services.tripulacion_service)
+contra una base SQLite en memoria.
+
+Uso, desde vuelos-service/:
+
+    python -m pytest tests/test_tripulacion_service.py
+"""
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.base import Personal
+from app.models.tripulacion import TripulacionVuelo
+from app.models.vuelo import Vuelo
+from app.schemas.tripulacion import TripulacionBase
+from app.services.tripulacion_service import validar_asignacion, validar_roster
+
+DIA = datetime(2030, 5, 10)
+
+
+def hora(hh: int, mm: int = 0) -> datetime:
+    return DIA.replace(hour=hh, minute=mm)
+
+
+@pytest.fixture
+def db():
+    """
+    Tripulante 1 y tres vuelos:
+      vuelo 1  08:00-10:00
+      vuelo 2  11:30-13:00  (a 90 minutos del 1)
+      vuelo 3  10:30-12:00  (a 30 minutos del 1: no respeta el descanso)
+    """
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Personal.__table__, Vuelo.__table__, TripulacionVuelo.__table__])
+    sesion = sessionmaker(bind=engine)()
+    sesion.add(Personal(id=1, numero_empleado="E001", nombre="Ana", apellido="Pérez", tipo="PILOTO"))
+    for vuelo_id, salida, llegada in [(1, hora(8), hora(10)), (2, hora(11, 30), hora(13)), (3, hora(10, 30), hora(12))]:
+        sesion.add(Vuelo(
+            id=vuelo_id,
+            numero_vuelo=f"AV{vuelo_id:03d}",
+            fecha_hora_salida=salida,
+            fecha_hora_llegada=llegada,
+            aeropuerto_origen_id=1,
+            aeropuerto_destino_id=2,
+            avion_id=1
+        ))
+    sesion.commit()
+    yield sesion
+    sesion.close()
+    engine.dispose()
+
+
+def asignacion(vuelo_id: int, personal_id: int = 1) -> TripulacionBase:
+    return TripulacionBase(vuelo_id=vuelo_id, personal_id=personal_id, rol="PILOTO")
+
+
+def guardar(db, *asignaciones: TripulacionBase) -> None:
+    for a in asignaciones:
+        db.add(TripulacionVuelo(**a.dict()))
+    db.commit()
+
+
+def test_roster_guardado_no_choca_consigo_mismo(db):
+    roster = [asignacion(1), asignacion(2)]
+    assert validar_roster(db, roster)["valido"]
+    guardar(db, *roster)
+
+    resultado = validar_roster(db, roster)
+    assert resultado["valido"]
+    assert resultado["conflictos"] == []
+
+
+def test_roster_choca_con_asignaciones_guardadas(db):
+    guardar(db, asignacion(1))
+    resultado = validar_roster(db, [asignacion(1), asignacion(3)])
+    assert not resultado["valido"]
+    assert resultado["conflictos"] == [{"indice": 1, "personal_id": 1, "vuelo_id": 3, "vuelo_conflicto_id": 1}]
+
+
+def test_roster_con_vuelo_inexistente(db):
+    resultado = validar_roster(db, [asignacion(1), asignacion(99)])
+    assert not resultado["valido"]
+    assert resultado["vuelos_inexistentes"] == [99]
+
+
+def test_validar_asignacion(db):
+    guardar(db, asignacion(1))
+    validar_asignacion(db, 2, 1)
+    with pytest.raises(HTTPException) as error:
+        validar_asignacion(db, 3, 1)
+    assert error.value.status_code == 409
+
+    # Al modificar la propia asignación no se compara consigo misma
+    existente = db.query(TripulacionVuelo).filter(TripulacionVuelo.vuelo_id == 1).one()
+    validar_asignacion(db, 3, 1, excluir_asignacion_id=existente.id)
+
+    with pytest.raises(HTTPException) as error:
+        validar_asignacion(db, 99, 1)
+    assert error.value.status_code == 404